@@ -3,3 +3,13 @@ from apread.apreader import *
 # binary reader
 from apread.binaryReader import *
 
+# asyncio api
+from apread.aio import aopen, aopen_many
+# batch loading of multiple files
+from apread.batch import open_many
+# indexed lookup of channels
+from apread.catalog import Catalog
+# finding time channels
+from apread.resolver import InteractiveResolver, TimeResolver
+# writing catmanAP files
+from apread.writer import APWriter
@@ -0,0 +1,155 @@
+# asyncio api, asyncio is imported on first use (it takes longer to import than apread)
+import functools
+import os
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+# typing
+from typing import AsyncIterator, Callable, List, Tuple
+
+# threads of the default executor
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_executor: Executor = None
+_lock = threading.Lock()
+
+
+def get_executor() -> Executor:
+    """The default executor of the asyncio api, a pool of DEFAULT_WORKERS threads.
+
+    All blocking work (file I/O and decoding) runs in this pool, so the amount of
+    threads is bounded, no matter how many files and channels are loaded at once.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(DEFAULT_WORKERS, thread_name_prefix='apread')
+        return _executor
+
+async def run_blocking(func: Callable, *args, executor: Executor = None, **kwargs):
+    """Runs func(*args, **kwargs) in the executor and waits for the result without blocking the event loop.
+
+    Args:
+        func (Callable): The blocking function.
+        executor (Executor): Runs the function, defaults to get_executor().
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor or get_executor(), functools.partial(func, *args, **kwargs))
+
+async def load_channels(channels: List, limit: int = None, executor: Executor = None):
+    """Loads the data of channels concurrently (see Channel.load).
+
+    At most limit channels are loaded at once. If the calling task is cancelled,
+    no further channels are started, channels being read finish in the background.
+
+    Args:
+        channels (list[Channel]): The channels, channels that are loaded already are skipped.
+        limit (int): Maximum amount of channels that are loaded at once, defaults to DEFAULT_WORKERS.
+        executor (Executor): Runs the blocking reads, defaults to get_executor().
+    """
+    import asyncio
+
+    semaphore = asyncio.Semaphore(limit or DEFAULT_WORKERS)
+
+    async def load(channel):
+        async with semaphore:
+            if not channel.isLoaded and not channel.broken:
+                await run_blocking(channel.load, executor=executor)
+
+    await asyncio.gather(*(load(x) for x in channels))
+
+async def aopen(path: str, limit: int = None, executor: Executor = None, **kwargs):
+    """Opens a catmanAP binary file without blocking the event loop.
+
+    The headers are parsed in the executor (like APReader(path, lazy=True)).
+    Unless lazy=True is given, the data of all channels is loaded afterwards
+    with load_channels, so cancelling stops between channels. With
+    contiguous=True, the groups are read into their arrays in one step
+    instead (see APReader.loadArrays).
+
+    Args:
+        path (str): Path to a catmanAP binary file.
+        limit (int): Maximum amount of channels that are loaded at once.
+        executor (Executor): Runs the blocking work, defaults to get_executor().
+        **kwargs: Passed to APReader (e.g. lazy=True, mmap=True, cache_dir=...).
+
+    Returns:
+        APReader: The reader.
+
+    Examples:
+        reader = await apread.aopen('measurements.bin')
+        reader = await apread.aopen('measurements.bin', lazy=True)
+        data = await reader.Channels[3].aload()
+    """
+    from apread.apreader import APReader
+
+    lazy = kwargs.pop('lazy', False)
+    reader = await run_blocking(APReader, path, lazy=True, executor=executor, **kwargs)
+    if lazy:
+        return reader
+
+    if reader.metrics is not None:
+        reader.metrics.start('data')
+    try:
+        if reader.contiguous:
+            await run_blocking(reader.loadArrays, executor=executor)
+        else:
+            await reader.aload(limit, executor)
+    finally:
+        if reader.metrics is not None:
+            reader.metrics.stop('data')
+    reader.lazy = False
+    # the cache contains the headers only so far
+    if reader.cacheable:
+        await run_blocking(reader.cache.store, reader, executor=executor)
+    return reader
+
+async def aopen_many(paths_or_glob, limit: int = 4, executor: Executor = None, **kwargs) \
+        -> AsyncIterator[Tuple[str, object, Exception]]:
+    """Opens many catmanAP binary files concurrently (see aopen and apread.batch.open_many).
+
+    At most limit files are opened at once. The next file is only started when a
+    result has been taken, so a slow consumer slows down the reading (backpressure).
+    Files that are still open are cancelled when the iteration stops.
+
+    Args:
+        paths_or_glob (str | Iterable[str]): A glob pattern or a list of paths/patterns.
+        limit (int): Maximum amount of files that are opened at once.
+        executor (Executor): Runs the blocking work, defaults to get_executor().
+        **kwargs: Passed to aopen.
+
+    Yields:
+        Tuple[str, APReader, Exception]: The path and either the reader or the error,
+            in the order in which the files finish.
+
+    Examples:
+        async for path, reader, error in apread.aopen_many('campaign/*.bin', limit=8):
+            ...
+    """
+    import asyncio
+    from apread.batch import find_files
+
+    files = iter(find_files(paths_or_glob))
+    pending = {}
+
+    def submit():
+        while len(pending) < max(limit, 1):
+            path = next(files, None)
+            if path is None:
+                return
+            pending[asyncio.ensure_future(aopen(path, executor=executor, **kwargs))] = path
+
+    try:
+        submit()
+        while len(pending) > 0:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                path = pending.pop(task)
+                error = task.exception()
+                yield path, (task.result() if error is None else None), error
+            submit()
+    finally:
+        for task in pending:
+            task.cancel()
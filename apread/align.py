@@ -0,0 +1,176 @@
+# resampling of channels of different groups onto a common time base
+from typing import BinaryIO, Iterator, List, Tuple
+
+import numpy as np
+
+from apread.export import CHUNK_SAMPLES
+
+# interpolation methods of align
+METHODS = ['linear', 'nearest', 'zoh']
+
+
+class Source:
+    """Channels that share a time channel, they are resampled together."""
+    def __init__(self, time):
+        self.time = time
+        # the channels and their columns in the result
+        self.channels = []
+        self.columns = []
+        # first and last point in time
+        first = time.readRange(0, 1)
+        last = time.readRange(time.length - 1, time.length)
+        self.first = float(first[0]) if len(first) > 0 else np.inf
+        self.last = float(last[0]) if len(last) > 0 else -np.inf
+        # sample rate from the first two samples, like Group.frequency
+        head = time.readRange(0, 2).astype(np.float64)
+        self.rate = 1 / (head[1] - head[0]) if len(head) > 1 and head[1] > head[0] else 0.0
+
+    def resample(self, t: np.ndarray, method: str, out: np.ndarray, f: BinaryIO = None):
+        """Writes the values of all channels at the points in time t into their columns of out.
+
+        Only the samples around t are read. Points in time outside of the time
+        channel are NaN.
+        """
+        time = self.time
+        # the samples around t
+        lo = max(time.searchTime(t[0], 'right', f) - 1, 0)
+        hi = min(time.searchTime(t[-1], 'left', f) + 1, time.length)
+        ts = time.readRange(lo, hi, f).astype(np.float64, copy=False)
+
+        # the indices (and weights) are computed once for all channels of the group
+        if method == 'linear':
+            # the fractional index of every point in time, np.interp is faster than np.searchsorted
+            position = np.interp(t, ts, np.arange(len(ts), dtype=np.float64))
+            i0 = np.minimum(position.astype(np.intp), len(ts) - 1)
+            i1 = np.minimum(i0 + 1, len(ts) - 1)
+            w = position - i0
+        else:
+            i0 = np.clip(np.searchsorted(ts, t, 'right') - 1, 0, len(ts) - 1)
+            if method == 'nearest':
+                i1 = np.minimum(i0 + 1, len(ts) - 1)
+                i0 = np.where(np.abs(ts[i1] - t) < np.abs(t - ts[i0]), i1, i0)
+
+        for channel, column in zip(self.channels, self.columns):
+            data = channel.readRange(lo, hi, f)
+            values = data.take(i0).astype(np.float64, copy=False)
+            if method == 'linear':
+                values += (data.take(i1) - values) * w
+            out[:, column] = values
+
+        outside = (t < self.first) | (t > self.last)
+        if outside.any():
+            out[np.ix_(outside, self.columns)] = np.nan
+
+
+def sources(channels: List) -> List[Source]:
+    """Sorts the channels by their time channel."""
+    found = {}
+    for column, channel in enumerate(channels):
+        time = channel if channel.isTime else channel.Time
+        if time is None:
+            raise ValueError(f'Channel "{channel.Name}" has no time channel.')
+        source = found.get(id(time))
+        if source is None:
+            source = found[id(time)] = Source(time)
+        source.channels.append(channel)
+        source.columns.append(column)
+    return list(found.values())
+
+def time_base(groups: List[Source], rate: float = None, start: float = None, end: float = None) -> Tuple[float, float, int]:
+    """The rate, start and amount of samples of the common time base (see iter_align)."""
+    if rate is None:
+        rate = max(x.rate for x in groups)
+    if rate <= 0:
+        raise ValueError('The rate has to be positive.')
+    # by default, the time that is covered by all channels
+    if start is None:
+        start = max(x.first for x in groups)
+    if end is None:
+        end = min(x.last for x in groups)
+    if end < start:
+        raise ValueError(f'The end of the time base ({end}) is before its start ({start}).')
+    # small tolerance, so that end is included despite rounding
+    return rate, start, int(np.floor((end - start) * rate + 1e-9)) + 1
+
+def open_stream(groups: List[Source]) -> BinaryIO:
+    """One stream for all channels if they are located in the same file, otherwise None."""
+    paths = {x.time.filePath for x in groups}
+    if len(paths) == 1 and all(x.time.dataOffset is not None for x in groups):
+        return open(paths.pop(), 'rb')
+    return None
+
+def prepare(channels: List, rate: float, method: str, start: float, end: float) -> Tuple[List[Source], float, float, int]:
+    """Checks the arguments of align and finds the time base."""
+    if method not in METHODS:
+        raise ValueError(f'Unknown method "{method}", use one of {METHODS}.')
+    if len(channels) == 0:
+        raise ValueError('No channels to align.')
+    groups = sources(channels)
+    return (groups,) + time_base(groups, rate, start, end)
+
+def iter_align(channels: List, rate: float = None, method: str = 'linear', start: float = None,\
+        end: float = None, samples_per_chunk: int = CHUNK_SAMPLES, dtype=np.float64) \
+        -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Resamples channels onto a common time base, chunk by chunk.
+
+    Channels that share a time channel are resampled together. Per chunk, only
+    the samples around the chunk are read from the file, so channels don't have
+    to be loaded.
+
+    Args:
+        channels (list[Channel]): The channels, they may belong to different groups.
+        rate (float): Samples per unit of the time channels (Hz for times in s).
+            Defaults to the highest rate of the channels.
+        method (str): 'linear' interpolation, the 'nearest' sample or 'zoh' (zero
+            order hold, the last sample at or before every point in time).
+        start (float): Start of the time base, defaults to the latest start of the channels.
+        end (float): End of the time base (inclusive), defaults to the earliest end.
+        samples_per_chunk (int): Amount of samples of the time base per chunk.
+        dtype (np.dtype): Type of the values.
+
+    Yields:
+        Tuple[np.ndarray, np.ndarray]: The points in time and the values (samples x channels,
+            in Fortran order, so every channel is contiguous). Points in time outside of
+            the time channel of a channel are NaN.
+    """
+    if samples_per_chunk < 1:
+        raise ValueError('samples_per_chunk has to be at least 1.')
+    groups, rate, start, length = prepare(channels, rate, method, start, end)
+    f = open_stream(groups)
+    try:
+        for begin in range(0, length, samples_per_chunk):
+            t = start + np.arange(begin, min(begin + samples_per_chunk, length)) / rate
+            out = np.empty((len(t), len(channels)), dtype=dtype, order='F')
+            for group in groups:
+                group.resample(t, method, out, f)
+            yield t, out
+    finally:
+        if f is not None:
+            f.close()
+
+def align(channels: List, rate: float = None, method: str = 'linear', start: float = None,\
+        end: float = None, samples_per_chunk: int = CHUNK_SAMPLES, dtype=np.float64) -> Tuple[np.ndarray, np.ndarray]:
+    """Resamples channels onto a common time base (see iter_align).
+
+    The values are written into one array chunk by chunk, so only the samples
+    around a chunk are read at once.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The points in time and one contiguous array
+            of the values (samples x channels, in Fortran order).
+    """
+    if samples_per_chunk < 1:
+        raise ValueError('samples_per_chunk has to be at least 1.')
+    groups, rate, start, length = prepare(channels, rate, method, start, end)
+    time = start + np.arange(length) / rate
+    values = np.empty((length, len(channels)), dtype=dtype, order='F')
+    f = open_stream(groups)
+    try:
+        for begin in range(0, length, samples_per_chunk):
+            stop = min(begin + samples_per_chunk, length)
+            for group in groups:
+                group.resample(time[begin:stop], method, values[begin:stop], f)
+    finally:
+        if f is not None:
+            f.close()
+    return time, values
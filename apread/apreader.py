@@ -1,78 +1,60 @@
 from __future__ import annotations
 
-import multiprocessing as mp
+import glob
 import os
-import re
+import warnings
 
 # binary imports
+from mmap import mmap as MemoryMap, ACCESS_READ
 from os import SEEK_SET
-from typing import List
+from typing import Iterator, List
 
-from matplotlib import pyplot as plt
-from tqdm import tqdm
 import numpy as np
 import numpy.typing as nptyp
 from typing import Tuple
+# asyncio api
+from apread.aio import Executor, load_channels, run_blocking
+# common time base of channels
+from apread.align import align, iter_align
 # binary reader to read binary files
-from apread.binaryReader import BinaryReader
-
+from apread.binaryReader import BinaryReader, decode_string
+# persistent cache of parsed files
+from apread.cache import DEFAULT_CACHE_SIZE, FileCache, fingerprint
+# catalog
+from apread.catalog import Catalog
 # channel definition
-from apread.entries import Channel, Group
-
-def get_cmap(n, name='jet'):
-    '''Returns a function that maps each index in 0, 1, ..., n-1 to a distinct 
-    RGB color; the keyword argument name must be a standard mpl colormap name.'''
-    return plt.get_cmap(name, n)
+from apread.entries import Channel, Group, resolve_dtype
+# export to other file formats
+from apread.export import CHUNK_SAMPLES, export_reader
+# timings and I/O
+from apread.metrics import Metrics
+# parallel reading of channel data
+from apread.parallel import read_channels
+# finding time channels
+from apread.resolver import GROUP_KEYS, TimeResolver, Unresolved, group_key
+# statistics of the data
+from apread.stats import ChannelStats, stats_of
+# progress bars (tqdm is optional)
+from apread.tools import progress
+
+# plotting needs matplotlib, which is only imported when plotting (see apread.plotting)
+def get_cmap(n, name='hsv'):
+    """Returns a function that maps each index in 0, 1, ..., n-1 to a distinct color
+    (see apread.plotting.get_cmap)."""
+    from apread.plotting import get_cmap
+    return get_cmap(n, name)
 
 def plot_multiple_datasets(datasets: list[Tuple[nptyp.NDArray, nptyp.NDArray, str, str, str]]\
-        , plt_title = ''):
-    """
-    Plots multiple datasets on the same plot with separate y-axes.
-
-    Parameters:
-    datasets (list of tuples): Each tuple should contain (x, y, color, ylabel, title)
-    """
-    fig, ax = plt.subplots()
-    cmap = get_cmap(len(datasets)+5, name='Set1')
-    lbs = []
-    for i, data in enumerate(datasets):
-        x, y, style, ylabel, title = data
-
-            
-        if i == 0:
-            ax1 = ax
-        else:
-            ax1 = ax.twinx()
-            ax1.spines['right'].set_position(('outward', 60*(i-1)))
-
-        if style is None: 
-            l = ax1.plot(x, y, color=cmap(i), label=title)[0]
-        else:
-            l = ax1.plot(x, y, style, label=title)[0]
-            
-        ax1.set_ylabel(ylabel, color=l.get_color())
-        ax1.tick_params(axis='y', colors=l.get_color())
-        lbs.append((l, ylabel))
-
-    ax.legend([x[0] for x in lbs], [x[1] for x in lbs])
-    ax.set_title(plt_title)
-    fig.tight_layout()
-    plt.show()
-    return fig,ax
+        , plt_title = '', decimate = 'minmax'):
+    """Plots multiple datasets on the same plot with separate y-axes
+    (see apread.plotting.plot_multiple_datasets)."""
+    from apread.plotting import plot_multiple_datasets
+    return plot_multiple_datasets(datasets, plt_title, decimate)
 
 def align_yaxis(ax1, v1, ax2, v2):
     """adjust ax2 ylimit so that v2 in ax2 is aligned to v1 in ax1"""
-    _, y1 = ax1.transData.transform((0, v1))
-    _, y2 = ax2.transData.transform((0, v2))
-    inv = ax2.transData.inverted()
-    _, dy = inv.transform((0, 0)) - inv.transform((0, y1-y2))
-    miny, maxy = ax2.get_ylim()
-    ax2.set_ylim(miny+dy, maxy+dy)
-
-def get_cmap(n, name='hsv'):
-    '''Returns a function that maps each index in 0, 1, ..., n-1 to a distinct 
-    RGB color; the keyword argument name must be a standard mpl colormap name.'''
-    return plt.cm.get_cmap(name, n)
+    from apread.plotting import align_yaxis
+    align_yaxis(ax1, v1, ax2, v2)
 
 class APReader:
     
@@ -85,100 +67,299 @@ class APReader:
     """
     Groups: List[Group]
 
-    def __init__(self, path, verbose=False, parallelPool = None):
+    def __init__(self, path, verbose=False, parallelPool = None, lazy=False, mmap=False,\
+        workers=None, cache_dir=None, cache_size=DEFAULT_CACHE_SIZE, progress=None,\
+        resolver=None, raw=False, dtype='native', metrics=None, group_by='length', contiguous=False):
         """Creates a new APReader based on a .binary file (path).
 
         Args:
             path (str): path to a catmanAP binary file.
             verbose (boolean): Show debug output.
-            parallelPool (multiprocessing.Pool): If passed, the loading of files will be
-                done on the threads in the pool.
+            parallelPool (multiprocessing.Pool): Deprecated, use workers instead. If passed,
+                the channels are loaded with as many threads as there are processes in the pool.
+            lazy (boolean): Only parse the headers. The data of every channel is
+                loaded from the file the first time it is accessed.
+            mmap (boolean): Map the file into memory (read-only). The data of 4- and
+                8-byte channels will be views into the mapping instead of copies.
+            workers (int): Amount of threads to read the channel data with. Channels
+                and large chunks of channels are read in parallel.
+            cache_dir (str): Folder of a persistent cache (see apread.cache.FileCache).
+                The parsed file is stored there and reused as long as the file is unchanged.
+            cache_size (int): Maximum size of the cache folder in bytes.
+            progress (boolean): Show a progress bar while reading (needs tqdm). By default,
+                it is shown if tqdm is installed and the output is a terminal.
+            resolver (TimeResolver | Callable): Finds the time channel of every group
+                (see apread.resolver.TimeResolver). A function is used as callback of
+                the default resolver. By default, channels are matched by name and
+                unit ('s'), the user is never asked.
+            raw (boolean): Keep the samples of 2-byte channels as unsigned 16-bit
+                integers (Channel.raw), which needs a quarter of the memory. They
+                are scaled when Channel.data is accessed (see Channel.scaled).
+            dtype (str | np.dtype): Type of the data of all channels. 'native' keeps
+                the type of the file (float32 for 4-byte, float64 for 2- and 8-byte
+                channels), np.float32 or np.float64 converts the data while reading.
+            metrics (boolean | Callable | Metrics): Collect timings and I/O of this reader
+                in reader.metrics (see apread.metrics.Metrics). A function is used as
+                hook, it is called with every event. Disabled by default.
+            group_by (str | Callable): How channels are grouped before the time channels
+                are found. 'length' groups channels with the same amount of samples,
+                'rate' also needs the same sample interval ('dt' of the extended header)
+                and 'start' also the same start time ('T0'). A function returns the
+                key of a channel (see apread.resolver.GROUP_KEYS).
+            contiguous (boolean): Read the data channels of every group into one array
+                (Group.array, samples x channels). The data of every channel is a view of
+                its column. Can't be combined with mmap or raw.
         """
         self.verbose = verbose
+        self.progress = progress
+        self.lazy = lazy
+        self.useMap = mmap
+        self.keepRaw = raw
+        if contiguous and (mmap or raw):
+            raise ValueError('contiguous=True can not be combined with mmap=True or raw=True.')
+        self.contiguous = contiguous
+        # type of the channel data, None for 'native'
+        self.dtype = resolve_dtype(dtype)
+        # the read-only memory map of the file (only if mmap=True)
+        self.dataMap = None
         self.filepath = path
         self.fileName = os.path.splitext(os.path.basename(path))[0]
-        self.parallelLoad = parallelPool is not None
-        self.parallelPool = parallelPool
+        if parallelPool is not None:
+            warnings.warn('APReader(parallelPool=...) is deprecated, use workers=... instead.',\
+                DeprecationWarning, stacklevel=2)
+            if workers is None:
+                workers = parallelPool._processes
+        self.workers = workers
+        self.parallelLoad = workers is not None and workers > 1
         self.Channels = []
         self.Groups = []
+        # index of the channels, built by connect
+        self.catalog = Catalog([])
+        # groups of channels without a time channel
+        self.unresolved: List[Unresolved] = []
+        if resolver is None:
+            resolver = TimeResolver()
+        elif not isinstance(resolver, TimeResolver):
+            resolver = TimeResolver(callback=resolver)
+        self.resolver = resolver
+        # compared with the cached reader, the resolver itself is not pickled
+        self.resolverKey = resolver.fingerprint()
+        self.groupKey = group_key(group_by)
+        self.cache = FileCache(cache_dir, cache_size) if cache_dir is not None else None
+        if metrics is None or metrics is False:
+            metrics = None
+        elif metrics is True:
+            metrics = Metrics()
+        elif not isinstance(metrics, Metrics):
+            metrics = Metrics(hook=metrics)
+        self.metrics = metrics
         
-        if self.parallelLoad:
-            print(f'INFO: Using {len(mp.active_children())} processes to load data.')
+        if self.parallelLoad and self.verbose:
+            print(f'INFO: Using {self.workers} threads to load data.')
+
+        # the state of the file before it is parsed, stored with the cache entry
+        self.fileState = None
+        if self.cacheable:
+            if self.metrics is not None:
+                self.metrics.start('cache')
+            self.fileState = fingerprint(path)
+            restored = self.restore()
+            if self.metrics is not None:
+                self.metrics.stop('cache')
+            if restored:
+                return
         
         self.read()
+        if self.metrics is not None:
+            self.metrics.start('connect')
         self.connect()
+        if self.metrics is not None:
+            self.metrics.stop('connect')
+
+        # the groups are only known now, so their data is read after connecting
+        if self.contiguous and not self.lazy:
+            if self.metrics is not None:
+                self.metrics.start('data')
+            self.loadArrays()
+            if self.metrics is not None:
+                self.metrics.stop('data')
+
+        if self.cacheable:
+            if self.metrics is not None:
+                self.metrics.start('cache')
+            self.cache.store(self)
+            if self.metrics is not None:
+                self.metrics.stop('cache')
+
+    @property
+    def cacheable(self) -> bool:
+        """True, if this reader has a cache and can be restored from it.
+
+        Readers with a function as group_by or as resolver are neither restored
+        nor stored, because functions can't be compared.
+        """
+        return self.cache is not None and self.groupKey in GROUP_KEYS.values() and self.resolverKey is not None
+
+    def restore(self) -> bool:
+        """Restores this reader from the cache.
+
+        Channels, which have been loaded when the file was cached, are mapped
+        from the cache. If the reader is not lazy, the remaining channels are
+        read from the file and the cache is updated.
+
+        Returns:
+            bool: True, if the file was found in the cache.
+        """
+        cached = self.cache.load(self.filepath, self.fileState)
+        # the data was cached in another type (or as raw samples) or the channels were grouped
+        # or resolved differently (resolvers with a callback can't be compared)
+        if cached is None or getattr(cached, 'dtype', None) != self.dtype\
+                or getattr(cached, 'keepRaw', False) != self.keepRaw\
+                or getattr(cached, 'groupKey', None) is not self.groupKey\
+                or self.resolverKey is None or getattr(cached, 'resolverKey', None) != self.resolverKey:
+            return False
+
+        if self.verbose:
+            print(f'\t[ {self.fileName} ] Restored from cache.')
+
+        # the options of this reader override the cached ones, the file may have been
+        # cached under another (relative) path
+        options = {key: getattr(self, key) for key in \
+            ['verbose', 'lazy', 'useMap', 'keepRaw', 'contiguous', 'workers', 'parallelLoad', 'cache', 'resolver',\
+             'resolverKey', 'metrics', 'filepath', 'fileName', 'fileState']}
+        self.__dict__.update(cached.__dict__)
+        self.__dict__.update(options)
+
+        # synthesized time channels are only part of their group
+        channels = {id(x): x for x in self.Channels}
+        channels.update((id(x), x) for group in self.Groups for x in group.Channels)
+        for channel in channels.values():
+            channel.verbose = self.verbose
+            channel.keepRaw = self.keepRaw
+            channel.metrics = self.metrics
+            channel.filePath = self.filepath
+        if self.useMap and self.dataMap is None:
+            self.mapFile()
+        elif not self.useMap and self.dataMap is not None:
+            self.dataMap = None
+            for channel in self.Channels:
+                channel.dataMap = None
+
+        missing = [x for x in self.Channels if not x.isLoaded]
+        if not self.lazy and self.contiguous:
+            # cached channels are copied into the arrays of their groups
+            self.loadArrays()
+            if len(missing) > 0:
+                self.cache.store(self)
+        elif not self.lazy and len(missing) > 0:
+            if self.useMap:
+                for channel in missing:
+                    channel.load()
+            else:
+                read_channels(missing, self.workers, metrics=self.metrics)
+                self.cache.store(self)
+        return True
 
     def connect(self):
         """
         Find channels with equal data length and filter the name for "time" to 
         connect the time-channel with every value-channel (Channel -> channel.Time).
+
+        Channels are grouped by the key of the reader (see group_by), this takes
+        linear time in the amount of channels.
         """
         # no channels no connection
         if len(self.Channels) == 0:
+            self.catalog = Catalog([])
             return
 
-        # create dictionary entries for every length of channels
-        # Dictionary: [int: channel.Length, List: Channels]
+        # channels with the same key (by default the same amount of samples) form a group,
+        # channels without samples are not grouped
         channelGroups = {}
-        # loop through channels
         for channel in self.Channels:
-            # if the current channel length has not been analyzed yet
-            if channel.length not in channelGroups:
-                # add a new dictionary entry
-                channelGroups[channel.length] = []
-            
-            # append the channel to the dictionary's entry
-            channelGroups[channel.length].append(channel)
-                
-        # now, for each channel-group find the time-channel (only if length of the gorup > 0)
-        for group in [channelGroups[groupLen] for groupLen in channelGroups if groupLen > 0]:
-            # sometimes only one channel is in the group
-            if len(group) < 2:
-                for chan in group:
-                    chan.broken = True
-                    self.Channels.remove(chan)
-                continue
-            
-            
-            # find the time channel in the group
-            timeChannel = None            
-            for channel in group:
-                # condition: channel name has to contain "Zeit"
-                if re.match(r"([T|t]ime)|([Z|z]eit)",channel.Name) is not None:
-                    timeChannel = channel
-                    # there is only one time-channel
-                    break
-
-                # instead of assuming, ask the user if the timechannel is the one with "seconds"
-                if "s" == channel.unit:
-                    # this should be uncommented for the testing timing functions to be usable
-                    # timeChannel = channel
-                    # break
-                
-                    if input(f"Is '{channel.Name}' your time/reference channel? [y/n] ") == "y":
-                        timeChannel = channel
-                        break
-                                
-            # set the time-channel on every channel but itself
-            if timeChannel != None:
-                for channel in group:
-                    if channel is not timeChannel:
-                        channel.Time = timeChannel
-                        channel.isTime = False
-                    else:
-                        channel.isTime = True
-            else:
-                print("\t [ERROR] Channel-group does not contain a time-channel!")
-                print("\t  The current group will not be included in this output.")
-                continue
-            
-            # create new group based on the groups listed
-            self.Groups.append(Group(group, self.fileName, self.verbose))
-        
+            if channel.length > 0:
+                channelGroups.setdefault(self.groupKey(channel), []).append(channel)
+
+        # channels that are alone in their group are removed from the channels afterwards
+        single = set()
+        # the first samples of every time channel are read from one stream (see Group)
+        with open(self.filepath, 'rb') as f:
+            for group in channelGroups.values():
+                # sometimes only one channel is in the group
+                if len(group) < 2:
+                    for chan in group:
+                        chan.broken = True
+                        single.add(id(chan))
+                    self.unresolved.append(Unresolved(group, 'single channel'))
+                    continue
+
+                # find the time channel in the group
+                timeChannel = self.resolver.resolve(group)
+
+                # set the time-channel on every channel but itself
+                if timeChannel is not None:
+                    if timeChannel.isSynthetic:
+                        group = [timeChannel] + group
+                    for channel in group:
+                        if channel is not timeChannel:
+                            channel.Time = timeChannel
+                            channel.isTime = False
+                        else:
+                            channel.isTime = True
+                else:
+                    self.unresolved.append(Unresolved(group, 'no time channel'))
+                    if self.verbose:
+                        print("\t [ERROR] Channel-group does not contain a time-channel!")
+                        print("\t  The current group will not be included in this output.")
+                    continue
+
+                # create new group based on the groups listed
+                self.Groups.append(Group(group, self.fileName, self.verbose, timeChannel, f))
+
+        if len(single) > 0:
+            self.Channels[:] = [x for x in self.Channels if id(x) not in single]
+
         if len(self.Channels) > 0:
             self.date = self.Channels[0].date
-        
-        pass
+
+        self.catalog = Catalog(self.Channels, self.Groups)
+
+    def loadArrays(self):
+        """Stores the data channels of every group in one array (see Group.loadArray).
+
+        Channels that are not part of a group are loaded one by one.
+        """
+        workers = self.workers if self.parallelLoad else 1
+        for group in progress(self.Groups, self.progress, leave=False):
+            group.loadArray(workers, self.metrics)
+        missing = [x for x in self.Channels if not x.isLoaded]
+        read_channels(missing, workers, metrics=self.metrics)
+
+    def __getstate__(self):
+        """Readers are pickled without the memory map and the cache."""
+        state = self.__dict__.copy()
+        state['dataMap'] = None
+        state['cache'] = None
+        # the resolver may contain functions that can't be pickled
+        state['resolver'] = None
+        if self.groupKey not in GROUP_KEYS.values():
+            state['groupKey'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for channel in self.Channels:
+            channel.metrics = self.metrics
+        # map the file again, so that channels which are not loaded yet are views again
+        if self.useMap:
+            self.mapFile()
+
+    def mapFile(self):
+        """Maps the file into memory (read-only) and passes the mapping to all channels."""
+        with open(self.filepath, 'rb') as f:
+            self.dataMap = MemoryMap(f.fileno(), 0, access=ACCESS_READ)
+        for channel in self.Channels:
+            channel.dataMap = self.dataMap
 
     def __iter__(self):
         """Iterates over everything in this reader.
@@ -197,87 +378,269 @@ class APReader:
 
         Creates channels which can be later accessed.
         """        
+        if self.metrics is not None:
+            self.metrics.start('header')
+
         # start by opening a binary stream on the filepath
         with open(self.filepath, 'rb') as f:
             # create a binary reader to simplify inputs
             reader = BinaryReader(f)
-            # get the file ID (usually >= 5012)
-            self.fileID = reader.read_int16()
-            # this is the byte offset, at which the data starts
-            self.dataOffset = reader.read_int32()
-            # read comment
-            self.comment = reader.read_string(reader.read_int16())
-
-            # readaway
-            for i in range(32):
-                lresakt = reader.read_int16()
-                _ = reader.read_string(lresakt)
-
-            # total number of channels
-            self.numChannels = reader.read_int16()
+            # get the file ID (usually >= 5012) and the byte offset, at which the data starts
+            self.fileID, self.dataOffset = reader.read_struct(reader.layout('hi'))
+            # the header ends at the data offset, it is parsed from memory
+            reader.preload(self.dataOffset)
+            if self.metrics is not None:
+                self.metrics.read(self.dataOffset, 2)
+            # read comment, its bytes are kept since decoding is not always reversible
+            self.rawStrings = {'comment': reader.read(reader.read_int16())}
+            self.comment = decode_string(self.rawStrings['comment'])
+
+            # 32 strings of unknown meaning (the first one is the offset of the
+            # section behind the data), kept as they are to write the file again
+            self.headerStrings = [reader.read(reader.read_int16()) for i in range(32)]
+
+            # total number of channels and maximum channel length (usually 0 meaning unlimited)
+            self.numChannels, self.maxLength = reader.read_struct(reader.layout('hi'))
             if self.verbose:
                 print(f"\t[ {self.fileName} ] Found {self.numChannels} Channels.")
-            # maximum channel length (usually 0 meaning unlimited)
-            self.maxLength = reader.read_int32()
 
-            # readaway
-            for i in range(self.numChannels):
-                reader.read_int32()
-            
-            # reduced factor (unused)
-            _ = reader.read_int32()
+            # readaway (channel offsets, they follow from the headers) and reduced factor (unused)
+            reader.skip(4 * self.numChannels)
+            self.reducedFactor = reader.read_int32()
 
             # loop channels
             for i in range(self.numChannels):
                 # create new channel on top of reader
                 #! be careful with current stream position
                 channel = Channel(reader, self.fileName, self.filepath,\
-                    self.verbose, self.parallelPool)
+                    self.verbose, self.workers, self.keepRaw, self.dtype)
 
                 if not channel.broken and channel.length > 0:                    
                     self.Channels.append(channel)
                 elif self.verbose:
                     print(f'\t[ {self.fileName} ] Skipping channel (zero length or invalid data)')
 
+            # channels are stored one after another, so the offset of every
+            # channel block follows from the sizes of the preceding ones
+            offset = self.dataOffset
+            for channel in self.Channels:
+                channel.dataOffset = offset
+                channel.metrics = self.metrics
+                offset += channel.dataSize
+
+            if self.metrics is not None:
+                self.metrics.stop('header')
+
+            # one mapping is shared by all channels, it stays valid after closing the file
+            if self.useMap:
+                self.mapFile()
+
+            # lazy readers load channel data on first access (metrics are recorded by the channels)
+            if self.lazy:
+                if self.verbose:
+                    print(f'\t[ {self.fileName} ] Lazy mode, skipping channel data.')
+                return
+            # contiguous groups are read after connecting (see loadArrays)
+            if self.contiguous:
+                return
+
+            if self.metrics is not None:
+                self.metrics.start('data')
+
             # seek stream pointer to start of data
             reader.seek(self.dataOffset, SEEK_SET)
 
             if self.verbose:
                 print(f'\t[ {self.fileName} ] Reading Channels...')
 
+            # all channels are read at once by a pool of threads
+            if self.parallelLoad and not self.useMap:
+                read_channels(self.Channels, self.workers, metrics=self.metrics)
             # loop through channels again and access data one after another
-            for channel in tqdm(self.Channels, leave=False):
-                channel.readData()
+            else:
+                for i, channel in enumerate(progress(self.Channels, self.progress, leave=False)):
+                    if self.metrics is None:
+                        channel.readData(reader)
+                    else:
+                        self.metrics.load(channel, channel.readData, reader, index=i, total=len(self.Channels))
+
+            if self.metrics is not None:
+                self.metrics.stop('data')
 
             if self.verbose:
                 print(f'\t[ {self.fileName} ] Done. {len(self.Channels)} Channels left after filtering.') 
        
+    def slice(self, t_start: float, t_end: float, channel_names: list[str] = None) -> list[Group]:
+        """Reads the samples between t_start and t_end of every group.
+
+        Only the requested range of every channel is read from the file, so this
+        is fast even for large files (see Group.slice).
+
+        Args:
+            t_start (float): Start time (inclusive), in the unit of the time channels.
+            t_end (float): End time (inclusive).
+            channel_names (list[str]): Names of the data channels to read. Groups
+                without any of these channels are skipped. Defaults to all channels.
+
+        Returns:
+            list[Group]: A sliced group for every group of this reader.
+        """
+        groups = []
+        for group in self.Groups:
+            indices = None
+            if channel_names is not None:
+                indices = [i for i, chan in enumerate(group.ChannelsY) if chan.Name in channel_names]
+                if len(indices) == 0:
+                    continue
+            groups.append(group.slice(t_start, t_end, indices))
+        return groups
+
+    def alignChannels(self, channels) -> list[Channel]:
+        """The channels to align: all data channels by default, names are looked up in the catalog."""
+        if channels is None:
+            return [x for group in self.Groups for x in group.ChannelsY]
+        return [self.catalog[x] if isinstance(x, str) else x for x in channels]
+
+    def align(self, channels: list = None, rate: float = None, method: str = 'linear', start: float = None,\
+            end: float = None, samples_per_chunk: int = CHUNK_SAMPLES, dtype=np.float64) -> Tuple[nptyp.NDArray, nptyp.NDArray]:
+        """Resamples channels of different groups onto a common time base (see apread.align.iter_align).
+
+        Channels of the same group are resampled together, only the samples around
+        every chunk of the time base are read, so lazy channels are not loaded.
+
+        Args:
+            channels (list[Channel | str]): Channels or their names, defaults to all data channels.
+            rate (float): Samples per second of the time base, defaults to the highest rate.
+            method (str): 'linear', 'nearest' or 'zoh' (zero order hold).
+            start (float): Start of the time base, defaults to the latest start of the channels.
+            end (float): End of the time base (inclusive), defaults to the earliest end.
+            samples_per_chunk (int): Amount of samples of the time base that are computed at once.
+            dtype (np.dtype): Type of the values.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The time base and the values (samples x channels),
+                NaN outside of the time of a channel.
+
+        Examples:
+            time, values = reader.align(['F1', 'T12_ref'], rate=1000)
+        """
+        return align(self.alignChannels(channels), rate, method, start, end, samples_per_chunk, dtype)
+
+    def iter_align(self, channels: list = None, rate: float = None, method: str = 'linear', start: float = None,\
+            end: float = None, samples_per_chunk: int = CHUNK_SAMPLES, dtype=np.float64) \
+            -> Iterator[Tuple[nptyp.NDArray, nptyp.NDArray]]:
+        """Like APReader.align, but yields the time base and the values chunk by chunk."""
+        return iter_align(self.alignChannels(channels), rate, method, start, end, samples_per_chunk, dtype)
+
+    def stats(self, workers: int = None, samples_per_chunk: int = CHUNK_SAMPLES) -> dict[str, ChannelStats]:
+        """The statistics of all channels (see Channel.stats), computed in parallel.
+
+        The data is read in chunks, lazy readers don't load the channels for this.
+        The results are kept on the channels, calling this again doesn't read the file.
+
+        Args:
+            workers (int): Amount of threads, defaults to the workers of this reader
+                or the number of CPUs.
+            samples_per_chunk (int): Amount of samples read at once.
+
+        Returns:
+            dict[str, ChannelStats]: The statistics by channel name.
+        """
+        return stats_of(self.Channels, workers or self.workers, samples_per_chunk)
+
+    async def aload(self, limit: int = None, executor: Executor = None):
+        """Loads the data of all channels concurrently without blocking the event loop.
+
+        See apread.aio.load_channels, the reader itself is opened with apread.aopen.
+
+        Args:
+            limit (int): Maximum amount of channels that are loaded at once.
+            executor (Executor): Runs the blocking reads, defaults to apread.aio.get_executor().
+        """
+        await load_channels(self.Channels, limit, executor)
+
+    async def aslice(self, t_start: float, t_end: float, channel_names: list[str] = None,\
+            executor: Executor = None) -> list[Group]:
+        """APReader.slice without blocking the event loop (see apread.aio)."""
+        return await run_blocking(self.slice, t_start, t_end, channel_names, executor=executor)
+
+    def export(self, path: str, format: str = 'parquet', samples_per_chunk: int = CHUNK_SAMPLES,\
+            compression: str = None) -> list[str]:
+        """Exports every group into a table (see apread.export.export_reader).
+
+        Args:
+            path (str): Output folder with one file per group (parquet, arrow) or
+                a single file with one group per group (hdf5).
+            format (str): 'parquet', 'hdf5' or 'arrow'.
+            samples_per_chunk (int): Amount of samples written at once.
+            compression (str): Compression of the output, None uses the default of the format.
+
+        Returns:
+            list[str]: The paths of the tables.
+        """
+        return export_reader(self, path, format, samples_per_chunk, compression)
+
+    def to_frames(self, backend: str = 'pandas', channel_names: list[str] = None, t_start: float = None,\
+            t_end: float = None, index: bool = True) -> list:
+        """Converts every group into a DataFrame (see Group.to_pandas and Group.to_polars).
+
+        Only the selected channels and the samples between t_start and t_end are
+        read, lazy readers don't load the other channels.
+
+        Args:
+            backend (str): 'pandas' or 'polars'.
+            channel_names (list[str]): Names of the data channels. Groups without any
+                of these channels are skipped. Defaults to all channels.
+            t_start (float): Start time (inclusive), defaults to the start of every group.
+            t_end (float): End time (inclusive), defaults to the end of every group.
+            index (bool): Use the time channel as index (pandas only).
+
+        Returns:
+            list[DataFrame]: A frame for every group of this reader.
+
+        Examples:
+            frames = reader.to_frames(channel_names=['F1'], t_start=10, t_end=20)
+        """
+        if backend not in ['pandas', 'polars']:
+            raise ValueError(f'Unknown backend "{backend}", use "pandas" or "polars".')
+        frames = []
+        for group in self.Groups:
+            names = None
+            if channel_names is not None:
+                names = [chan.Name for chan in group.ChannelsY if chan.Name in channel_names]
+                if len(names) == 0:
+                    continue
+            if backend == 'pandas':
+                frames.append(group.to_pandas(names, t_start, t_end, index))
+            else:
+                frames.append(group.to_polars(names, t_start, t_end))
+        return frames
+
     def collectChannels(self, channel_names: list[str]) -> list[Channel] | Channel:
-        chans = []
-        
-        for cname in channel_names:
-            for c in self.Channels:
-                if c.Name == cname:
-                    chans.append(c)
-        # for c in self.Channels:
-        #     if any([x in c.Name for x in channel_names]):
-        #         chans.append(c)
-                
+        """The channels with these exact names (see catalog for lookups with a consistent return type).
+
+        Returns:
+            list[Channel] | Channel: The channels, a single channel if only one was found.
+
+        Raises:
+            IndexError: If no channel was found.
+        """
+        chans = [c for cname in channel_names for c in self.catalog.all(cname)]
         return chans if len(chans) > 1 else chans[0]
       
     def collectDatasets(self, channel_names: list[str]) -> list[Tuple[nptyp.NDArray, nptyp.NDArray, str, str, str]]:
-        chans = []
-        for c in self.Channels:
-            if any([x in c.Name for x in channel_names]):
-                chans.append((c.Time.data, c.data, None, f'{c.Name}[{c.unit}]', c.Name))
-                
-        return chans
+        """Datasets (see plot_multiple_datasets) of all channels whose names contain any of channel_names."""
+        patterns = [f'*{glob.escape(x)}*' for x in channel_names]
+        return [(c.Time.data, c.data, None, f'{c.Name}[{c.unit}]', c.Name) for c in self.catalog.find(patterns)]
               
-    def plot(self, groupIndices=None, sameAxis = False):
+    def plot(self, groupIndices=None, sameAxis = False, decimate = 'minmax'):
         """Plots the complete file.
+
+        Args:
+            decimate (str): Reduce the data to the width of the plot, see Channel.plot.
         """
         for group in self.Groups:
-            group.plot(sameAxis = sameAxis)     
+            group.plot(sameAxis = sameAxis, decimate = decimate)     
             
     def plotGroup(self, channelIndex):
         """Plot a specific channel
@@ -304,4 +667,4 @@ class APReader:
             print('---------')
             print(group.Name)
             for channel in group.ChannelsY:
-                print(f'\t{channel.Name} ({len(channel.data)})')
\ No newline at end of file
+                print(f'\t{channel.Name} ({channel.length})')
\ No newline at end of file
@@ -0,0 +1,81 @@
+# parallel processing
+import glob
+import os
+# concurrent.futures loads the process pool (and multiprocessing) on first attribute access
+from concurrent import futures
+
+# typing
+from typing import Iterator, Tuple
+
+from apread.apreader import APReader
+
+
+def _open(path: str, kwargs: dict) -> APReader:
+    """Opens a single file, this runs in the worker processes."""
+    return APReader(path, **kwargs)
+
+def find_files(paths_or_glob) -> list[str]:
+    """Resolves a glob pattern or a list of paths/patterns to a list of files.
+
+    Args:
+        paths_or_glob (str | Iterable[str]): A glob pattern (e.g. 'data/**/*.bin') or
+            a list of paths and patterns.
+
+    Returns:
+        list[str]: The files in the order of the input, patterns are sorted.
+    """
+    if isinstance(paths_or_glob, (str, os.PathLike)):
+        paths_or_glob = [paths_or_glob]
+
+    files = []
+    for path in paths_or_glob:
+        path = os.fspath(path)
+        if glob.has_magic(path):
+            files += sorted(glob.glob(path, recursive=True))
+        else:
+            files.append(path)
+    return files
+
+def open_many(paths_or_glob, workers: int = None, ordered: bool = False, **kwargs) \
+        -> Iterator[Tuple[str, APReader, Exception]]:
+    """Opens many catmanAP binary files in a pool of processes.
+
+    The results are yielded as soon as they are available. An error in one file
+    does not stop the other files, instead it is returned together with the path.
+
+    To avoid sending the channel data back from the workers, pass lazy=True
+    (and mmap=True). The workers then only parse the headers and the data is read
+    in this process when it is accessed (with mmap=True as views into the file).
+    Otherwise every array is copied once when it is sent back.
+
+    Args:
+        paths_or_glob (str | Iterable[str]): A glob pattern or a list of paths/patterns.
+        workers (int): Amount of processes. Defaults to the number of CPUs.
+        ordered (bool): Yield the files in the order of the input instead of the
+            order in which they finish.
+        **kwargs: Passed to every APReader (e.g. lazy=True, mmap=True).
+
+    Yields:
+        Tuple[str, APReader, Exception]: The path and either the reader or the error.
+
+    Examples:
+        for path, reader, error in open_many('campaign/*.bin', workers=8, lazy=True):
+            if error is not None:
+                print(f'{path} failed: {error}')
+                continue
+            ...
+    """
+    files = find_files(paths_or_glob)
+    if len(files) == 0:
+        return
+
+    with futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_open, path, kwargs): path for path in files}
+
+        for future in (pending if ordered else futures.as_completed(pending)):
+            path = pending[future]
+            error = future.exception()
+            if error is not None:
+                yield path, None, error
+            else:
+                yield path, future.result(), None
@@ -1,18 +1,68 @@
 import struct
-from os import SEEK_CUR
+from os import SEEK_CUR, SEEK_SET
 from typing import BinaryIO
 
 
 ENDIAN_PREFIXES = ("@", "<", ">", "=", "!")
 
 
+def decode_string(raw: bytes, encoding: str = "utf-8") -> str:
+    """Decodes a string read from a binary file.
+
+    Catman uses a single byte encoding for some characters (e.g. '°'), these
+    are prefixed with b'\\xc2' to make them valid utf-8.
+    """
+    try:
+        return raw.decode(encoding)
+    except:
+        try:
+            return (b'\xc2' + raw).decode(encoding)
+        except:
+            return "unknown"
+
+
 class BinaryReader:
     """
     Base class to read binary files.
+
+    A region of the file can be loaded into memory at once (see BinaryReader.preload).
+    All reads inside that region are then served from memory.
     """
     def __init__(self, buf: BinaryIO, endian: str = "@") -> None:
         self.buf = buf
         self.endian = endian
+        # compiled layouts by format string
+        self._layouts = {}
+
+        # preloaded region of the file, starting at file position _base
+        self._view: memoryview = None
+        self._base = 0
+        # cursor inside the preloaded region
+        self._pos = 0
+
+        # precompiled layouts of the single values
+        self._int16 = self.layout("h")
+        self._int32 = self.layout("i")
+        self._float = self.layout("f")
+        self._double = self.layout("d")
+        self._byte = self.layout("b")
+
+    def layout(self, fmt: str) -> struct.Struct:
+        """Compiles a layout of multiple values with the endianness of this reader.
+
+        Native byte order ("@") is used without alignment, since catman
+        files are packed.
+
+        Args:
+            fmt (str): Format string without endian prefix, e.g. "hid".
+
+        Returns:
+            struct.Struct: The compiled layout to be used with read_struct.
+        """
+        if fmt not in self._layouts:
+            endian = "=" if self.endian == "@" else self.endian
+            self._layouts[fmt] = struct.Struct(endian + fmt)
+        return self._layouts[fmt]
 
     def align(self) -> None:
         old = self.tell()
@@ -20,54 +70,108 @@ class BinaryReader:
         if new > old:
             self.seek(new - old, SEEK_CUR)
 
-    def read(self, *args) -> bytes:
-        return self.buf.read(*args)
-
-    def seek(self, *args) -> int:
-        return self.buf.seek(*args)
+    def preload(self, end: int) -> None:
+        """Loads the file from the current position up to end in a single read.
+
+        Following reads are parsed from memory until the stream is moved
+        outside of the loaded region.
+
+        Args:
+            end (int): Absolute file position up to which the file is loaded.
+        """
+        self.release()
+        self._base = self.buf.tell()
+        self._view = memoryview(self.buf.read(max(end - self._base, 0)))
+        self._pos = 0
+
+    def release(self) -> None:
+        """Drops the preloaded region and continues reading from the file."""
+        if self._view is None:
+            return
+        self._view = None
+        # the file itself is positioned at the end of the region
+        self.buf.seek(self._base + self._pos, SEEK_SET)
+
+    def read(self, size: int = -1) -> bytes:
+        if self._view is None:
+            return self.buf.read(size)
+
+        end = self._pos + size
+        if size >= 0 and end <= len(self._view):
+            ret = self._view[self._pos:end].tobytes()
+            self._pos = end
+            return ret
+
+        # read beyond the preloaded region, the rest comes from the file
+        ret = self._view[self._pos:].tobytes()
+        self._view = None
+        return ret + self.buf.read(size - len(ret) if size >= 0 else -1)
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if self._view is not None and whence != SEEK_SET and whence != SEEK_CUR:
+            self.release()
+
+        if self._view is None:
+            return self.buf.seek(offset, whence)
+
+        target = offset if whence == SEEK_SET else self._base + self._pos + offset
+        if self._base <= target < self._base + len(self._view):
+            self._pos = target - self._base
+            return target
+
+        # leaving the preloaded region
+        self._view = None
+        return self.buf.seek(target, SEEK_SET)
 
     def tell(self) -> int:
-        return self.buf.tell()
+        if self._view is None:
+            return self.buf.tell()
+        return self._base + self._pos
+
+    def skip(self, size: int) -> None:
+        """Skips size bytes without reading them."""
+        if size > 0:
+            self.seek(size, SEEK_CUR)
+
+    def read_struct(self, layout: struct.Struct) -> tuple:
+        """Reads all values of a layout (see BinaryReader.layout) at once."""
+        if self._view is not None and self._pos + layout.size <= len(self._view):
+            ret = layout.unpack_from(self._view, self._pos)
+            self._pos += layout.size
+            return ret
+
+        return layout.unpack(self.read(layout.size))
 
     def read_string(self, size: int = None, encoding: str = "utf-8") -> str:
         if size == 0:
             return ""
 
-        ret = struct.unpack(self.endian + "%is" %
-                                (size), self.read(size))[0]
+        return decode_string(self.read(size), encoding)
 
-        try:            
-            return ret.decode(encoding)
-        except:
-            try:
-                return (b'\xc2' + ret).decode(encoding)
-            except:
-                return "unknown"
+    def skip_string(self) -> None:
+        """Skips a string that is prefixed with its length (int16)."""
+        self.skip(self.read_int16())
 
     def read_chars(self, size, encoding: str = "utf-8"):
-        ret = b""
-        for i in range(size):
-            ret += struct.unpack(self.endian + "c", self.read(1))[0]
-
-        return ret.decode(encoding)
+        return self.read(size).decode(encoding)
     def read_char(self, encoding: str = "ascii"):
-        return struct.unpack(self.endian + "c", self.read(1))[0].decode(encoding)
+        return self.read(1).decode(encoding)
     def read_byte(self) -> int:
-        return struct.unpack(self.endian + "b", self.read(1))[0]
-    
+        return self.read_struct(self._byte)[0]
+
     def read_int16(self) -> int:
-        return struct.unpack(self.endian + "h", self.read(2))[0]
+        return self.read_struct(self._int16)[0]
 
     def read_int32(self) -> int:
-        return struct.unpack(self.endian + "i", self.read(4))[0]
+        return self.read_struct(self._int32)[0]
 
     def read_float(self) -> float:
-        return struct.unpack(self.endian + "f", self.read(4))[0]
+        return self.read_struct(self._float)[0]
 
     def read_double(self) -> float:
-        return struct.unpack(self.endian + "d", self.read(8))[0]
+        return self.read_struct(self._double)[0]
     # Aliases
     def read_int(self) -> int:
         return self.read_int32()
-    
-    
\ No newline at end of file
+
+
@@ -0,0 +1,210 @@
+# persistent cache of parsed files
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+
+import numpy as np
+
+# bump this, if the layout of the cached objects changes
+CACHE_VERSION = 6
+# default maximum size of the cache folder in bytes
+DEFAULT_CACHE_SIZE = 2**30
+
+FINGERPRINT_FILE = 'fingerprint.json'
+INDEX_FILE = 'index.pkl'
+
+
+class _ArrayPickler(pickle.Pickler):
+    """Pickler that stores every array as a separate .npy file next to the index."""
+    def __init__(self, file, folder):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.folder = folder
+        self.count = 0
+
+    def persistent_id(self, obj):
+        if not isinstance(obj, np.ndarray):
+            return None
+        name = f'{self.count}.npy'
+        self.count += 1
+        np.save(os.path.join(self.folder, name), obj, allow_pickle=False)
+        return name
+
+class _ArrayUnpickler(pickle.Unpickler):
+    """Unpickler that maps the arrays of the index (see _ArrayPickler) into memory."""
+    def __init__(self, file, folder):
+        super().__init__(file)
+        self.folder = folder
+
+    def persistent_load(self, pid):
+        return np.load(os.path.join(self.folder, pid), mmap_mode='r')
+
+
+def fingerprint(path: str) -> dict:
+    """Identifies the state of a file by its size, modification time and a hash of its header.
+
+    Args:
+        path (str): Path to a catmanAP binary file.
+
+    Returns:
+        dict: Fingerprint of the file.
+    """
+    stat = os.stat(path)
+    with open(path, 'rb') as f:
+        # the header ends at the data offset
+        _, dataOffset = struct.unpack('=hi', f.read(6))
+        f.seek(0)
+        header = hashlib.sha1(f.read(max(dataOffset, 6))).hexdigest()
+
+    return {
+        'version': CACHE_VERSION,
+        'path': os.path.abspath(path),
+        'size': stat.st_size,
+        'mtime': stat.st_mtime_ns,
+        'header': header,
+    }
+
+def folder_size(folder: str) -> int:
+    """Total size of all files in a folder."""
+    return sum(entry.stat().st_size for entry in os.scandir(folder) if entry.is_file())
+
+
+class FileCache:
+    """
+    Persistent cache of parsed catmanAP files.
+
+    Every file gets a folder in the cache. It contains the parsed reader (headers,
+    channels and groups) as a pickled index and the data of all loaded channels as
+    .npy files, which are mapped into memory when the file is opened again.
+
+    An entry is only used if size, modification time and header of the file are
+    unchanged. If the cache grows larger than max_size, the least recently used
+    entries are removed.
+    """
+    def __init__(self, folder: str, max_size: int = DEFAULT_CACHE_SIZE):
+        """Creates the cache in a folder.
+
+        Args:
+            folder (str): The cache folder, created if it does not exist.
+            max_size (int): Maximum size of the cache in bytes.
+        """
+        self.folder = folder
+        self.max_size = max_size
+        os.makedirs(folder, exist_ok=True)
+
+    def entry(self, path: str) -> str:
+        """The folder of the cache entry of a file."""
+        key = hashlib.sha1(os.path.abspath(path).encode('utf-8')).hexdigest()
+        return os.path.join(self.folder, key)
+
+    def load(self, path: str, state: dict = None):
+        """Loads a file from the cache.
+
+        Args:
+            path (str): Path to a catmanAP binary file.
+            state (dict): The fingerprint of the file, computed if not given.
+
+        Returns:
+            APReader: The cached reader or None, if there is no valid entry.
+        """
+        entry = self.entry(path)
+        try:
+            with open(os.path.join(entry, FINGERPRINT_FILE), 'r') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if cached != (state or fingerprint(path)):
+            self.remove(path)
+            return None
+
+        try:
+            with open(os.path.join(entry, INDEX_FILE), 'rb') as f:
+                reader = _ArrayUnpickler(f, entry).load()
+        except Exception:
+            self.remove(path)
+            return None
+
+        # mark the entry as recently used (it may have been replaced by another process meanwhile)
+        try:
+            os.utime(os.path.join(entry, FINGERPRINT_FILE))
+        except OSError:
+            pass
+        return reader
+
+    def store(self, reader) -> bool:
+        """Stores a reader in the cache, replacing an existing entry of its file.
+
+        The entry gets the fingerprint the file had before it was parsed
+        (APReader.fileState), so a file that changed meanwhile is parsed again
+        next time. Errors while writing are not raised, the cache is only an
+        optimization. If several processes store the same file at once, one of
+        them wins.
+
+        Args:
+            reader (APReader): The reader to store.
+
+        Returns:
+            bool: True, if the entry was written by this call.
+        """
+        entry = self.entry(reader.filepath)
+        stored = False
+        temp = None
+        try:
+            # write into a temporary folder first, so a crash never leaves a broken entry
+            temp = tempfile.mkdtemp(dir=self.folder, prefix='.tmp-')
+            with open(os.path.join(temp, INDEX_FILE), 'wb') as f:
+                _ArrayPickler(f, temp).dump(reader)
+            with open(os.path.join(temp, FINGERPRINT_FILE), 'w') as f:
+                json.dump(getattr(reader, 'fileState', None) or fingerprint(reader.filepath), f)
+
+            self.remove(reader.filepath)
+            os.replace(temp, entry)
+            stored = True
+            self.evict()
+        except OSError:
+            # e.g. another process has stored the file in between (the entry is not empty)
+            pass
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # the reader contains objects that can't be pickled (e.g. a local function)
+            pass
+        finally:
+            if temp is not None:
+                shutil.rmtree(temp, ignore_errors=True)
+        return stored
+
+    def remove(self, path: str) -> None:
+        """Removes the entry of a file."""
+        shutil.rmtree(self.entry(path), ignore_errors=True)
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        for entry in os.scandir(self.folder):
+            if entry.is_dir():
+                shutil.rmtree(entry.path, ignore_errors=True)
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the cache is smaller than max_size."""
+        entries = []
+        for entry in os.scandir(self.folder):
+            if not entry.is_dir() or entry.name.startswith('.'):
+                continue
+            try:
+                used = os.stat(os.path.join(entry.path, FINGERPRINT_FILE)).st_mtime
+            except OSError:
+                used = 0
+            try:
+                entries.append((used, folder_size(entry.path), entry.path))
+            except OSError:
+                # removed by another process meanwhile
+                continue
+
+        total = sum(x[1] for x in entries)
+        for used, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,181 @@
+# indexed lookup of the channels of a reader
+import fnmatch
+import re
+
+# typing
+from typing import Dict, Iterable, List, Union
+
+
+class Catalog:
+    """
+    Index of the channels of a reader (see APReader.catalog).
+
+    The catalog is built once when the file is opened. It only uses the headers,
+    so it works before any data is loaded. Lookups by name, number, full name,
+    unit and group are dictionary lookups. Queries with patterns always return a
+    list of channels in the order of the file (empty, if nothing matches).
+
+        reader.catalog['Force']                   # the channel named 'Force'
+        reader.catalog.byNum(20)                  # the channel with number 20
+        reader.catalog.byUnit('°C')               # all channels in °C
+        reader.catalog.find('TE0*')               # glob pattern
+        reader.catalog.find(r'TE0\\d+$', regex=True)
+        reader.catalog.query(name='Diff_*', unit='°C')
+    """
+    def __init__(self, channels: List, groups: List = ()):
+        """Builds the indexes.
+
+        Args:
+            channels (list[Channel]): All channels of the file.
+            groups (list[Group]): The groups of the file.
+        """
+        self.channels = list(channels)
+        self.groups = list(groups)
+        # position of every channel, to return query results in the order of the file
+        self._order: Dict[int, int] = {}
+        self._names: Dict[str, List] = {}
+        self._nums: Dict[int, object] = {}
+        self._fullNames: Dict[str, object] = {}
+        self._units: Dict[str, List] = {}
+        self._groupNames: Dict[str, List] = {}
+        # group of every channel (by id, channels are not hashable by value)
+        self._groupOf: Dict[int, object] = {}
+
+        for i, channel in enumerate(self.channels):
+            self._order[id(channel)] = i
+            self._names.setdefault(channel.Name, []).append(channel)
+            self._nums.setdefault(channel.num, channel)
+            self._fullNames.setdefault(channel.fullName, channel)
+            self._units.setdefault(channel.unit, []).append(channel)
+
+        for group in self.groups:
+            self._groupNames.setdefault(group.Name, []).append(group)
+            for channel in group.Channels:
+                self._groupOf[id(channel)] = group
+
+    def __getstate__(self):
+        """The indexes use the ids of the channels, so they are built again after unpickling."""
+        return {'channels': self.channels, 'groups': self.groups}
+
+    def __setstate__(self, state):
+        self.__init__(state['channels'], state['groups'])
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def __iter__(self):
+        return iter(self.channels)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._names
+
+    def __getitem__(self, name: str):
+        """The first channel with this exact name.
+
+        Raises:
+            KeyError: If there is no channel with this name.
+        """
+        return self._names[name][0]
+
+    def get(self, name: str, default=None):
+        """The first channel with this exact name, default if there is none."""
+        channels = self._names.get(name)
+        return channels[0] if channels else default
+
+    def all(self, name: str) -> List:
+        """All channels with this exact name (names are not unique necessarily)."""
+        return list(self._names.get(name, []))
+
+    def byNum(self, num: int, default=None):
+        """The channel with this number (Channel.num), default if there is none."""
+        return self._nums.get(num, default)
+
+    def byFullName(self, fullName: str, default=None):
+        """The channel with this full name (Channel.fullName), default if there is none."""
+        return self._fullNames.get(fullName, default)
+
+    def byUnit(self, unit: str) -> List:
+        """All channels with this unit."""
+        return list(self._units.get(unit, []))
+
+    def byGroup(self, group) -> List:
+        """All channels of a group, including its time channel.
+
+        Args:
+            group (Group | int | str): The group, its index in APReader.Groups or its
+                name (the name of the time channel, all groups with that name).
+        """
+        if isinstance(group, int):
+            return list(self.groups[group].Channels)
+        if isinstance(group, str):
+            return [x for g in self._groupNames.get(group, []) for x in g.Channels]
+        return list(group.Channels)
+
+    def groupOf(self, channel):
+        """The group of a channel, None if it is not part of a group."""
+        return self._groupOf.get(id(channel))
+
+    @property
+    def units(self) -> List[str]:
+        """All units of the channels."""
+        return list(self._units)
+
+    @property
+    def names(self) -> List[str]:
+        """All (distinct) names of the channels."""
+        return list(self._names)
+
+    def find(self, patterns: Union[str, Iterable[str]], field: str = 'Name', regex: bool = False) -> List:
+        """Finds channels by pattern.
+
+        Args:
+            patterns (str | list[str]): Glob patterns (e.g. 'TE0*') or regular
+                expressions (re.search), a channel matches if any of them matches.
+            field (str): The attribute that is matched, e.g. 'Name', 'fullName',
+                'unit' or 'comment'.
+            regex (bool): Use regular expressions instead of glob patterns.
+
+        Returns:
+            list[Channel]: The matching channels in the order of the file.
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if regex:
+            compiled = [re.compile(x) for x in patterns]
+        else:
+            compiled = [re.compile(fnmatch.translate(x)) for x in patterns]
+
+        # patterns are matched against the distinct values of the field only
+        if field == 'Name':
+            index = self._names
+        elif field == 'unit':
+            index = self._units
+        else:
+            index = {}
+            for channel in self.channels:
+                index.setdefault(getattr(channel, field), []).append(channel)
+
+        match = (lambda p, v: p.search(v)) if regex else (lambda p, v: p.match(v))
+        found = [channel for value, channels in index.items()\
+            if any(match(p, value) is not None for p in compiled) for channel in channels]
+        return sorted(found, key=lambda x: self._order[id(x)])
+
+    def query(self, name: str = None, unit: str = None, group=None, regex: bool = False) -> List:
+        """Finds channels matching all given criteria.
+
+        Args:
+            name (str): Pattern of the name (see find).
+            unit (str): Exact unit.
+            group (Group | int | str): Group of the channels (see byGroup).
+            regex (bool): name is a regular expression instead of a glob pattern.
+
+        Returns:
+            list[Channel]: The matching channels in the order of the file.
+        """
+        found = self.channels if name is None else self.find(name, regex=regex)
+        if unit is not None:
+            found = [x for x in found if x.unit == unit]
+        if group is not None:
+            members = {id(x) for x in self.byGroup(group)}
+            found = [x for x in found if id(x) in members]
+        return list(found)
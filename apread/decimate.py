@@ -0,0 +1,153 @@
+# downsampling of large channels for plotting
+from typing import Tuple
+
+import numpy as np
+import numpy.typing as nptyp
+
+
+def minmax(x: nptyp.NDArray, y: nptyp.NDArray, buckets: int) -> Tuple[nptyp.NDArray, nptyp.NDArray]:
+    """Reduces the data to the minimum and maximum of every bucket.
+
+    The data is split into buckets of equal size, for every bucket the minimum
+    and the maximum are kept in the order they appear. The first and the last
+    sample are always kept, so the x-range is the same. Plotted with one bucket
+    per pixel, the result looks exactly like the full data.
+
+    Args:
+        x (NDArray): x values (e.g. time).
+        y (NDArray): y values.
+        buckets (int): Amount of buckets, the result has at most 2*buckets+4 points
+            (the first and last sample and a shorter last bucket are added).
+
+    Returns:
+        Tuple[NDArray, NDArray]: The reduced x and y values.
+    """
+    n = len(y)
+    buckets = max(int(buckets), 1)
+    if n <= 2 * buckets:
+        return x, y
+
+    size = n // buckets
+    m = size * buckets
+    # reshaping a contiguous slice does not copy the data
+    blocks = y[:m].reshape(buckets, size)
+    imin = blocks.argmin(axis=1)
+    imax = blocks.argmax(axis=1)
+    start = np.arange(0, m, size)
+    idx = np.stack([np.minimum(imin, imax), np.maximum(imin, imax)], axis=1) + start[:, None]
+    idx = idx.ravel()
+
+    # the remaining samples form an additional (smaller) bucket
+    if m < n:
+        rest = y[m:]
+        a, b = m + rest.argmin(), m + rest.argmax()
+        idx = np.concatenate([idx, [min(a, b), max(a, b)]])
+
+    # the indices are sorted already, np.unique also drops duplicates (e.g. constant buckets)
+    idx = np.unique(np.concatenate([[0], idx, [n - 1]]))
+    return x[idx], y[idx]
+
+def lttb(x: nptyp.NDArray, y: nptyp.NDArray, n_out: int) -> Tuple[nptyp.NDArray, nptyp.NDArray]:
+    """Reduces the data with the Largest-Triangle-Three-Buckets algorithm.
+
+    Keeps the visual shape of the data with n_out points (Steinarsson, 2013).
+    Every bucket is handled vectorized, the loop only runs over the buckets.
+
+    Args:
+        x (NDArray): x values (e.g. time), sorted.
+        y (NDArray): y values.
+        n_out (int): Amount of points in the result.
+
+    Returns:
+        Tuple[NDArray, NDArray]: The reduced x and y values.
+    """
+    n = len(y)
+    n_out = int(n_out)
+    if n_out >= n or n_out < 3:
+        return x, y
+
+    # bucket edges of the n_out-2 buckets between the first and the last point
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    idx = np.empty(n_out, np.int64)
+    idx[0] = 0
+    idx[-1] = n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # average of the next bucket (the last point for the last bucket)
+        nlo = edges[i + 1]
+        nhi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = np.mean(x[nlo:nhi], dtype=np.float64)
+        avg_y = np.mean(y[nlo:nhi], dtype=np.float64)
+
+        xa, ya = float(x[a]), float(y[a])
+        bx = x[lo:hi].astype(np.float64, copy=False)
+        by = y[lo:hi].astype(np.float64, copy=False)
+        area = np.abs((xa - avg_x) * (by - ya) - (xa - bx) * (avg_y - ya))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+
+    return x[idx], y[idx]
+
+def decimate(x: nptyp.NDArray, y: nptyp.NDArray, width: int, method: str = 'minmax') \
+        -> Tuple[nptyp.NDArray, nptyp.NDArray]:
+    """Reduces the data for a plot that is width pixels wide.
+
+    Args:
+        x (NDArray): x values (e.g. time), sorted.
+        y (NDArray): y values.
+        width (int): Width of the plot in pixels.
+        method (str): 'minmax' (min/max envelope per pixel) or 'lttb'.
+            None returns the data as it is.
+
+    Returns:
+        Tuple[NDArray, NDArray]: The reduced x and y values.
+    """
+    if method is None:
+        return x, y
+    if method == 'minmax':
+        return minmax(x, y, width)
+    if method == 'lttb':
+        return lttb(x, y, 2 * width)
+    raise ValueError(f'Unknown decimation method "{method}", use "minmax" or "lttb".')
+
+def pixel_width(ax) -> int:
+    """Width of a matplotlib axes in pixels."""
+    return max(int(ax.get_window_extent().width), 1)
+
+def plot_decimated(ax, x: nptyp.NDArray, y: nptyp.NDArray, *args, method: str = 'minmax', **kwargs):
+    """Plots the decimated data on a matplotlib axes.
+
+    The data is reduced to the width of the axes in pixels. When the x-limits
+    change (zooming, panning), only the visible part of the data is decimated
+    again, so details appear when zooming in.
+
+    Args:
+        ax (Axes): The axes to plot on.
+        x (NDArray): x values (e.g. time), sorted.
+        y (NDArray): y values.
+        *args: Passed to ax.plot (e.g. a format string).
+        method (str): See decimate. None plots the full data.
+        **kwargs: Passed to ax.plot.
+
+    Returns:
+        list[Line2D]: The plotted lines, like ax.plot.
+    """
+    if method is None:
+        return ax.plot(x, y, *args, **kwargs)
+
+    xd, yd = decimate(x, y, pixel_width(ax), method)
+    lines = ax.plot(xd, yd, *args, **kwargs)
+    line = lines[0]
+
+    def update(ax):
+        lo, hi = ax.get_xlim()
+        # keep one point outside the view on each side, so lines leave the plot correctly
+        start = max(int(np.searchsorted(x, lo, 'left')) - 1, 0)
+        stop = min(int(np.searchsorted(x, hi, 'right')) + 1, len(x))
+        xd, yd = decimate(x[start:stop], y[start:stop], pixel_width(ax), method)
+        line.set_data(xd, yd)
+
+    ax.callbacks.connect('xlim_changed', update)
+    return lines
@@ -1,42 +1,54 @@
 # binary reader import
-# parallel processing
-import multiprocessing as mp
+from __future__ import annotations
+
+import copy
 import os
+import struct
 from datetime import datetime
-from multiprocessing.pool import Pool as mpPool
 
 # typing
-from typing import List
-
-# plotting
-import matplotlib.pyplot as plt
+from typing import BinaryIO, Dict, Iterator, List, Tuple
 
 # progress
 import numpy as np
 
-from apread.binaryReader import BinaryReader
+# asyncio api
+from apread.aio import Executor, load_channels, run_blocking
+from apread.binaryReader import BinaryReader, decode_string
+# export to other file formats
+from apread.export import CHUNK_SAMPLES, export_group
+# conversion to DataFrames
+from apread.frames import group_to_pandas, group_to_polars
+# parallel processing
+from apread.parallel import ARRAY_CHUNK_SIZE, CHUNK_SIZE, read_channels, scale
+# statistics of the data
+from apread.stats import ChannelStats, channel_stats, stats_of
+
+# fixed blocks of the channel header (without endian prefix, see BinaryReader.layout)
+# format, dw, time, nHdrBytes
+CHANNEL_INFO_FORMAT = 'hhdi'
+# lmode, scale, npoi
+CHANNEL_LIN_FORMAT = 'ccb'
+# the extended channel header (148 bytes), see Channel.readExtHeader
+EXT_HEADER_FORMAT = 'dd4h3f4f32s8s8s4h2f3h2bfb3x2fb7x'
 
 
-def read_chunk_from_file(file_path, start, end, typ, buf_loc) -> np.ndarray:
-    """Reads a chunk of a file by opening a binary reader.
+def resolve_dtype(dtype) -> np.dtype:
+    """Checks a dtype policy of the channel data.
 
     Args:
-        file_path (str): Filepath to the file.
-        start (int): Start buffer location in entries.
-        end (int): End buffer location in entries.
-        typ (nd.dtype): The type of data.
-        cur_loc (int): Current buffer location in bytes.
+        dtype (str | np.dtype): 'native' (or None) keeps the type of the file,
+            otherwise a floating point type like np.float32 or np.float64.
 
     Returns:
-        np.ndarray: The chunk of the file as a numbered array.
+        np.dtype: The type of the data, None for 'native'.
     """
-    # open the file and seek the buffer to the start of channel entries
-    with open(file_path, 'rb') as f:
-        f.seek(buf_loc)
-        # read the chunk of data from the file
-        chunk = np.fromfile(f, dtype=typ, offset=start * typ.itemsize, count=end-start)
-        
-    return chunk    
+    if dtype is None or (isinstance(dtype, str) and dtype == 'native'):
+        return None
+    dtype = np.dtype(dtype)
+    if dtype.kind != 'f':
+        raise ValueError(f'The channel data has to be of a floating point type, got "{dtype}".')
+    return dtype
 
 def toTimestamp(serialFormat):
     return (serialFormat - 25569) * 86400.0
@@ -44,11 +56,6 @@ def toTimestamp(serialFormat):
 def toDatetime(timestamp):
     return datetime.utcfromtimestamp(timestamp)
 
-def get_clr(n, name='hsv'):
-    '''Returns a function that maps each index in 0, 1, ..., n-1 to a distinct 
-    RGB color; the keyword argument name must be a standard mpl colormap name.'''
-    return plt.cm.get_cmap(name, n)
-
 class Channel:
     """
     Holds data of a Catman Channel.
@@ -68,23 +75,24 @@ class Channel:
     
     # Specifies if channel entries should be loaded in parallel.
     parallelLoad: bool
-    # Amount of parallel processes that can be used to load data.
-    parallelProcs: int
-    # The parallel pool which holds parallel processes.
-    parallelPool: mpPool
+    # Amount of threads that can be used to load data.
+    workers: int
     
     def __init__(self, reader: BinaryReader, fileName='unknown', filepath='', \
-        verbose=False, parallelPool=None):
+        verbose=False, workers=None, keepRaw=False, dtype=None):
         """
         Creates the Channel.
 
         Uses a reader (BinaryReader) to read the data from the file accessed by "APReader.__init__".
+
+        If keepRaw is True, 2-byte channels keep their samples as unsigned integers
+        (Channel.raw) and are only scaled when the data is accessed. dtype sets
+        the type of the data (see resolve_dtype).
         """
         
         # parallel stuff
-        self.parallelLoad = parallelPool is not None
-        self.parallelPool = parallelPool
-        self.parallelProcs = len(mp.active_children())
+        self.parallelLoad = workers is not None and workers > 1
+        self.workers = workers
         
         # defines, if the apreader should output verbose debug messages
         self.verbose = verbose
@@ -93,15 +101,20 @@ class Channel:
         self.Time: Channel = None
         "Time channel."
         self.isTime = False
+        # True, if this channel is not part of the file (see "synthesizeTime")
+        self.isSynthetic = False
         # save the reader for later use
         self.reader = reader
 
+        # the strings as they are stored in the file, see "readString"
+        self.rawStrings = {}
+
         # get index of channel
         self.num = reader.read_int16()
         # get length of channel
         self.length = reader.read_int32()
         # get name of channel
-        self.Name = reader.read_string(reader.read_int16())
+        self.Name = self.readString(reader, 'Name', reader.read_int16())
 
         # the original file name of the group
         self.fileName = os.path.splitext(os.path.basename(fileName))[0]
@@ -110,20 +123,19 @@ class Channel:
         self.filePath = filepath
         # retrieve unit of channel                
         
-        self.unit = reader.read_string(reader.read_int16())
+        self.unit = self.readString(reader, 'unit', reader.read_int16())
         
         # get comment of channel                
-        self.comment = reader.read_string(reader.read_int16())
+        self.comment = self.readString(reader, 'comment', reader.read_int16())
 
         # 0: numeric, 1: string, 2: binary object
-        self.format  = reader.read_int16()
-        # get format of channel (8: numeric, >8: string)
-        self.dw = reader.read_int16()
-        # time of reading
-        self.time = reader.read_double()
+        # dw: get format of channel (8: numeric, >8: string)
+        # time: time of reading
+        # nHdrBytes: length of the extended channel header
+        self.format, self.dw, self.time, self.nHdrBytes = \
+            reader.read_struct(reader.layout(CHANNEL_INFO_FORMAT))
         self.date = toDatetime(self.time)
         # extended channel header
-        self.nHdrBytes = reader.read_int32()
         self.extHeader = self.readExtHeader(reader)
         
         precDict = {0:8, 1:4, 2:2} # key: Attribute "Exportformat", value: precision in bytes
@@ -133,26 +145,243 @@ class Channel:
             print('Unexpected value of attribute "ExportFormat" in the extended header of channel {}. Assuming double precision.'.format(self.Name))
             self.precision = 8
 
-        # linearization mode
-        self.lmode = reader.read_char()
-        # user scale
-        self.scale = reader.read_char()
-        # unknown points
-        self.npoi = reader.read_byte()
-        # readaway
-        for i in range(self.npoi):
-            reader.read_double()
+        # linearization mode, user scale and unknown points
+        lmode, scale, self.npoi = reader.read_struct(reader.layout(CHANNEL_LIN_FORMAT))
+        self.lmode = lmode.decode('ascii')
+        self.scale = scale.decode('ascii')
+        # points of the linearization (unused)
+        self.linPoints = list(reader.read_struct(reader.layout(f'{self.npoi}d'))) if self.npoi > 0 else []
 
         # thermo type
-        reader.read_int16()
+        self.thermoType = reader.read_int16()
 
         # readaway
-        self.formula = reader.read_string(reader.read_int16())
-        self.sensorInfo = reader.read_string(reader.read_int32())
+        self.formula = self.readString(reader, 'formula', reader.read_int16())
+        self.sensorInfo = self.readString(reader, 'sensorInfo', reader.read_int32())
 
         # flag to indicate that everything is fine
         self.broken = False
 
+        # byte offset of this channel's block in the data section, this is set
+        # by "APReader.read" once all headers are known
+        self.dataOffset: int = None
+        # channel data, loaded by "readData" or on first access of "data"
+        self._data: np.ndarray = None
+        # keep 2-byte channels unscaled (see "raw")
+        self.keepRaw = keepRaw
+        # unscaled samples of a 2-byte channel (only if keepRaw is set)
+        self.raw: np.ndarray = None
+        # type of the data, None keeps the type of the file (see "dataType")
+        self.outType: np.dtype = resolve_dtype(dtype)
+        # timings and I/O of the reader (see apread.metrics.Metrics), None if disabled
+        self.metrics = None
+        # read-only memory map of the file, if the reader was opened with mmap=True
+        self.dataMap = None
+        # index of the first sample in the file, if this channel is a slice
+        self.sliceStart = 0
+        # scale factor and offset of 2-byte channels, see "readScaling"
+        self._scaling: Tuple[float, float] = None
+        # minimum and maximum value of 2-byte channels, see "readLimits"
+        self._limits: Tuple[float, float] = None
+        # statistics of the data, computed once by "stats"
+        self._stats: ChannelStats = None
+
+    def readString(self, reader: BinaryReader, key: str, size: int) -> str:
+        """Reads a string of the channel header.
+
+        Decoding the string is not always reversible, so its bytes are kept in
+        rawStrings[key] (see APWriter).
+        """
+        raw = reader.read(size) if size > 0 else b''
+        self.rawStrings[key] = raw
+        return decode_string(raw) if size > 0 else ''
+
+    @property
+    def dataSize(self) -> int:
+        """Size of this channel's block in the data section in bytes.
+
+        2-byte channels are preceded by their minimum and maximum value (two doubles).
+        """
+        size = self.length * self.precision
+        if self.precision == 2:
+            size += 16
+        return size
+
+    @property
+    def rawType(self) -> np.dtype:
+        """Type of the samples as they are stored in the file."""
+        if self.precision == 2:
+            return np.dtype('u2')
+        return np.dtype('f{}'.format(self.precision))
+
+    @property
+    def dataType(self) -> np.dtype:
+        """Type of the data of this channel.
+
+        By default the type of the file, 2-byte channels are scaled to doubles.
+        The dtype of the reader overrides it for all channels.
+        """
+        if self.outType is not None:
+            return self.outType
+        if self.precision == 2:
+            return np.dtype('f8')
+        return self.rawType
+
+    @property
+    def data(self) -> np.ndarray:
+        """The data of this channel.
+
+        If the channel has not been read yet (i.e. the reader was opened with
+        lazy=True), the data is loaded from the file on first access.
+
+        2-byte channels that keep their raw samples (keepRaw) are scaled on every
+        access, the result is not stored. Use Channel.scaled to scale into an
+        existing buffer or with a different precision.
+        """
+        if not self.isLoaded and not self.broken:
+            self.load()
+        if self._data is None and self.raw is not None:
+            return self.scaled()
+        return self._data
+
+    @data.setter
+    def data(self, value: np.ndarray):
+        self._data = value
+        self._stats = None
+
+    @property
+    def isLoaded(self) -> bool:
+        """True, if the data of this channel has been read already."""
+        return self._data is not None or self.raw is not None
+
+    def assignRaw(self, raw: np.ndarray, MinValue: float, MaxValue: float):
+        """Sets the data of a 2-byte channel from its unscaled samples.
+
+        Args:
+            raw (np.ndarray): The samples as unsigned 16-bit integers.
+            MinValue (float): Minimum value, stored in front of the samples.
+            MaxValue (float): Maximum value, stored in front of the samples.
+        """
+        sf = (MaxValue - MinValue)/32767 # scale factor
+        self._scaling = (sf, MinValue)
+        self._limits = (MinValue, MaxValue)
+        if self.keepRaw:
+            self.raw = raw
+        else:
+            self.data = scale(raw, self._scaling, np.empty(len(raw), self.dataType))
+
+    def scaled(self, out: np.ndarray = None, dtype=None, start: int = 0, stop: int = None) -> np.ndarray:
+        """Scales the raw samples of a 2-byte channel (see keepRaw).
+
+        Args:
+            out (np.ndarray): Buffer to write the result into, its length has to
+                match the range. Its type is used instead of dtype.
+            dtype (np.dtype): Type of the result, e.g. np.float32 to save memory.
+                Defaults to Channel.dataType.
+            start (int): Index of the first sample.
+            stop (int): Index after the last sample, defaults to the end.
+
+        Returns:
+            np.ndarray: The scaled samples (out, if given).
+        """
+        if dtype is None:
+            dtype = self.dataType
+        if self.raw is None:
+            # nothing to scale, the data is stored scaled already
+            data = self.data[start:stop]
+            if out is None:
+                return data.astype(dtype, copy=False)
+            out[...] = data
+            return out
+
+        raw = self.raw[start:stop]
+        if out is None:
+            out = np.empty(len(raw), dtype)
+        return scale(raw, self._scaling, out)
+
+    def _reduce(self, name: str) -> float:
+        """Computes min or max, for raw channels on the integer samples."""
+        if self.raw is None:
+            return float(getattr(self.data, name)())
+        sf, MinValue = self._scaling
+        # a negative scale factor swaps minimum and maximum
+        if sf < 0:
+            name = 'max' if name == 'min' else 'min'
+        return float(getattr(self.raw, name)()) * sf + MinValue
+
+    def min(self) -> float:
+        """Minimum of the data (computed on the raw samples for raw channels)."""
+        return self._reduce('min')
+
+    def max(self) -> float:
+        """Maximum of the data (computed on the raw samples for raw channels)."""
+        return self._reduce('max')
+
+    def mean(self) -> float:
+        """Mean of the data (computed on the raw samples for raw channels)."""
+        if self.raw is None:
+            return float(self.data.mean(dtype=np.float64))
+        sf, MinValue = self._scaling
+        # the sum of the integers is exact
+        return int(self.raw.sum(dtype=np.int64)) / len(self.raw) * sf + MinValue
+
+    def stats(self, samples_per_chunk: int = CHUNK_SAMPLES) -> ChannelStats:
+        """Minimum, maximum, mean, standard deviation, RMS and NaN count of the data.
+
+        The data is read in chunks, the channel is not loaded for this. 2-byte
+        channels that are not loaded (or keep their raw samples) are evaluated on
+        the unscaled integers. The result is kept, so the file is only read once.
+
+        Args:
+            samples_per_chunk (int): Amount of samples read at once.
+
+        Returns:
+            ChannelStats: The statistics (see apread.stats.ChannelStats).
+        """
+        if self._stats is None:
+            self._stats = channel_stats(self, samples_per_chunk)
+        return self._stats
+
+    def load(self):
+        """
+        Loads the data of this channel from its file.
+
+        Opens a new stream on the file and seeks to the offset of this channel,
+        so the file does not need to be open anymore.
+        """
+        if self.dataOffset is None:
+            raise ValueError(f'Data offset of channel "{self.Name}" is unknown. '
+                             'The channel has to be created by an APReader.')
+
+        if self.verbose:
+            print(f'\t[ {self.fileName} ] Loading channel {self.Name}...')
+
+        if self.metrics is not None:
+            self.metrics.load(self, self._load)
+        else:
+            self._load()
+
+    async def aload(self, executor: Executor = None) -> np.ndarray:
+        """Loads the data of this channel without blocking the event loop (see apread.aio).
+
+        The file is read in the executor, defaults to apread.aio.get_executor().
+
+        Returns:
+            np.ndarray: The data of this channel (see Channel.data).
+        """
+        return await run_blocking(getattr, self, 'data', executor=executor)
+
+    def _load(self):
+        """Maps or reads the data (see Channel.load)."""
+        if self.dataMap is not None:
+            self.mapData()
+            return
+
+        with open(self.filePath, 'rb') as f:
+            reader = BinaryReader(f)
+            reader.seek(self.dataOffset)
+            self.readData(reader)
+
     def readExtHeader(self, rdr: BinaryReader):
         """
         Reads the extended header of this Channel.
@@ -171,44 +400,49 @@ class Channel:
         """
         pos0 = rdr.tell() # In general not a multiple of eight, which is unexpected!
 
+        # all fields are decoded at once, the byte offsets (pos0+) are noted behind the fields
+        layout = rdr.layout(EXT_HEADER_FORMAT)
+        # the bytes are kept, the padding is not always empty (see APWriter)
+        self.extHeaderBytes = rdr.read(layout.size)
+        values = layout.unpack(self.extHeaderBytes)
+
         exthdr = {}
-        exthdr['T0'] = rdr.read_double() # (pos0+) 8
-        exthdr['dt'] = rdr.read_double() # 16
-        exthdr['SensorType'] = rdr.read_int16() # 18
-        exthdr['SupplyVoltage'] = rdr.read_int16() # 20
+        exthdr['T0'] = values[0] # 8
+        exthdr['dt'] = values[1] # 16
+        exthdr['SensorType'] = values[2] # 18
+        exthdr['SupplyVoltage'] = values[3] # 20
         
-        exthdr['FiltChar'] = rdr.read_int16() # 22
-        exthdr['FiltFreq'] = rdr.read_int16() # 24
-        exthdr['TareVal'] = rdr.read_float() # 28
-        exthdr['ZeroVal'] = rdr.read_float() # 32   
-        exthdr['MeasRange'] = rdr.read_float() # 36
-        exthdr['InChar'] = [rdr.read_float() for i in range(4)] # 40, 44, 48, 52
+        exthdr['FiltChar'] = values[4] # 22
+        exthdr['FiltFreq'] = values[5] # 24
+        exthdr['TareVal'] = values[6] # 28
+        exthdr['ZeroVal'] = values[7] # 32   
+        exthdr['MeasRange'] = values[8] # 36
+        exthdr['InChar'] = list(values[9:13]) # 40, 44, 48, 52
         
-        exthdr['SerNo'] = rdr.read_string(32) # 84
-        exthdr['PhysUnit'] = rdr.read_string(8) # 92
-        exthdr['NativeUnit'] = rdr.read_string(8) # 100
+        exthdr['SerNo'] = decode_string(values[13]) # 84
+        exthdr['PhysUnit'] = decode_string(values[14]) # 92
+        exthdr['NativeUnit'] = decode_string(values[15]) # 100
         
-        exthdr['Slot'] = rdr.read_int16() # 102
-        exthdr['SubSlot'] = rdr.read_int16() # 104
-        exthdr['AmpType'] = rdr.read_int16() # 106
-        exthdr['APType'] = rdr.read_int16() # 108
-        exthdr['kFactor'] = rdr.read_float() # 112
-        exthdr['bFactor'] = rdr.read_float() # 116
+        exthdr['Slot'] = values[16] # 102
+        exthdr['SubSlot'] = values[17] # 104
+        exthdr['AmpType'] = values[18] # 106
+        exthdr['APType'] = values[19] # 108
+        exthdr['kFactor'] = values[20] # 112
+        exthdr['bFactor'] = values[21] # 116
         
-        exthdr['MeasSig'] = rdr.read_int16() # 118
-        exthdr['AmpInput'] = rdr.read_int16() # 120
-        exthdr['HPFilt'] = rdr.read_int16() # 122
-        exthdr['OLImportInfo'] = rdr.read_byte() # 123
-        exthdr['ScaleType'] = rdr.read_byte() # 124
-        exthdr['SoftwareTareVal'] = rdr.read_float() # 128        
-        exthdr['WriteProtected'] = rdr.read_byte() # 129
-        rdr.read_string(3) # 132
+        exthdr['MeasSig'] = values[22] # 118
+        exthdr['AmpInput'] = values[23] # 120
+        exthdr['HPFilt'] = values[24] # 122
+        exthdr['OLImportInfo'] = values[25] # 123
+        exthdr['ScaleType'] = values[26] # 124
+        exthdr['SoftwareTareVal'] = values[27] # 128        
+        exthdr['WriteProtected'] = values[28] # 129
+        # 3 bytes padding # 132
         
-        exthdr['NominalRange'] = rdr.read_float() # 136 
-        exthdr['CLCFactor'] = rdr.read_float() # 140
-        exthdr['ExportFormat'] = rdr.read_byte() # 141
-        rdr.read_string(7) # 148
-        # reserve = rdr.read_string(10)        
+        exthdr['NominalRange'] = values[29] # 136 
+        exthdr['CLCFactor'] = values[30] # 140
+        exthdr['ExportFormat'] = values[31] # 141
+        # 7 bytes reserved # 148
         posN = rdr.tell()
         
         if (posN-pos0) != self.nHdrBytes:
@@ -222,39 +456,367 @@ class Channel:
                   Leaving the extended header as-is and resetting the read position of
                   the binary reader. Assuming double precision for the data.
                   """.format(self.Name))
-            rdr.seek(pos0 + self.nHdrBytes)
+            rdr.seek(pos0)
+            self.extHeaderBytes = rdr.read(self.nHdrBytes)
             exthdr['ExportFormat'] = 0
         
         return exthdr
 
-    def readData(self):
+    def readData(self, reader: BinaryReader = None):
         """
         Reads the data of this Channel.
 
         IMPORTANT
             The stream offset has to be set before calling this function!
+
+        Args:
+            reader (BinaryReader): The reader to read from. Defaults to the reader
+                this channel has been created with.
         """
         # if something was wrong previously, nothing will happen here
         if self.broken:
             return
+
+        if self.dataMap is not None:
+            self.mapData()
+            return
+
+        if reader is None:
+            reader = self.reader
                         
+        # parallel loading will split up the channel into chunks
+        if self.parallelLoad:
+            self.read_data_parallel(reader)
+            return
+
         # The data is stored channelwise. We therefore only need to pass pointers to the first and last byte.
         if self.precision == 8 or self.precision == 4:
-            datatype = np.dtype('f{}'.format(self.precision))                
-            # parallel loading will split up the incoming bin array
-            if self.parallelLoad:
-                self.data = self.read_data_parallel(datatype)
-                
-            # default loading will load all entries at once
-            else:
-                self.data = np.fromfile(self.reader.buf, dtype=datatype, count=self.length)
+            self.data = self.fromfile(reader.buf, self.length)
                 
         elif self.precision == 2:
-            MinValue = self.reader.read_double()
-            MaxValue = self.reader.read_double()
-            sf = (MaxValue - MinValue)/32767 # scale factor
-            self.data = np.fromfile(self.reader.buf, dtype=np.dtype('u2'), count=self.length)*sf + MinValue
+            MinValue = reader.read_double()
+            MaxValue = reader.read_double()
+            self.assignRaw(np.fromfile(reader.buf, dtype=np.dtype('u2'), count=self.length),\
+                MinValue, MaxValue)
     
+    def fromfile(self, f: BinaryIO, count: int) -> np.ndarray:
+        """Reads count samples of a 4- or 8-byte channel as Channel.dataType.
+
+        If the type differs from the file, the samples are read in chunks and
+        converted into the result, so the channel is never held twice in memory.
+        """
+        rawType = self.rawType
+        if self.dataType == rawType:
+            return np.fromfile(f, dtype=rawType, count=count)
+
+        out = np.empty(count, self.dataType)
+        step = max(CHUNK_SIZE // rawType.itemsize, 1)
+        pos = 0
+        while pos < count:
+            chunk = np.fromfile(f, dtype=rawType, count=min(step, count - pos))
+            if len(chunk) == 0:
+                break
+            out[pos:pos + len(chunk)] = chunk
+            pos += len(chunk)
+        return out[:pos]
+
+    def __getstate__(self):
+        """Channels are pickled without the file handles (e.g. to send them between processes)."""
+        state = self.__dict__.copy()
+        state['reader'] = None
+        # the metrics belong to the reader, which passes them again (see APReader.__setstate__)
+        state['metrics'] = None
+        # views into the memory map are not copied, they are mapped again when accessed
+        if self.dataMap is not None:
+            state['raw'] = None
+            if self.precision != 2:
+                state['_data'] = None
+        state['dataMap'] = None
+        return state
+
+    def mapData(self):
+        """
+        Creates the data of this Channel as a view into the memory map of the file.
+
+        4- and 8-byte channels are not copied, their data is a read-only view
+        and only the pages that are accessed are read from disk (unless the dtype
+        of the reader differs from the file). 2-byte channels have to be scaled,
+        which creates a new array (unless they keep their raw samples, see keepRaw).
+        """
+        if self.precision == 8 or self.precision == 4:
+            data = np.frombuffer(self.dataMap, dtype=self.rawType, count=self.length,\
+                offset=self.dataOffset)
+            self.data = data.astype(self.dataType, copy=False)
+        elif self.precision == 2:
+            MinValue, MaxValue = struct.unpack_from('dd', self.dataMap, self.dataOffset)
+            self.assignRaw(np.frombuffer(self.dataMap, dtype=np.dtype('u2'), count=self.length,\
+                offset=self.dataOffset + 16), MinValue, MaxValue)
+
+    def readLimits(self, f: BinaryIO = None) -> Tuple[float, float]:
+        """Reads the minimum and maximum value of a 2-byte channel.
+
+        The values are stored in front of the channel data and are only read once.
+
+        Args:
+            f (BinaryIO): An open stream on the file, moved by this call.
+
+        Returns:
+            Tuple[float, float]: Minimum and maximum value.
+        """
+        if self._limits is None:
+            if self.dataOffset is None:
+                raise ValueError(f'Data offset of channel "{self.Name}" is unknown. '
+                                 'The channel has to be created by an APReader.')
+            if self.dataMap is not None:
+                self._limits = struct.unpack_from('dd', self.dataMap, self.dataOffset)
+            elif f is None:
+                with open(self.filePath, 'rb') as f:
+                    return self.readLimits(f)
+            else:
+                f.seek(self.dataOffset)
+                self._limits = struct.unpack('dd', f.read(16))
+        return self._limits
+
+    def readScaling(self, f: BinaryIO = None) -> Tuple[float, float]:
+        """Reads the scale factor and offset of a 2-byte channel (see readLimits).
+
+        Args:
+            f (BinaryIO): An open stream on the file, moved by this call.
+
+        Returns:
+            Tuple[float, float]: Scale factor and offset (the minimum value).
+        """
+        if self._scaling is None:
+            MinValue, MaxValue = self.readLimits(f)
+            self._scaling = ((MaxValue - MinValue)/32767, MinValue)
+        return self._scaling
+
+    def readRange(self, start: int, stop: int, f: BinaryIO = None, raw: bool = False) -> np.ndarray:
+        """Reads the samples [start, stop) of this channel.
+
+        Only the requested range is read from the file. If the data is already
+        loaded, a view of the data is returned instead.
+
+        Args:
+            start (int): Index of the first sample.
+            stop (int): Index after the last sample, clipped to the length of the channel.
+            f (BinaryIO): An open stream on the file. If None, the file is opened for this call.
+            raw (bool): Return the samples as they are stored in the file: 2-byte
+                samples unscaled (as unsigned integers, see Channel.readScaling),
+                4- and 8-byte samples without the dtype of the reader.
+
+        Returns:
+            np.ndarray: The samples, 2-byte channels are scaled unless raw is set.
+        """
+        start = max(start, 0)
+        stop = max(min(stop, self.length), start)
+
+        if self.raw is not None:
+            return self.raw[start:stop] if raw else self.scaled(start=start, stop=stop)
+        if self._data is not None and (not raw or self._data.dtype == self.rawType):
+            return self._data[start:stop]
+
+        if self.dataOffset is None:
+            raise ValueError(f'Data offset of channel "{self.Name}" is unknown. '
+                             'The channel has to be created by an APReader.')
+
+        rawType = self.rawType
+        offset = self.dataOffset + (16 if self.precision == 2 else 0) + start * rawType.itemsize
+
+        if self.dataMap is not None:
+            data = np.frombuffer(self.dataMap, dtype=rawType, count=stop-start, offset=offset)
+        elif f is None:
+            with open(self.filePath, 'rb') as f:
+                return self.readRange(start, stop, f, raw)
+        else:
+            if self.precision == 2:
+                self.readScaling(f)
+            f.seek(offset)
+            # readinto has less overhead than np.fromfile, which matters for many small ranges
+            data = np.empty(stop-start, dtype=rawType)
+            data = data[:f.readinto(data) // rawType.itemsize]
+            if self.metrics is not None:
+                self.metrics.read(data.nbytes)
+
+        if raw:
+            return data
+        if self.precision == 2:
+            return scale(data, self.readScaling(f), np.empty(len(data), self.dataType))
+        return data.astype(self.dataType, copy=False)
+
+    def iter_chunks(self, samples_per_chunk: int, raw: bool = False) -> Iterator[np.ndarray]:
+        """Iterates over the data of this channel in chunks.
+
+        The chunks are read from the file one after another, so the whole channel
+        is never held in memory. 2-byte channels are scaled per chunk.
+
+        Args:
+            samples_per_chunk (int): Amount of samples per chunk (the last one may be shorter).
+            raw (bool): Yield the samples as they are stored in the file, see Channel.readRange.
+
+        Yields:
+            np.ndarray: The next chunk of data.
+        """
+        if samples_per_chunk < 1:
+            raise ValueError('samples_per_chunk has to be at least 1.')
+
+        if self.isLoaded or self.dataMap is not None:
+            for start in range(0, self.length, samples_per_chunk):
+                yield self.readRange(start, start + samples_per_chunk, raw=raw)
+            return
+
+        with open(self.filePath, 'rb') as f:
+            for start in range(0, self.length, samples_per_chunk):
+                yield self.readRange(start, start + samples_per_chunk, f, raw)
+
+    def searchTime(self, t: float, side: str = 'left', f: BinaryIO = None) -> int:
+        """Finds the index of a point in time in this (time) channel.
+
+        Works like np.searchsorted. If the data is not loaded, the sample interval
+        of the extended header ('dt') gives a first guess, which is checked against
+        the file. Otherwise the channel is searched with a binary search that reads
+        single samples, so only a few samples are read from the file.
+
+        Args:
+            t (float): The point in time.
+            side (str): 'left' returns the first index with data >= t,
+                'right' the first index with data > t.
+            f (BinaryIO): An open stream on the file.
+
+        Returns:
+            int: Index, at which t would be inserted to keep the data sorted.
+        """
+        # times are always compared in double precision
+        t = float(t)
+        if self.isLoaded:
+            return int(np.searchsorted(self.data, np.float64(t), side))
+
+        # infinite bounds are outside of every channel (NaN is sorted last, like in numpy)
+        if t == -np.inf:
+            return 0
+        if t == np.inf or np.isnan(t):
+            return self.length
+
+        if f is None and self.dataMap is None:
+            with open(self.filePath, 'rb') as f:
+                return self.searchTime(t, side, f)
+
+        def before(i):
+            # True, if the result is after index i
+            value = float(self.readRange(i, i + 1, f)[0])
+            return value < t if side == 'left' else value <= t
+
+        def valid(lo, hi):
+            return (lo == 0 or before(lo - 1)) and (hi == self.length or not before(hi))
+
+        lo, hi = 0, self.length
+        # the header states the interval in ms
+        dt = self.extHeader['dt'] / 1000
+        if dt > 0 and self.length > 0:
+            guess = int((t - self.readRange(0, 1, f)[0]) / dt)
+            glo = min(max(guess - 2, 0), self.length)
+            ghi = min(max(guess + 3, 0), self.length)
+            if valid(glo, ghi):
+                lo, hi = glo, ghi
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if before(mid):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def synthesizeTime(self) -> Channel:
+        """Creates a time channel for this channel from the extended header.
+
+        The time starts at 0 and increases by the sample interval 'dt' (given in ms).
+
+        Returns:
+            Channel: A new channel (in seconds), which is not part of the file.
+        """
+        chan = copy.copy(self)
+        chan.extHeader = dict(self.extHeader)
+        chan.Name = 'Time (synthesized)'
+        chan.fullName = f"{self.fileName}.{chan.Name.replace(' ', '_')}"
+        chan.unit = 's'
+        chan.comment = f'Synthesized from the sample interval of "{self.Name}"'
+        chan.num = -1
+        chan.precision = 8
+        chan.isSynthetic = True
+        chan.isTime = False
+        chan.Time = None
+        chan.dataOffset = None
+        chan.dataMap = None
+        chan.reader = None
+        chan._scaling = None
+        chan.keepRaw = False
+        chan.raw = None
+        chan.data = (np.arange(self.length) * (self.extHeader['dt'] / 1000)).astype(chan.dataType, copy=False)
+        return chan
+
+    def slice(self, start: int, stop: int, f: BinaryIO = None) -> Channel:
+        """Creates a new channel which contains the samples [start, stop) of this channel.
+
+        Only the requested range is read from the file (see Channel.readRange).
+        The time channel of the result has to be set by the caller, see
+        Channel.sliceTime to slice by time.
+
+        Args:
+            start (int): Index of the first sample.
+            stop (int): Index after the last sample.
+            f (BinaryIO): An open stream on the file.
+
+        Returns:
+            Channel: A copy of this channel with the sliced data.
+        """
+        start = max(start, 0)
+        stop = max(min(stop, self.length), start)
+
+        # the slice keeps the scaling of 2-byte channels (e.g. to write it, see APWriter)
+        if self.precision == 2:
+            self.readScaling(f)
+        chan = copy.copy(self)
+        chan._stats = None
+        if self.keepRaw and self.precision == 2:
+            chan.raw = self.readRange(start, stop, f, raw=True)
+            chan._data = None
+        else:
+            chan.data = self.readRange(start, stop, f)
+        chan.length = stop - start
+        # index of the first sample in the original channel
+        chan.sliceStart = self.sliceStart + start
+        # the slice is not located in the file anymore
+        chan.dataOffset = None
+        chan.dataMap = None
+        chan.reader = None
+        chan.Time = None
+        return chan
+
+    def sliceTime(self, t_start: float, t_end: float) -> Channel:
+        """Creates a new channel which contains the samples between t_start and t_end.
+
+        Args:
+            t_start (float): Start time (inclusive), in the unit of the time channel.
+            t_end (float): End time (inclusive).
+
+        Returns:
+            Channel: A copy of this channel with the sliced data and time.
+        """
+        timeC = self if self.isTime else self.Time
+        if timeC is None:
+            raise ValueError(f'Channel "{self.Name}" does not have a time channel.')
+
+        start = timeC.searchTime(t_start, 'left')
+        stop = timeC.searchTime(t_end, 'right')
+
+        if self.isTime:
+            return self.slice(start, stop)
+
+        chan = self.slice(start, stop)
+        chan.Time = timeC.slice(start, stop)
+        return chan
+
     def __str__(self):
         """
         Default conversion to string.
@@ -264,21 +826,31 @@ class Channel:
     def __getitem__(self, key) -> float:
         """Return the item at index key.
 
+        Raw 2-byte channels (see keepRaw) only scale the requested samples.
+
         Args:
             key (int): index
 
         Returns:
             double: self.data[key]
         """
+        if not self.isLoaded and not self.broken:
+            self.load()
+        if self._data is None and self.raw is not None:
+            raw = self.raw[key]
+            return scale(raw, self._scaling, np.empty(np.shape(raw), self.dataType))[()]
         return self.data[key]
     
-    def plot(self, governed = False, axes=None, clr='b-'):
+    def plot(self, governed = False, axes=None, clr='b-', decimate='minmax'):
         """
         Plot the channel over its connected time-channel.
 
         governed:
             States wether the call to this function will handle figures and handles.
             If False, a single figure will be shown.
+        decimate:
+            Reduce the plotted data to the width of the plot ('minmax' or 'lttb'),
+            it is recomputed when zooming. None plots all data.
         """
         # cant plot time over time
         if self.isTime:
@@ -290,9 +862,9 @@ class Channel:
             print("\t[ APREAD/PLOT ] Channel does not have time data. Not plotting.")
             return        
 
-        plotbase = axes if axes is not None else plt
-        
-        
+        # matplotlib is only imported when plotting
+        from apread.plotting import plot_decimated, plt
+
         if self.verbose:
             print(f'\t[ APREAD/PLOT ] Plotting {self.Name}')
         
@@ -301,7 +873,10 @@ class Channel:
             plt.xlabel('Time [s]')
             plt.ylabel(self.unit)
 
-        line = plotbase.plot(self.Time.data, self.data, color=clr, label=self.Name )
+        plotbase = axes if axes is not None else plt.gca()
+
+        line = plot_decimated(plotbase, self.Time.data, self.data, color=clr, label=self.Name,\
+            method=decimate)
         
         
         if not governed:
@@ -314,39 +889,23 @@ class Channel:
     
     
 
-    def read_data_parallel(self, dtype):
-        """Reads in the underlying binary data using multiple parallel tasks.
+    def read_data_parallel(self, reader: BinaryReader = None):
+        """Reads in the underlying binary data using multiple threads.
 
-        Args:
-            dtype (nd.dtype): The type of the underlying layer data entries (f4, f8, ...).
+        The channel is split into chunks which are read directly into the
+        resulting array (see apread.parallel.read_channels).
 
-        Returns:
-            ndarray: Array of the binary data.
+        Args:
+            reader (BinaryReader): The reader positioned at the channel data. It
+                is moved behind the channel afterwards.
         """
-        # chunk the total length of this channel
-        chunk_size = self.length // self.parallelProcs        
-                
-        # current location of the buffered binary reader
-        cur_loc = self.reader.tell()
-
-        # chunk the length
-        chunks = [(start, min(start + chunk_size, self.length)) for start in range(0, self.length, chunk_size)]
-        results = [self.parallelPool.apply_async(read_chunk_from_file, args=(self.filePath, start, end, dtype, cur_loc)) for (start, end) in chunks]
-
-        # wait for results to finish and check if they finished successfully
-        for r in results:
-            r.wait()
-            if not r.successful():
-                print('Error in loading task!')
-        
-        # concatenate the data structure
-        data = np.empty(self.length, dtype)
-        for result, (start, end) in zip(results, chunks):
-            data[start:end] = result.get()
-        
+        if reader is None:
+            reader = self.reader
+
+        read_channels([self], self.workers)
+
         # push the underlying original reader to after the channel items
-        self.reader.seek(cur_loc + self.length * dtype.itemsize)
-        return data
+        reader.seek(self.dataOffset + self.dataSize)
 
 
 class Group:
@@ -380,17 +939,25 @@ class Group:
     # fully qualifying name
     fullName: str
 
-    def __init__(self, channels: List[Channel], fileName='unknown', verbose=False):
+    # the data of all data channels (samples x channels), see "loadArray"
+    array: np.ndarray
+
+    def __init__(self, channels: List[Channel], fileName='unknown', verbose=False,\
+            timeChannel: Channel = None, f: BinaryIO = None):
         """Create group of channels.
 
         Args:
             channels (list[Channel]): The channels this group is based on.        
+            timeChannel (Channel): The time channel, if it is known already. By default,
+                the first channel which is marked as "isTime".
+            f (BinaryIO): An open stream on the file to read the first samples of the
+                time channel with. If None, the file is opened.
         """
         self.verbose = verbose
         # save all channels
         self.Channels = channels
         # get first channel which is marked as "isTime"
-        timeC = next((x for x in channels if x.isTime), None)
+        timeC = timeChannel if timeChannel is not None else next((x for x in channels if x.isTime), None)
         self.ChannelX = timeC
 
         if timeC is None:
@@ -408,39 +975,257 @@ class Group:
 
 
         # get all other channels
-        self.ChannelsY = []
-        for chan in channels:
-            if not chan.isTime:
-                self.ChannelsY.append(chan)
+        self.ChannelsY = [chan for chan in channels if not chan.isTime]
+
+        # the first two samples of the time channel give the interval (the group may
+        # be a slice which doesn't start at 0), the header is used for single samples
+        first = timeC.readRange(0, 2, f)
+        interval = first[1] - first[0] if len(first) > 1 else timeC.extHeader['dt'] / 1000
 
         # determine frequency and time delta unit
         unit = 's'
         fac = 1
-        if timeC.data[1] < 1:
+        if interval < 1:
             unit = 'ms'
             fac = 1e3
-        if timeC.data[1] < 1e-3:
+        if interval < 1e-3:
             unit = 'μs'
             fac = 1e6
-        if timeC.data[1] < 1e-6:
+        if interval < 1e-6:
             unit = 'ns'
             fac = 1e9
 
-        self.intervalstr = f"{timeC.data[1]*fac:.3f}{unit}"
-        self.interval = timeC[1]
-        self.frequency = 1/timeC.data[1]
+        self.intervalstr = f"{interval*fac:.3f}{unit}"
+        self.interval = interval
+        self.frequency = 1/interval if interval != 0 else 0.0
+
+        # the data channels are columns of one array once it is loaded (see "loadArray")
+        self.array: np.ndarray = None
+
+    def __getstate__(self):
+        """The array is not pickled, the channels keep copies of their columns instead."""
+        state = self.__dict__.copy()
+        state['array'] = None
+        return state
+
+    def loadArray(self, workers: int = None, metrics=None) -> np.ndarray:
+        """Stores the data channels in one array (samples x channels).
+
+        Channels that are not loaded yet are read from the file directly into
+        their column, loaded channels are copied into it. Afterwards, the data of
+        every channel (Channel.data) is a view of its column. The type of the
+        array fits all channels, e.g. float64 if 4- and 8-byte channels are mixed.
+
+        Args:
+            workers (int): Amount of threads to read the channels with.
+            metrics (Metrics): Records the time and bytes of every channel (see apread.metrics).
+
+        Returns:
+            np.ndarray: The array, rows are samples and columns are channels (see Group.to_array).
+        """
+        if self.array is not None:
+            return self.array
+
+        channels = self.ChannelsY
+        if any(x.length != self.ChannelX.length for x in channels):
+            raise ValueError(f'The channels of group "{self.Name}" differ in length.')
+        dtype = np.result_type(*[x.dataType for x in channels]) if len(channels) > 0 else np.float64
+        array = np.empty((self.ChannelX.length, len(channels)), dtype)
+
+        missing = [i for i, x in enumerate(channels) if not x.isLoaded and x.dataMap is None]
+        read_channels([channels[i] for i in missing], workers, ARRAY_CHUNK_SIZE, metrics, [array[:, i] for i in missing])
+        missing = set(missing)
+        for i, channel in enumerate(channels):
+            if i not in missing:
+                array[:, i] = channel.data
+            # the raw samples are scaled into the array
+            channel.raw = None
+            channel.data = array[:, i]
+
+        self.array = array
+        return array
+
+    def to_array(self) -> np.ndarray:
+        """The data of all data channels as one array (samples x channels), without a copy.
+
+        The array is loaded on first access, see Group.loadArray.
+        """
+        return self.loadArray()
+
+    def records(self) -> np.ndarray:
+        """The data channels as structured array (one record per sample, one field per channel), without a copy.
+
+        Raises:
+            ValueError: If the names of the data channels are not unique.
+        """
+        array = self.to_array()
+        names = [x.Name for x in self.ChannelsY]
+        if len(set(names)) != len(names):
+            raise ValueError(f'The names of the channels of group "{self.Name}" are not unique.')
+        return array.view(np.dtype([(x, array.dtype) for x in names]))[:, 0]
 
     def __getitem__(self, key):
         """Return the time and all y-channels at index.
 
         Args:
-            key (int): index
+            key (int | slice): index, or a range of samples
 
         Returns:
-            double: self.data[key]
+            double: self.data[key]. If the group is stored as one array (see
+                Group.loadArray), a slice returns the time and a view of the rows
+                of Group.array (samples x channels).
         """
+        if self.array is not None:
+            if isinstance(key, slice):
+                return (self.ChannelX.data[key], self.array[key])
+            return (self.ChannelX[key], list(self.array[key]))
         return (self.ChannelX[key], [chan[key] for chan in self.ChannelsY])
     
+    def slice(self, t_start: float, t_end: float, channelIndices=None) -> Group:
+        """Creates a new group which contains the samples between t_start and t_end.
+
+        The range of samples is determined once from the time channel (see
+        Channel.searchTime), afterwards only that range is read for every channel.
+
+        Args:
+            t_start (float): Start time (inclusive), in the unit of the time channel.
+            t_end (float): End time (inclusive).
+            channelIndices (list[int]): Indices of the data channels, defaults to all.
+
+        Returns:
+            Group: A new group of sliced channels.
+        """
+        if channelIndices is None:
+            channels = self.ChannelsY
+        else:
+            channels = [self.ChannelsY[x] for x in channelIndices]
+
+        with open(self.ChannelX.filePath, 'rb') as f:
+            start = self.ChannelX.searchTime(t_start, 'left', f)
+            stop = self.ChannelX.searchTime(t_end, 'right', f)
+
+            timeC = self.ChannelX.slice(start, stop, f)
+            sliced = [timeC]
+            for chan in channels:
+                chan = chan.slice(start, stop, f)
+                chan.Time = timeC
+                sliced.append(chan)
+
+        return Group(sliced, self.fileName, self.verbose)
+
+    def stats(self, workers: int = None, samples_per_chunk: int = CHUNK_SAMPLES) -> Dict[str, ChannelStats]:
+        """The statistics of all channels of this group (see Channel.stats), computed in parallel.
+
+        Args:
+            workers (int): Amount of threads, defaults to the number of CPUs.
+            samples_per_chunk (int): Amount of samples read at once.
+
+        Returns:
+            dict[str, ChannelStats]: The statistics by channel name.
+        """
+        return stats_of(self.Channels, workers, samples_per_chunk)
+
+    async def aslice(self, t_start: float, t_end: float, channelIndices=None, executor: Executor = None) -> Group:
+        """Group.slice without blocking the event loop (see apread.aio).
+
+        The file is read in the executor, defaults to apread.aio.get_executor().
+        """
+        return await run_blocking(self.slice, t_start, t_end, channelIndices, executor=executor)
+
+    async def aload(self, limit: int = None, executor: Executor = None):
+        """Loads the data of all channels of this group concurrently (see apread.aio.load_channels)."""
+        await load_channels(self.Channels, limit, executor)
+
+    def export(self, path: str, format: str = 'parquet', samples_per_chunk: int = CHUNK_SAMPLES,\
+            compression: str = None) -> str:
+        """Exports this group into a table (see apread.export.export_group).
+
+        The time channel and all data channels become columns, units and comments
+        are stored as metadata. The data is read and written in chunks.
+
+        Args:
+            path (str): Output file.
+            format (str): 'parquet', 'hdf5' or 'arrow'.
+            samples_per_chunk (int): Amount of samples written at once.
+            compression (str): Compression of the output, None uses the default of the format.
+
+        Returns:
+            str: The path of the output.
+        """
+        return export_group(self, path, format, samples_per_chunk, compression)
+
+    def to_pandas(self, channels: List[str] = None, t_start: float = None, t_end: float = None,\
+            index: bool = True):
+        """Converts this group into a pandas DataFrame, sharing the NumPy buffers where possible.
+
+        Only the selected channels and the samples between t_start and t_end are
+        read (see Group.slice). If the group is stored as one array (see
+        Group.loadArray), the frame is a view of its rows. Units and comments of
+        the channels are stored in DataFrame.attrs. Channels with the same name
+        are numbered (name_1, ...).
+
+        Args:
+            channels (list[str]): Names of the data channels, defaults to all.
+            t_start (float): Start time (inclusive), defaults to the start of the group.
+            t_end (float): End time (inclusive), defaults to the end of the group.
+            index (bool): Use the time channel as index, otherwise it is the first column.
+
+        Returns:
+            pandas.DataFrame: One column per data channel.
+
+        Raises:
+            KeyError: If a channel is not part of this group.
+        """
+        return group_to_pandas(self, channels, t_start, t_end, index)
+
+    def to_polars(self, channels: List[str] = None, t_start: float = None, t_end: float = None):
+        """Converts this group into a polars DataFrame, sharing the NumPy buffers where possible.
+
+        Like Group.to_pandas, but the time channel is always the first column.
+        Polars frames don't have metadata, so units are not kept. Columns of a
+        group that is stored as one array are strided, polars copies them.
+
+        Args:
+            channels (list[str]): Names of the data channels, defaults to all.
+            t_start (float): Start time (inclusive), defaults to the start of the group.
+            t_end (float): End time (inclusive), defaults to the end of the group.
+
+        Returns:
+            polars.DataFrame: The time and one column per data channel.
+
+        Raises:
+            KeyError: If a channel is not part of this group.
+        """
+        return group_to_polars(self, channels, t_start, t_end)
+
+    def iter_chunks(self, samples_per_chunk: int, channelIndices=None) \
+            -> Iterator[Tuple[np.ndarray, List[np.ndarray]]]:
+        """Iterates over the data of this group in chunks.
+
+        Every chunk contains the same samples of the time channel and all data
+        channels, read directly from the file (see Channel.iter_chunks).
+
+        Args:
+            samples_per_chunk (int): Amount of samples per chunk (the last one may be shorter).
+            channelIndices (list[int]): Indices of the data channels, defaults to all.
+
+        Yields:
+            Tuple[np.ndarray, list[np.ndarray]]: The time and the data of every channel.
+        """
+        if samples_per_chunk < 1:
+            raise ValueError('samples_per_chunk has to be at least 1.')
+
+        if channelIndices is None:
+            channels = self.ChannelsY
+        else:
+            channels = [self.ChannelsY[x] for x in channelIndices]
+
+        with open(self.ChannelX.filePath, 'rb') as f:
+            for start in range(0, self.ChannelX.length, samples_per_chunk):
+                stop = start + samples_per_chunk
+                yield (self.ChannelX.readRange(start, stop, f),
+                       [chan.readRange(start, stop, f) for chan in channels])
+
     def __str__(self):        
         return f'Group "{self.Name}" ({len(self.ChannelsY)} Data-channels, {self.ChannelX.length} Entries)'
     
@@ -461,18 +1246,22 @@ class Group:
         """
         self.plot(range(start,end))
     
-    def plot(self, channelIndices=None, sameAxis = False):
+    def plot(self, channelIndices=None, sameAxis = False, decimate='minmax'):
         """
         Plots this group of channels.
         
         Args:
             channelIndices      The starting index of data channels to be plotted.            
+            decimate            Reduce the data to the width of the plot, see Channel.plot.
             
         Examples:
             grp.plot() will plot all channels
             grp.plot([0]) will plot the first data channel
             grp.plot([0, 1, 3]) will plot the first, second and third data channel        
         """
+        # matplotlib is only imported when plotting
+        from apread.plotting import get_cmap, plt
+
         fig, ax1 = plt.subplots()
         ax1.set_xlabel(self.ChannelX.unit)
         
@@ -483,7 +1272,7 @@ class Group:
             channels = [self.ChannelsY[x] for x in channelIndices]
         
         # create colormap
-        cmap = get_clr(len(channels)+1)
+        cmap = get_cmap(len(channels)+1)
         # save labels to retrieve them afterwards when building legend
         lns = []
         
@@ -496,7 +1285,7 @@ class Group:
             axis.tick_params(axis='y', colors=cmap(i))
             axis.get_yaxis().label.set_color(cmap(i))  
                                   
-            chanLine = channel.plot(governed=True, clr=cmap(i))
+            chanLine = channel.plot(governed=True, axes=axis, clr=cmap(i), decimate=decimate)
             
             lns += chanLine
 
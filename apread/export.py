@@ -0,0 +1,182 @@
+# export of groups to columnar file formats
+import os
+
+# typing
+from typing import List
+
+# number of samples that are read and written at once
+CHUNK_SAMPLES = 1_000_000
+
+FORMATS = ('parquet', 'hdf5', 'arrow')
+EXTENSIONS = {'parquet': '.parquet', 'hdf5': '.h5', 'arrow': '.arrow'}
+
+
+def _import_pyarrow(fmt: str):
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(f'Exporting to {fmt} requires pyarrow (pip install pyarrow).') from e
+    return pyarrow
+
+def _import_h5py():
+    try:
+        import h5py
+    except ImportError as e:
+        raise ImportError('Exporting to hdf5 requires h5py (pip install h5py).') from e
+    return h5py
+
+def _check_format(fmt: str):
+    if fmt not in FORMATS:
+        raise ValueError(f'Unknown export format "{fmt}", use one of {", ".join(FORMATS)}.')
+
+def _channels(group) -> List:
+    """The time channel followed by all data channels."""
+    return [group.ChannelX] + list(group.ChannelsY)
+
+def unique_names(names: List[str]) -> List[str]:
+    """Makes names unique by numbering repeated names (name_1, name_2, ...).
+
+    Numbered names never collide with other names of the list.
+    """
+    reserved = set(names)
+    taken = set()
+    counters = {}
+    result = []
+    for base in names:
+        name = base
+        while name in taken or (name != base and name in reserved):
+            counters[base] = counters.get(base, 0) + 1
+            name = f'{base}_{counters[base]}'
+        taken.add(name)
+        result.append(name)
+    return result
+
+def _schema(group):
+    """Arrow schema of a group, units and comments are stored as field metadata."""
+    pa = _import_pyarrow('arrow')
+    channels = _channels(group)
+    fields = []
+    # channels with the same name are numbered
+    for chan, name in zip(channels, unique_names([x.Name for x in channels])):
+        fields.append(pa.field(name, pa.from_numpy_dtype(chan.dataType),\
+            metadata={'unit': chan.unit, 'comment': chan.comment}))
+    return pa.schema(fields, metadata={'file': group.fileName, 'group': group.Name})
+
+def _batches(group, samples_per_chunk: int):
+    """Record batches of a group, read chunk by chunk from the file."""
+    pa = _import_pyarrow('arrow')
+    schema = _schema(group)
+    for time, data in group.iter_chunks(samples_per_chunk):
+        yield pa.RecordBatch.from_arrays([pa.array(x) for x in [time] + data], schema=schema)
+
+def export_group(group, path: str, format: str = 'parquet', samples_per_chunk: int = CHUNK_SAMPLES,\
+        compression: str = None, h5file=None) -> str:
+    """Exports a group into a single table (parquet/arrow) or a group of datasets (hdf5).
+
+    The table contains the time channel followed by the data channels, every
+    channel is a column with its unit and comment as metadata. The data is read
+    from the file and written in chunks, so only one chunk is held in memory.
+
+    Args:
+        group (Group): The group to export.
+        path (str): Output file. For hdf5, the name of the group inside h5file, if given.
+        format (str): 'parquet', 'hdf5' or 'arrow' (Arrow IPC file).
+        samples_per_chunk (int): Amount of samples written at once (row group size).
+        compression (str): Compression of the output, e.g. 'zstd' or 'snappy' (parquet),
+            'zstd' or 'lz4' (arrow), 'gzip' or 'lzf' (hdf5). None uses the default of
+            the format.
+        h5file (h5py.File): An open hdf5 file to write into (used by export_reader).
+
+    Returns:
+        str: The path of the output.
+    """
+    _check_format(format)
+
+    if format == 'parquet':
+        pa = _import_pyarrow(format)
+        import pyarrow.parquet as pq
+
+        kwargs = {} if compression is None else {'compression': compression}
+        with pq.ParquetWriter(path, _schema(group), **kwargs) as writer:
+            for batch in _batches(group, samples_per_chunk):
+                writer.write_table(pa.Table.from_batches([batch]))
+
+    elif format == 'arrow':
+        pa = _import_pyarrow(format)
+
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.OSFile(path, 'wb') as sink, \
+                pa.ipc.new_file(sink, _schema(group), options=options) as writer:
+            for batch in _batches(group, samples_per_chunk):
+                writer.write_batch(batch)
+
+    elif format == 'hdf5':
+        h5py = _import_h5py()
+
+        if h5file is None:
+            with h5py.File(path, 'w') as f:
+                _write_hdf5(group, f, samples_per_chunk, compression)
+        else:
+            _write_hdf5(group, h5file.create_group(path), samples_per_chunk, compression)
+
+    return path
+
+def _write_hdf5(group, h5group, samples_per_chunk: int, compression: str):
+    """Writes the channels of a group as datasets into a hdf5 group."""
+    h5group.attrs['file'] = group.fileName
+    h5group.attrs['group'] = group.Name
+
+    channels = _channels(group)
+    # '/' separates groups in hdf5
+    names = unique_names([chan.Name.replace('/', '_') for chan in channels])
+    datasets = []
+    for chan, name in zip(channels, names):
+        ds = h5group.create_dataset(name, shape=(chan.length,), dtype=chan.dataType,\
+            chunks=(max(min(samples_per_chunk, chan.length), 1),), compression=compression)
+        ds.attrs['unit'] = chan.unit
+        ds.attrs['comment'] = chan.comment
+        ds.attrs['isTime'] = chan.isTime
+        datasets.append(ds)
+
+    start = 0
+    for time, data in group.iter_chunks(samples_per_chunk):
+        stop = start + len(time)
+        for ds, values in zip(datasets, [time] + data):
+            ds[start:stop] = values
+        start = stop
+
+def export_reader(reader, path: str, format: str = 'parquet', samples_per_chunk: int = CHUNK_SAMPLES,\
+        compression: str = None) -> List[str]:
+    """Exports all groups of a reader.
+
+    For parquet and arrow, path is a folder which gets one file per group. For
+    hdf5, path is a single file with one hdf5 group per group.
+
+    Args:
+        reader (APReader): The reader to export.
+        path (str): Output folder (parquet, arrow) or file (hdf5).
+        format (str): 'parquet', 'hdf5' or 'arrow'.
+        samples_per_chunk (int): Amount of samples written at once.
+        compression (str): See export_group.
+
+    Returns:
+        list[str]: The paths of the tables (files or hdf5 groups).
+    """
+    _check_format(format)
+
+    # group names are not unique necessarily
+    names = unique_names([group.fullName.replace('/', '_') for group in reader.Groups])
+
+    if format == 'hdf5':
+        h5py = _import_h5py()
+        with h5py.File(path, 'w') as f:
+            for group, name in zip(reader.Groups, names):
+                export_group(group, name, format, samples_per_chunk, compression, h5file=f)
+        return names
+
+    os.makedirs(path, exist_ok=True)
+    paths = []
+    for group, name in zip(reader.Groups, names):
+        paths.append(export_group(group, os.path.join(path, name + EXTENSIONS[format]), format,\
+            samples_per_chunk, compression))
+    return paths
@@ -0,0 +1,103 @@
+# conversion of groups to pandas and polars DataFrames
+import math
+
+# typing
+from typing import List
+
+import numpy as np
+
+from apread.export import unique_names
+
+
+def _import_pandas():
+    try:
+        import pandas
+    except ImportError as e:
+        raise ImportError('Converting to pandas requires pandas (pip install pandas).') from e
+    return pandas
+
+def _import_polars():
+    try:
+        import polars
+    except ImportError as e:
+        raise ImportError('Converting to polars requires polars (pip install polars).') from e
+    return polars
+
+def _select(group, channels: List[str]) -> List[int]:
+    """Indices of the data channels with these names, all channels for None."""
+    if channels is None:
+        return list(range(len(group.ChannelsY)))
+    names = [x.Name for x in group.ChannelsY]
+    indices = []
+    for name in channels:
+        if name not in names:
+            raise KeyError(f'Group "{group.Name}" has no channel "{name}".')
+        indices.append(names.index(name))
+    return indices
+
+def columns(group, channels: List[str] = None, t_start: float = None, t_end: float = None):
+    """The time and the selected data channels of a group, only these are read.
+
+    If the group is stored as one array (see Group.loadArray) and all channels
+    are selected, the values are a view of the rows of the array. Otherwise they
+    are the data of every channel (views, if the channels are loaded already).
+
+    Args:
+        group (Group): The group.
+        channels (list[str]): Names of the data channels, defaults to all.
+        t_start (float): Start time (inclusive), defaults to the start of the group.
+        t_end (float): End time (inclusive), defaults to the end of the group.
+
+    Returns:
+        Tuple[np.ndarray, list[Channel], np.ndarray | list[np.ndarray]]: The time,
+            the selected channels and their values (a 2D array or one array per channel).
+    """
+    indices = _select(group, channels)
+    selected = [group.ChannelsY[i] for i in indices]
+    window = t_start is not None or t_end is not None
+
+    if group.array is not None and indices == list(range(len(group.ChannelsY))):
+        # open bounds are the ends of the group
+        start = 0 if t_start is None else group.ChannelX.searchTime(t_start, 'left')
+        stop = group.ChannelX.length if t_end is None else group.ChannelX.searchTime(t_end, 'right')
+        return group.ChannelX.data[start:stop], selected, group.array[start:stop]
+
+    if window:
+        # only the range of the selected channels is read (open bounds are infinite)
+        sliced = group.slice(-math.inf if t_start is None else t_start, math.inf if t_end is None else t_end, indices)
+        return sliced.ChannelX.data, selected, [x.data for x in sliced.ChannelsY]
+    return group.ChannelX.data, selected, [x.data for x in selected]
+
+def group_to_pandas(group, channels: List[str] = None, t_start: float = None, t_end: float = None,\
+        index: bool = True):
+    """Converts a group into a pandas DataFrame (see Group.to_pandas)."""
+    pd = _import_pandas()
+    time, selected, values = columns(group, channels, t_start, t_end)
+    # channels with the same name are numbered (see apread.export.unique_names)
+    timeName, *names = unique_names([x.Name for x in [group.ChannelX] + selected])
+
+    if isinstance(values, np.ndarray):
+        frame = pd.DataFrame(values, columns=names, copy=False)
+    else:
+        frame = pd.DataFrame(dict(zip(names, values)), columns=names, copy=False)
+    if index:
+        frame.index = pd.Index(time, name=timeName, copy=False)
+    else:
+        frame.insert(0, timeName, time)
+
+    frame.attrs['file'] = group.fileName
+    frame.attrs['group'] = group.Name
+    frame.attrs['units'] = {x: y.unit for x, y in zip([timeName] + names, [group.ChannelX] + selected)}
+    frame.attrs['comments'] = {x: y.comment for x, y in zip([timeName] + names, [group.ChannelX] + selected)}
+    return frame
+
+def group_to_polars(group, channels: List[str] = None, t_start: float = None, t_end: float = None):
+    """Converts a group into a polars DataFrame (see Group.to_polars)."""
+    pl = _import_polars()
+    time, selected, values = columns(group, channels, t_start, t_end)
+    if isinstance(values, np.ndarray):
+        # columns of the array are strided, polars copies them
+        values = [values[:, i] for i in range(values.shape[1])]
+    names = unique_names([x.Name for x in [group.ChannelX] + selected])
+    series = [pl.Series(x, y) for x, y in zip(names, [time] + list(values))]
+    return pl.DataFrame(series)
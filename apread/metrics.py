@@ -0,0 +1,111 @@
+# timings and I/O of a reader
+import time
+
+# typing
+from typing import Callable, Dict
+
+
+class Metrics:
+    """
+    Timings and I/O of an APReader (see APReader.metrics).
+
+    Phases are timed in wall and CPU time (CPU time of the whole process, so
+    threads are included):
+
+        cache       restoring from and storing into the cache
+        header      parsing the file header and all channel headers
+        data        reading the data of all channels (not for lazy readers)
+        connect     grouping the channels and finding the time channels
+
+    Bytes and read calls are counted for all data read by the reader and its
+    channels, including channels that are loaded later (lazy=True) and ranges
+    (Channel.readRange). Read calls are the calls made by apread, not the system
+    calls. Mapped channels (mmap=True) are counted in bytes, without read calls.
+
+    The hook is called with every event, e.g. to export the metrics to a
+    monitoring system or to show a progress instead of tqdm:
+
+        hook('phase', {'phase': 'header', 'wall': 0.01, 'cpu': 0.01})
+        hook('channel', {'channel': 'Force', 'seconds': 0.2, 'bytes': 800000, 'index': 3, 'total': 12})
+
+    'index' and 'total' are only given while a reader reads all channels.
+    """
+    def __init__(self, hook: Callable[[str, dict], None] = None):
+        """Creates empty metrics.
+
+        Args:
+            hook (Callable[[str, dict], None]): Called with the name and the data of every event.
+        """
+        self.hook = hook
+        # wall and cpu time in seconds by phase
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.bytesRead = 0
+        self.reads = 0
+        # time (seconds), bytes and reads of the data of every channel, by name
+        self.channels: Dict[str, Dict[str, float]] = {}
+        # start times of the running phases
+        self._running = {}
+
+    def start(self, phase: str):
+        """Starts timing a phase."""
+        self._running[phase] = (time.perf_counter(), time.process_time())
+
+    def stop(self, phase: str):
+        """Stops timing a phase, the time is added to the phase."""
+        wall0, cpu0 = self._running.pop(phase)
+        wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+        totals = self.phases.setdefault(phase, {'wall': 0.0, 'cpu': 0.0})
+        totals['wall'] += wall
+        totals['cpu'] += cpu
+        if self.hook is not None:
+            self.hook('phase', {'phase': phase, 'wall': wall, 'cpu': cpu})
+
+    def read(self, nbytes: int, count: int = 1):
+        """Counts bytes that have been read with count read calls."""
+        self.bytesRead += nbytes
+        self.reads += count
+
+    def channel(self, channel, seconds: float, nbytes: int, count: int, index: int = None, total: int = None):
+        """Adds the reading of a channel's data."""
+        self.read(nbytes, count)
+        totals = self.channels.setdefault(channel.Name, {'seconds': 0.0, 'bytes': 0, 'reads': 0})
+        totals['seconds'] += seconds
+        totals['bytes'] += nbytes
+        totals['reads'] += count
+        if self.hook is not None:
+            self.hook('channel', {'channel': channel.Name, 'seconds': seconds, 'bytes': nbytes,\
+                'index': index, 'total': total})
+
+    def load(self, channel, func: Callable, *args, index: int = None, total: int = None):
+        """Calls func (which loads the data of channel) and adds its time to the channel."""
+        t0 = time.perf_counter()
+        func(*args)
+        seconds = time.perf_counter() - t0
+        if channel.dataMap is not None:
+            count = 0
+        else:
+            # 2-byte channels read their minimum and maximum value first
+            count = 2 if channel.precision == 2 else 1
+        self.channel(channel, seconds, channel.dataSize, count, index, total)
+
+    def as_dict(self) -> dict:
+        """The metrics as a dictionary (e.g. to save them as json)."""
+        return {
+            'phases': {key: dict(value) for key, value in self.phases.items()},
+            'bytesRead': self.bytesRead,
+            'reads': self.reads,
+            'channels': {key: dict(value) for key, value in self.channels.items()},
+        }
+
+    def __getstate__(self):
+        """The hook is not pickled (e.g. when a reader is sent between processes)."""
+        state = self.__dict__.copy()
+        state['hook'] = None
+        return state
+
+    def __str__(self):
+        lines = [f'{"phase":10} {"wall [ms]":>12} {"cpu [ms]":>12}']
+        for phase, value in self.phases.items():
+            lines.append(f'{phase:10} {value["wall"]*1000:12.2f} {value["cpu"]*1000:12.2f}')
+        lines.append(f'{self.bytesRead / 2**20:.2f} MB in {self.reads} reads, {len(self.channels)} channels')
+        return '\n'.join(lines)
@@ -0,0 +1,207 @@
+# parallel reading of channel data with threads
+import itertools
+import os
+import struct
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# typing
+from typing import List, Tuple
+
+import numpy as np
+
+# size of the chunks that large channels are split into (in bytes)
+CHUNK_SIZE = 16 * 1024 * 1024
+# size of the chunks of channels that are read into the columns of an array (see Group.loadArray),
+# small chunks keep the rows that are written in the cache
+ARRAY_CHUNK_SIZE = 64 * 1024
+
+
+class FileSource:
+    """
+    Positional reads on a file, shared by multiple threads.
+
+    Uses os.preadv where available, which reads directly into the target buffer
+    without moving a shared stream position. Otherwise every thread opens its
+    own handle once.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+        self._local = threading.local()
+        self._handles = []
+        self._lock = threading.Lock()
+
+        if hasattr(os, 'preadv'):
+            self._fd = os.open(path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+
+    def _handle(self):
+        f = getattr(self._local, 'file', None)
+        if f is None:
+            f = open(self.path, 'rb', buffering=0)
+            self._local.file = f
+            with self._lock:
+                self._handles.append(f)
+        return f
+
+    def readinto(self, offset: int, buf: memoryview) -> int:
+        """Fills buf with the bytes of the file at offset.
+
+        Returns:
+            int: The amount of bytes read, smaller than len(buf) only at the end of the file.
+        """
+        pos = 0
+        while pos < len(buf):
+            if self._fd is not None:
+                n = os.preadv(self._fd, [buf[pos:]], offset + pos)
+            else:
+                f = self._handle()
+                f.seek(offset + pos)
+                n = f.readinto(buf[pos:])
+            if not n:
+                break
+            pos += n
+        return pos
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        for f in self._handles:
+            f.close()
+        self._handles = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+def scale(raw: np.ndarray, scaling: Tuple[float, float], out: np.ndarray) -> np.ndarray:
+    """Scales 2-byte samples (see Channel.readScaling) directly into out."""
+    sf, MinValue = scaling
+    np.multiply(raw, sf, out=out, casting='unsafe')
+    out += MinValue
+    return out
+
+def read_chunk(source: FileSource, offset: int, out: np.ndarray, rawType: np.dtype = None,\
+        scaling: Tuple[float, float] = None):
+    """Reads a chunk of a channel directly into out (a slice of the result).
+
+    If the samples are stored as another type (rawType) or out is not contiguous
+    (e.g. a column of Group.array), the chunk is read into a buffer and converted
+    into out. 2-byte samples are scaled into out, if scaling is given.
+    """
+    direct = (rawType is None or rawType == out.dtype) and out.flags.c_contiguous and scaling is None
+    target = out if direct else np.empty(len(out), rawType or out.dtype)
+    buf = memoryview(target).cast('B')
+    if source.readinto(offset, buf) < len(buf):
+        raise EOFError(f'Unexpected end of file "{source.path}" at byte {offset}.')
+    if scaling is not None:
+        scale(target, scaling, out)
+    elif target is not out:
+        out[...] = target
+
+def timed_read_chunk(source: FileSource, offset: int, out: np.ndarray, rawType: np.dtype = None,\
+        scaling: Tuple[float, float] = None) -> float:
+    """Reads a chunk (see read_chunk) and returns the time it took in seconds."""
+    t0 = time.perf_counter()
+    read_chunk(source, offset, out, rawType, scaling)
+    return time.perf_counter() - t0
+
+def read_batch(read, source: FileSource, batch: list) -> list:
+    """Reads chunks one after another (see read_channels), returns the results of read."""
+    return [read(source, *x[2:]) for x in batch]
+
+def read_channels(channels: List, workers: int = None, chunk_size: int = CHUNK_SIZE, metrics=None,\
+        out: List[np.ndarray] = None):
+    """Reads the data of multiple channels using a pool of threads.
+
+    Every channel gets one preallocated array (or its array of out). Large channels are split into chunks
+    of chunk_size bytes and all chunks of all channels are read in parallel
+    directly into their slice of the result (no copies between workers). If the
+    type of the data (Channel.dataType) differs from the file, every chunk is
+    converted by the thread that read it.
+
+    Args:
+        channels (list[Channel]): Channels of the same file with known data offsets.
+        workers (int): Amount of threads. Defaults to the number of CPUs.
+        chunk_size (int): Maximum size of a single read in bytes.
+        metrics (Metrics): Records the time and bytes of every channel (see apread.metrics).
+            The time of a channel is the sum of the times of its chunks.
+        out (list[np.ndarray]): Arrays to read the channels into, one per channel (e.g. the
+            columns of Group.array). 2-byte channels are scaled into them.
+    """
+    keep = [i for i, x in enumerate(channels) if not x.broken]
+    out = [None] * len(keep) if out is None else [out[i] for i in keep]
+    channels = [channels[i] for i in keep]
+    if len(channels) == 0:
+        return
+
+    with FileSource(channels[0].filePath) as source, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        chunks = []
+        results = []
+        read = read_chunk if metrics is None else timed_read_chunk
+        for i, channel in enumerate(channels):
+            offset = channel.dataOffset
+            data = out[i]
+            scaling = None
+            if channel.precision == 2:
+                # minimum and maximum value precede the data
+                minmax = bytearray(16)
+                source.readinto(offset, memoryview(minmax))
+                MinValue, MaxValue = struct.unpack('dd', minmax)
+                offset += 16
+                if data is None:
+                    data = np.empty(channel.length, np.dtype('u2'))
+                else:
+                    # the chunks are scaled into the given array
+                    scaling = ((MaxValue - MinValue)/32767, MinValue)
+            else:
+                MinValue, MaxValue = None, None
+                if data is None:
+                    data = np.empty(channel.length, channel.dataType)
+
+            # split the channel into chunks (of the same rows for all columns of an array)
+            rawType = channel.rawType
+            count = max(chunk_size // (rawType.itemsize if out[i] is None else data.itemsize), 1)
+            for start in range(0, channel.length, count):
+                end = min(start + count, channel.length)
+                chunks.append((start, i, offset + start * rawType.itemsize, data[start:end], rawType, scaling))
+
+            results.append((channel, data, MinValue, MaxValue, scaling))
+
+        if any(x is not None for x in out):
+            # the columns of an array are filled by one thread per block of rows, so that
+            # the rows stay in its cache and threads don't write to the same rows
+            chunks.sort(key=lambda x: x[:2])
+            batches = [list(x) for _, x in itertools.groupby(chunks, key=lambda x: x[0])]
+        else:
+            batches = [[x] for x in chunks]
+        tasks = [([x[1] for x in batch], pool.submit(read_batch, read, source, batch)) for batch in batches]
+
+        # raises the first error of the reading tasks
+        seconds = [0.0] * len(channels)
+        reads = [1 if x.precision == 2 else 0 for x in channels]
+        for indices, task in tasks:
+            result = task.result()
+            if metrics is not None:
+                for i, elapsed in zip(indices, result):
+                    seconds[i] += elapsed
+                    reads[i] += 1
+
+    if metrics is not None:
+        for i, channel in enumerate(channels):
+            metrics.channel(channel, seconds[i], channel.dataSize, reads[i], i, len(channels))
+
+    for channel, data, MinValue, MaxValue, scaling in results:
+        if channel.precision == 2 and scaling is None:
+            channel.assignRaw(data, MinValue, MaxValue)
+        else:
+            if scaling is not None:
+                channel._scaling = scaling
+                channel._limits = (MinValue, MaxValue)
+            channel.data = data
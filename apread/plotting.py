@@ -0,0 +1,64 @@
+# plotting of channels and groups (requires matplotlib)
+from typing import Tuple
+
+import numpy.typing as nptyp
+
+try:
+    from matplotlib import pyplot as plt
+except ImportError as e:
+    raise ImportError('Plotting requires matplotlib (pip install apread[plot]).') from e
+
+# downsampling for plots
+from apread.decimate import plot_decimated
+
+def get_cmap(n, name='hsv'):
+    '''Returns a function that maps each index in 0, 1, ..., n-1 to a distinct 
+    RGB color; the keyword argument name must be a standard mpl colormap name.'''
+    return plt.get_cmap(name, n)
+
+def plot_multiple_datasets(datasets: list[Tuple[nptyp.NDArray, nptyp.NDArray, str, str, str]]\
+        , plt_title = '', decimate = 'minmax'):
+    """
+    Plots multiple datasets on the same plot with separate y-axes.
+
+    Parameters:
+    datasets (list of tuples): Each tuple should contain (x, y, color, ylabel, title)
+    decimate (str): Reduce the data to the width of the plot ('minmax' or 'lttb'),
+        it is recomputed when zooming. None plots all data.
+    """
+    fig, ax = plt.subplots()
+    cmap = get_cmap(len(datasets)+5, name='Set1')
+    lbs = []
+    for i, data in enumerate(datasets):
+        x, y, style, ylabel, title = data
+
+            
+        if i == 0:
+            ax1 = ax
+        else:
+            ax1 = ax.twinx()
+            ax1.spines['right'].set_position(('outward', 60*(i-1)))
+
+        if style is None: 
+            l = plot_decimated(ax1, x, y, color=cmap(i), label=title, method=decimate)[0]
+        else:
+            l = plot_decimated(ax1, x, y, style, label=title, method=decimate)[0]
+            
+        ax1.set_ylabel(ylabel, color=l.get_color())
+        ax1.tick_params(axis='y', colors=l.get_color())
+        lbs.append((l, ylabel))
+
+    ax.legend([x[0] for x in lbs], [x[1] for x in lbs])
+    ax.set_title(plt_title)
+    fig.tight_layout()
+    plt.show()
+    return fig,ax
+
+def align_yaxis(ax1, v1, ax2, v2):
+    """adjust ax2 ylimit so that v2 in ax2 is aligned to v1 in ax1"""
+    _, y1 = ax1.transData.transform((0, v1))
+    _, y2 = ax2.transData.transform((0, v2))
+    inv = ax2.transData.inverted()
+    _, dy = inv.transform((0, 0)) - inv.transform((0, y1-y2))
+    miny, maxy = ax2.get_ylim()
+    ax2.set_ylim(miny+dy, maxy+dy)
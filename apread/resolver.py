@@ -0,0 +1,177 @@
+# finding the time channel of a group of channels
+import re
+
+# typing
+from typing import Callable, Hashable, Iterable, List
+
+import numpy as np
+
+# names of time channels (used by APReader.connect since version 1.1)
+DEFAULT_TIME_PATTERN = r"([T|t]ime)|([Z|z]eit)"
+
+
+def by_length(channel) -> Hashable:
+    """Groups channels by their amount of samples (the default)."""
+    return channel.length
+
+def by_rate(channel) -> Hashable:
+    """Groups channels by their amount of samples and sample interval.
+
+    The interval ('dt' of the extended header) is compared in single precision,
+    because time channels store it as float32 and data channels as float64.
+    """
+    return channel.length, float(np.float32(channel.extHeader['dt']))
+
+def by_start(channel) -> Hashable:
+    """Groups channels by their amount of samples, sample interval and start time ('T0')."""
+    # T0 is a serial day, rounded to about 10 µs
+    return by_rate(channel) + (round(channel.extHeader['T0'], 10),)
+
+# grouping keys of APReader(group_by=...)
+GROUP_KEYS = {
+    'length': by_length,
+    'rate': by_rate,
+    'start': by_start,
+}
+
+
+def group_key(group_by) -> Callable:
+    """The grouping key of APReader(group_by=...).
+
+    Args:
+        group_by (str | Callable): 'length', 'rate', 'start' or a function that
+            returns a hashable key of a channel.
+
+    Raises:
+        ValueError: If the name is unknown.
+    """
+    if callable(group_by):
+        return group_by
+    if group_by not in GROUP_KEYS:
+        raise ValueError(f'Unknown grouping key "{group_by}", use one of {list(GROUP_KEYS)} or a function.')
+    return GROUP_KEYS[group_by]
+
+
+class Unresolved:
+    """
+    A group of channels for which no time channel was found.
+
+    These groups are not part of APReader.Groups, they are listed in
+    APReader.unresolved instead.
+    """
+    # the channels of the group
+    channels: list
+    # amount of samples of every channel
+    length: int
+    # why the group was left out ('single channel' or 'no time channel')
+    reason: str
+
+    def __init__(self, channels: list, reason: str):
+        self.channels = channels
+        self.length = channels[0].length if len(channels) > 0 else 0
+        self.reason = reason
+
+    def __str__(self):
+        names = ', '.join(f'"{x.Name}"' for x in self.channels)
+        return f'Unresolved group ({self.reason}, {self.length} Entries): {names}'
+
+
+class TimeResolver:
+    """
+    Finds the time channel of a group of channels.
+
+    The rules are applied in this order, the first match is used:
+
+        1. callback: a function that receives the channels and returns the time channel (or None)
+        2. indices: channel numbers (Channel.num) of time channels
+        3. names: regular expressions matched against the channel names
+        4. units: units of time channels (e.g. 's')
+        5. synthesize: create a time channel from the extended header (T0/dt)
+
+    The resolver never blocks, so it can be used in batch jobs and worker processes.
+    """
+    def __init__(self, names: Iterable[str] = (DEFAULT_TIME_PATTERN,), units: Iterable[str] = ('s',),\
+            indices: Iterable[int] = (), synthesize: bool = False, callback: Callable = None):
+        """Creates a resolver.
+
+        Args:
+            names (list[str]): Regular expressions for names of time channels (re.match).
+            units (list[str]): Units of time channels, used if no name matches.
+            indices (list[int]): Channel numbers (Channel.num) of time channels.
+            synthesize (bool): Create a time channel from the sample interval of the
+                extended header, if none of the channels matches.
+            callback (Callable[[list[Channel]], Channel]): Custom rule, returns the
+                time channel of the given channels or None.
+        """
+        self.names = [re.compile(x) for x in names]
+        # all names in one expression, so every channel is matched only once
+        self._names = re.compile('|'.join(f'(?:{x.pattern})' for x in self.names)) if self.names else None
+        self.units = set(units)
+        self.indices = set(indices)
+        self.synthesize = synthesize
+        self.callback = callback
+
+    def fingerprint(self) -> Hashable:
+        """Identifies the rules of this resolver, e.g. to check whether a cached file was resolved the same way.
+
+        Returns:
+            Hashable: The type and the rules, None if there is a callback (functions can't be compared).
+        """
+        if self.callback is not None:
+            return None
+        return (f'{type(self).__module__}.{type(self).__qualname__}', tuple(x.pattern for x in self.names),\
+            tuple(sorted(self.units)), tuple(sorted(self.indices)), self.synthesize)
+
+    def resolve(self, channels: List):
+        """Finds the time channel of a group.
+
+        Args:
+            channels (list[Channel]): Channels of the same length.
+
+        Returns:
+            Channel: The time channel (which may be a new, synthesized channel) or None.
+        """
+        if self.callback is not None:
+            timeChannel = self.callback(channels)
+            if timeChannel is not None:
+                return timeChannel
+
+        for channel in channels:
+            if channel.num in self.indices:
+                return channel
+
+        if self._names is not None:
+            for channel in channels:
+                if self._names.match(channel.Name) is not None:
+                    return channel
+
+        timeChannel = self.resolveUnit(channels)
+        if timeChannel is not None:
+            return timeChannel
+
+        if self.synthesize and channels[0].extHeader['dt'] > 0:
+            return channels[0].synthesizeTime()
+
+        return None
+
+    def resolveUnit(self, channels: List):
+        """Returns the first channel with a time unit."""
+        for channel in channels:
+            if channel.unit in self.units:
+                return channel
+        return None
+
+
+class InteractiveResolver(TimeResolver):
+    """
+    Asks the user before a channel is used as time channel because of its unit.
+
+    This is how APReader.connect used to behave. It blocks until the user
+    answers and must not be used in batch jobs.
+    """
+    def resolveUnit(self, channels: List):
+        for channel in channels:
+            if channel.unit in self.units and \
+                input(f"Is '{channel.Name}' your time/reference channel? [y/n] ") == "y":
+                return channel
+        return None
@@ -0,0 +1,177 @@
+# statistics of the channel data, computed in one pass over chunks
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# typing
+from typing import Dict, Iterable, List
+
+import numpy as np
+
+from apread.export import CHUNK_SAMPLES
+
+
+class ChannelStats:
+    """
+    Statistics of the data of a channel (see Channel.stats).
+
+    NaN samples are counted in nans and left out of all other values. Values
+    of channels without valid samples are NaN.
+    """
+    # amount of valid (not NaN) samples
+    count: int
+    # amount of NaN samples
+    nans: int
+    min: float
+    max: float
+    mean: float
+    # standard deviation of the population (ddof=0)
+    std: float
+    # root mean square
+    rms: float
+
+    def __init__(self, count: int, nans: int, min: float, max: float, mean: float, std: float):
+        self.count = count
+        self.nans = nans
+        self.min = min
+        self.max = max
+        self.mean = mean
+        self.std = std
+        self.rms = math.sqrt(mean * mean + std * std) if count > 0 else math.nan
+
+    def as_dict(self) -> dict:
+        """The statistics as a dictionary (e.g. for a report)."""
+        return {key: getattr(self, key) for key in ['count', 'nans', 'min', 'max', 'mean', 'std', 'rms']}
+
+    def __str__(self):
+        return f'{self.count} samples ({self.nans} NaN), min {self.min:g}, max {self.max:g}, '\
+            f'mean {self.mean:g}, std {self.std:g}, rms {self.rms:g}'
+
+
+class FloatAccumulator:
+    """Collects the statistics of floating point chunks.
+
+    Mean and variance of every chunk are merged with the parallel algorithm of
+    Chan et al., which is stable for long channels.
+    """
+    def __init__(self):
+        self.count = 0
+        self.nans = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self.mean = 0.0
+        # sum of the squared differences from the mean
+        self.m2 = 0.0
+
+    def add(self, chunk: np.ndarray):
+        nan = np.isnan(chunk)
+        nans = int(np.count_nonzero(nan))
+        if nans > 0:
+            self.nans += nans
+            chunk = chunk[~nan]
+        n = len(chunk)
+        if n == 0:
+            return
+
+        self.min = min(self.min, float(chunk.min()))
+        self.max = max(self.max, float(chunk.max()))
+        mean = float(chunk.mean(dtype=np.float64))
+        deviation = np.subtract(chunk, mean, dtype=np.float64)
+        m2 = float(np.dot(deviation, deviation))
+
+        total = self.count + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta * delta * self.count * n / total
+        self.count = total
+
+    def result(self) -> ChannelStats:
+        if self.count == 0:
+            return ChannelStats(0, self.nans, math.nan, math.nan, math.nan, math.nan)
+        return ChannelStats(self.count, self.nans, self.min, self.max, self.mean,\
+            math.sqrt(max(self.m2, 0.0) / self.count))
+
+
+class IntegerAccumulator:
+    """Collects the statistics of unscaled 2-byte chunks.
+
+    Sums and sums of squares are exact integers, the samples are only scaled
+    when the result is computed.
+    """
+    def __init__(self):
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.sum = 0
+        self.squares = 0
+
+    def add(self, chunk: np.ndarray):
+        if len(chunk) == 0:
+            return
+        self.count += len(chunk)
+        low, high = int(chunk.min()), int(chunk.max())
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+        self.sum += int(chunk.sum(dtype=np.uint64))
+        wide = chunk.astype(np.uint64)
+        self.squares += int(np.dot(wide, wide))
+
+    def result(self, scaling) -> ChannelStats:
+        """The statistics of the scaled samples (see Channel.readScaling)."""
+        if self.count == 0:
+            return ChannelStats(0, 0, math.nan, math.nan, math.nan, math.nan)
+        sf, MinValue = scaling
+        n = self.count
+        # variance of the integers, the numerator is exact
+        variance = (n * self.squares - self.sum * self.sum) / (n * n)
+        low, high = self.min * sf + MinValue, self.max * sf + MinValue
+        # a negative scale factor swaps minimum and maximum
+        if sf < 0:
+            low, high = high, low
+        return ChannelStats(n, 0, low, high, self.sum / n * sf + MinValue, abs(sf) * math.sqrt(variance))
+
+
+def iter_data(channel, samples_per_chunk: int) -> Iterable[np.ndarray]:
+    """The data of a channel as it is stored: raw samples of 2-byte channels, loaded data or the file."""
+    if channel.raw is not None:
+        source = channel.raw
+    elif channel._data is not None:
+        source = channel._data
+    else:
+        # 2-byte channels are read unscaled
+        yield from channel.iter_chunks(samples_per_chunk, raw=True)
+        return
+    for start in range(0, len(source), samples_per_chunk):
+        yield source[start:start + samples_per_chunk]
+
+def channel_stats(channel, samples_per_chunk: int = CHUNK_SAMPLES) -> ChannelStats:
+    """Computes the statistics of a channel in one pass, the channel is not loaded (see Channel.stats)."""
+    # unscaled samples, in memory or in the file
+    integer = channel.raw is not None or (channel._data is None and channel.precision == 2)
+    accumulator = IntegerAccumulator() if integer else FloatAccumulator()
+    for chunk in iter_data(channel, samples_per_chunk):
+        accumulator.add(chunk)
+    # the scaling is known after the first read from the file
+    return accumulator.result(channel.readScaling()) if integer else accumulator.result()
+
+def stats_of(channels: List, workers: int = None, samples_per_chunk: int = CHUNK_SAMPLES) -> Dict[str, ChannelStats]:
+    """The statistics of many channels, computed in parallel (see APReader.stats).
+
+    Args:
+        channels (list[Channel]): The channels.
+        workers (int): Amount of threads, defaults to the number of CPUs.
+        samples_per_chunk (int): Amount of samples read at once.
+
+    Returns:
+        dict[str, ChannelStats]: The statistics by channel name.
+    """
+    todo = [x for x in channels if x._stats is None]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if len(todo) > 1 and workers > 1:
+        with ThreadPoolExecutor(min(workers, len(todo))) as pool:
+            list(pool.map(lambda x: x.stats(samples_per_chunk), todo))
+    else:
+        for channel in todo:
+            channel.stats(samples_per_chunk)
+    return {x.Name: x.stats() for x in channels}
@@ -1,3 +1,4 @@
+import sys
 import warnings
 import functools
 
@@ -13,4 +14,26 @@ def deprecated(func):
                       stacklevel=2)
         warnings.simplefilter('default', DeprecationWarning)  # reset filter
         return func(*args, **kwargs)
-    return new_func
\ No newline at end of file
+    return new_func
+
+def progress(iterable, enabled=None, **kwargs):
+    """Wraps an iterable in a tqdm progress bar.
+
+    tqdm is optional and only imported if the bar is shown.
+
+    Args:
+        iterable (Iterable): The iterable.
+        enabled (bool): Show the bar. If None, the bar is shown if tqdm is
+            installed and stderr is a terminal.
+        **kwargs: Passed to tqdm.
+    """
+    if enabled is None:
+        enabled = sys.stderr is not None and sys.stderr.isatty()
+    if not enabled:
+        return iterable
+
+    try:
+        from tqdm import tqdm
+    except ImportError:
+        return iterable
+    return tqdm(iterable, **kwargs)
@@ -0,0 +1,385 @@
+# writing catmanAP binary files
+import copy
+import re
+import struct
+import time
+
+# typing
+from typing import Iterator, List
+
+import numpy as np
+
+from apread.binaryReader import decode_string
+from apread.entries import CHANNEL_INFO_FORMAT, CHANNEL_LIN_FORMAT, EXT_HEADER_FORMAT
+from apread.export import CHUNK_SAMPLES
+
+# file ID of the written files (catman 5.x)
+FILE_ID = 5012
+# value of 'ExportFormat' in the extended header by precision
+EXPORT_FORMATS = {8: 0, 4: 1, 2: 2}
+EXT_HEADER = struct.Struct('=' + EXT_HEADER_FORMAT)
+# fields of the extended header in the order of EXT_HEADER_FORMAT ('InChar' has four values)
+EXT_HEADER_KEYS = ['T0', 'dt', 'SensorType', 'SupplyVoltage', 'FiltChar', 'FiltFreq', 'TareVal',\
+    'ZeroVal', 'MeasRange', 'InChar', 'SerNo', 'PhysUnit', 'NativeUnit', 'Slot', 'SubSlot', 'AmpType',\
+    'APType', 'kFactor', 'bFactor', 'MeasSig', 'AmpInput', 'HPFilt', 'OLImportInfo', 'ScaleType',\
+    'SoftwareTareVal', 'WriteProtected', 'NominalRange', 'CLCFactor', 'ExportFormat']
+# indices of the strings in the packed extended header
+EXT_HEADER_STRINGS = {'SerNo': 13, 'PhysUnit': 14, 'NativeUnit': 15}
+# (start, end) of the padding bytes of the extended header
+EXT_HEADER_PADDING = [(struct.calcsize('=dd4h3f4f32s8s8s4h2f3h2bfb'), struct.calcsize('=dd4h3f4f32s8s8s4h2f3h2bfb3x')),\
+    (struct.calcsize('=dd4h3f4f32s8s8s4h2f3h2bfb3x2fb'), EXT_HEADER.size)]
+
+
+def encode_string(text: str, raw: bytes = None) -> bytes:
+    """Encodes a string for a catman file.
+
+    Args:
+        text (str): The string.
+        raw (bytes): The bytes the string has been read from. They are used as
+            long as they still decode to text, so unchanged strings are written
+            exactly as they were read.
+
+    Returns:
+        bytes: The encoded string (Windows-1252 like catman, utf-8 for other characters).
+    """
+    if raw is not None and decode_string(raw) == text:
+        return raw
+    try:
+        return text.encode('cp1252')
+    except UnicodeEncodeError:
+        return text.encode('utf-8')
+
+def serial_day(timestamp: float) -> float:
+    """Converts a unix timestamp into the serial day format of catman (days since 1899-12-30)."""
+    return timestamp / 86400.0 + 25569
+
+def default_ext_header(dt: float, T0: float) -> dict:
+    """Extended header of a new channel."""
+    exthdr = {key: 0 for key in EXT_HEADER_KEYS}
+    exthdr.update({'T0': T0, 'dt': dt, 'InChar': [0.0] * 4, 'SerNo': '', 'PhysUnit': '', 'NativeUnit': '',\
+        'kFactor': 1.0})
+    return exthdr
+
+
+class APWriter:
+    """
+    Writes catmanAP binary files.
+
+    The layout is the one parsed by APReader: the file header, a header for
+    every channel (including the extended header) and the data of all channels,
+    one after another, in 2-, 4- or 8-byte precision. Channels are added with
+    their data (arrays or iterables of chunks) and everything is written at
+    once by APWriter.write, reading and writing the data chunk by chunk.
+
+        writer = APWriter.from_reader(reader)
+        writer.write('copy.bin')
+
+        writer = APWriter(comment='reduced')
+        for channel in reader.Groups[0].slice(10, 20).Channels:
+            writer.add(channel)
+        writer.write('reduced.bin')
+
+    Files read by APReader are written again byte by byte (see from_reader),
+    as long as the channels and their headers are not changed.
+    """
+    def __init__(self, comment: str = '', fileID: int = FILE_ID, dataOffset: int = 0, maxLength: int = 0,\
+            reducedFactor: int = 0, headerStrings: List[bytes] = None, trailer: bytes = b''):
+        """Creates a writer.
+
+        Args:
+            comment (str): Comment of the file.
+            fileID (int): ID of the file format.
+            dataOffset (int): Minimum offset of the data, the header is padded with zeros up to it.
+            maxLength (int): Maximum length of the channels (0: unlimited).
+            reducedFactor (int): Reduced factor (unused by catman).
+            headerStrings (list[bytes]): The 32 strings of the file header (empty by default).
+            trailer (bytes): Data behind the channel data (e.g. display settings of catman).
+        """
+        self.comment = comment
+        self.fileID = fileID
+        self.dataOffset = dataOffset
+        self.maxLength = maxLength
+        self.reducedFactor = reducedFactor
+        self.headerStrings = list(headerStrings) if headerStrings is not None else [b''] * 32
+        self.trailer = trailer
+        # bytes of the comment in the original file, see encode_string
+        self.rawStrings = {}
+        # the first header string is the offset of the trailer, it is updated when writing
+        self.trailerOffset = False
+        # headers and data sources of the channels
+        self.channels: List[dict] = []
+
+    @classmethod
+    def from_reader(cls, reader, channels: list = None) -> 'APWriter':
+        """Creates a writer with the header and the channels of a reader.
+
+        Without changes, APWriter.write creates a copy of the file. The section
+        behind the channel data is only copied if all channels are written.
+
+        Args:
+            reader (APReader): The reader to copy.
+            channels (list[Channel]): Channels to write, e.g. sliced channels of
+                the reader. Defaults to all channels of the reader.
+
+        Returns:
+            APWriter: The writer.
+        """
+        writer = cls(reader.comment, reader.fileID, reader.dataOffset, reader.maxLength,\
+            reader.reducedFactor, reader.headerStrings)
+        writer.rawStrings = dict(reader.rawStrings)
+
+        if channels is None:
+            channels = reader.Channels
+        for channel in channels:
+            writer.add(channel)
+
+        if len(channels) == len(reader.Channels) and len(reader.Channels) > 0:
+            last = reader.Channels[-1]
+            end = last.dataOffset + last.dataSize
+            with open(reader.filepath, 'rb') as f:
+                f.seek(end)
+                writer.trailer = f.read()
+            digits = re.match(rb'\d+', writer.headerStrings[0])
+            writer.trailerOffset = digits is not None and int(digits.group()) == end
+        return writer
+
+    def add(self, channel=None, data=None, length: int = None, precision: int = None, limits=None, **fields):
+        """Adds a channel.
+
+        Args:
+            channel (Channel): Channel whose header (and data) is written. If None,
+                a new channel is created, its name and unit are set with fields.
+            data (np.ndarray | Iterable[np.ndarray]): The data, an array or chunks
+                of it (e.g. from a generator). Defaults to the data of channel, which
+                is read from its file chunk by chunk if it is not loaded.
+            length (int): Amount of samples, required if data is an iterable.
+            precision (int): Bytes per sample (2, 4 or 8). Defaults to the precision
+                of channel, 8 for new channels.
+            limits (tuple[float, float]): Minimum and maximum value of 2-byte channels.
+                Computed from the data if it is an array, required for iterables.
+                Unsigned 16-bit integers are written as they are (the raw samples).
+            **fields: Attributes of the header (e.g. Name, unit, comment, num) or
+                fields of the extended header (e.g. dt in ms, T0) to set.
+
+        Returns:
+            dict: The header of the channel, which can still be changed.
+        """
+        if channel is None and data is None:
+            raise ValueError('Either a channel or data has to be given.')
+
+        if channel is not None:
+            header = {
+                'num': channel.num, 'Name': channel.Name, 'unit': channel.unit, 'comment': channel.comment,
+                'format': channel.format, 'dw': channel.dw, 'time': channel.time,
+                'extHeader': copy.deepcopy(channel.extHeader),
+                'extHeaderBytes': getattr(channel, 'extHeaderBytes', None),
+                'lmode': channel.lmode, 'scale': channel.scale,
+                'linPoints': list(getattr(channel, 'linPoints', [])),
+                'thermoType': getattr(channel, 'thermoType', 0),
+                'formula': channel.formula, 'sensorInfo': channel.sensorInfo,
+                'rawStrings': dict(getattr(channel, 'rawStrings', {})),
+                'precision': channel.precision, 'length': channel.length,
+            }
+        else:
+            T0 = serial_day(time.time())
+            header = {
+                'num': len(self.channels) + 1, 'Name': f'Channel {len(self.channels) + 1}', 'unit': '',\
+                'comment': '', 'format': 0, 'dw': 8, 'time': T0,
+                'extHeader': default_ext_header(fields.pop('dt', 1.0), T0), 'extHeaderBytes': None,
+                'lmode': '\x00', 'scale': '\x00', 'linPoints': [], 'thermoType': 0,
+                'formula': '', 'sensorInfo': '', 'rawStrings': {}, 'precision': 8, 'length': None,
+            }
+
+        for key, value in fields.items():
+            if key in header:
+                header[key] = value
+            elif key in header['extHeader']:
+                header['extHeader'][key] = value
+            else:
+                raise KeyError(f'Unknown field "{key}" of the channel header.')
+
+        if precision is not None:
+            header['precision'] = precision
+        if header['precision'] not in EXPORT_FORMATS:
+            raise ValueError(f'precision has to be 2, 4 or 8, got {header["precision"]}.')
+
+        if data is not None:
+            if isinstance(data, np.ndarray):
+                header['length'] = len(data)
+            elif length is None:
+                raise ValueError('The length has to be given, if the data is an iterable.')
+        if length is not None:
+            header['length'] = length
+
+        if header['precision'] == 2 and limits is None:
+            limits = self._limits(channel, data)
+        header['limits'] = limits
+        header['channel'] = channel
+        header['data'] = data
+        self.channels.append(header)
+        return header
+
+    def _limits(self, channel, data):
+        """Minimum and maximum value of a 2-byte channel."""
+        if isinstance(data, np.ndarray):
+            if data.dtype == np.uint16:
+                raise ValueError('The limits of raw 2-byte samples have to be given.')
+            if len(data) == 0:
+                return (0.0, 0.0)
+            return (float(np.nanmin(data)), float(np.nanmax(data)))
+        if data is None and channel.precision == 2:
+            return channel.readLimits()
+        if data is None:
+            values = channel.data
+            return (float(np.nanmin(values)), float(np.nanmax(values))) if len(values) > 0 else (0.0, 0.0)
+        raise ValueError('The limits of 2-byte channels have to be given, if the data is an iterable.')
+
+    def _chunks(self, header: dict) -> Iterator[np.ndarray]:
+        """The data of a channel in chunks."""
+        data, channel = header['data'], header['channel']
+        if data is None:
+            # the samples of the file are copied unchanged, if the precision is kept
+            if channel.dataOffset is not None or channel.raw is not None:
+                return channel.iter_chunks(CHUNK_SAMPLES, raw=header['precision'] == channel.precision)
+            data = channel.data
+
+        if isinstance(data, np.ndarray):
+            return (data[i:i + CHUNK_SAMPLES] for i in range(0, len(data), CHUNK_SAMPLES))
+        return (np.asarray(x) for x in data)
+
+    @staticmethod
+    def _encode(chunk: np.ndarray, precision: int, limits) -> np.ndarray:
+        """Converts a chunk into the samples of the file."""
+        if precision != 2:
+            return chunk.astype(np.dtype(f'f{precision}'), copy=False)
+        if chunk.dtype == np.uint16:
+            return chunk
+        MinValue, MaxValue = limits
+        sf = (MaxValue - MinValue)/32767 # scale factor
+        if sf == 0:
+            return np.zeros(len(chunk), np.dtype('u2'))
+        return np.clip(np.rint((chunk - MinValue) / sf), 0, 32767).astype(np.dtype('u2'))
+
+    def _ext_header(self, header: dict) -> bytes:
+        """Packs the extended header, unchanged fields keep their original bytes."""
+        original = header['extHeaderBytes']
+        if original is not None and len(original) != EXT_HEADER.size:
+            # the header could not be parsed, it is written as it was read
+            return original
+
+        exthdr = dict(header['extHeader'])
+        precisions = {value: key for key, value in EXPORT_FORMATS.items()}
+        if precisions.get(exthdr['ExportFormat'], 8) != header['precision']:
+            exthdr['ExportFormat'] = EXPORT_FORMATS[header['precision']]
+
+        values = []
+        for key in EXT_HEADER_KEYS:
+            if key == 'InChar':
+                values.extend(exthdr[key])
+            elif key in EXT_HEADER_STRINGS:
+                raw = None if original is None else EXT_HEADER.unpack(original)[EXT_HEADER_STRINGS[key]]
+                values.append(encode_string(exthdr[key], raw))
+            else:
+                values.append(exthdr[key])
+
+        packed = bytearray(EXT_HEADER.pack(*values))
+        if original is not None:
+            for start, end in EXT_HEADER_PADDING:
+                packed[start:end] = original[start:end]
+        return bytes(packed)
+
+    def _channel_header(self, header: dict) -> bytes:
+        """Packs the header of a channel (see Channel.__init__)."""
+        raw = header['rawStrings']
+        def string(key, prefix='=h'):
+            value = encode_string(header[key], raw.get(key))
+            return struct.pack(prefix, len(value)) + value
+
+        ext = self._ext_header(header)
+        points = header['linPoints']
+        return b''.join([
+            struct.pack('=hi', header['num'], header['length']),
+            string('Name'), string('unit'), string('comment'),
+            struct.pack('=' + CHANNEL_INFO_FORMAT, header['format'], header['dw'], header['time'], len(ext)),
+            ext,
+            struct.pack('=' + CHANNEL_LIN_FORMAT, header['lmode'].encode('ascii'),\
+                header['scale'].encode('ascii'), len(points)),
+            struct.pack(f'={len(points)}d', *points),
+            struct.pack('=h', header['thermoType']),
+            string('formula'), string('sensorInfo', '=i'),
+        ])
+
+    def _file_header(self, headers: List[bytes], headerStrings: List[bytes]) -> bytes:
+        """Packs the file header up to the first channel, including the channel offsets."""
+        comment = encode_string(self.comment, self.rawStrings.get('comment'))
+        start = b''.join([struct.pack('=h', len(comment)), comment]\
+            + [struct.pack('=h', len(x)) + x for x in headerStrings])
+        # file ID and data offset, the strings, channel count, maximum length, offsets, reduced factor
+        pos = 6 + len(start) + 6 + 4 * len(headers) + 4
+        offsets = []
+        for header in headers:
+            # the offsets point behind the channel number
+            offsets.append(pos + 2)
+            pos += len(header)
+        return start + struct.pack(f'=hi{len(headers)}ii', len(headers), self.maxLength, *offsets,\
+            self.reducedFactor)
+
+    def write(self, path: str) -> str:
+        """Writes the file.
+
+        The data of every channel is converted and written chunk by chunk, so
+        only one chunk is held in memory.
+
+        Args:
+            path (str): The output file.
+
+        Returns:
+            str: The path of the file.
+        """
+        for header in self.channels:
+            if header['length'] is None:
+                raise ValueError(f'The length of channel "{header["Name"]}" is unknown.')
+        headers = [self._channel_header(x) for x in self.channels]
+        dataSize = sum(x['length'] * x['precision'] + (16 if x['precision'] == 2 else 0) for x in self.channels)
+
+        headerStrings = list(self.headerStrings)
+        # the offset of the trailer changes with the size of the header (and vice versa)
+        while True:
+            start = self._file_header(headers, headerStrings)
+            dataOffset = max(self.dataOffset, 6 + len(start) + sum(len(x) for x in headers))
+            if not self.trailerOffset:
+                break
+            end = str(dataOffset + dataSize).encode('ascii')
+            first = re.sub(rb'^\d+', end, self.headerStrings[0])
+            if first == headerStrings[0]:
+                break
+            headerStrings[0] = first
+
+        with open(path, 'wb') as f:
+            f.write(struct.pack('=hi', self.fileID, dataOffset))
+            f.write(start)
+            for header in headers:
+                f.write(header)
+            f.write(b'\x00' * (dataOffset - f.tell()))
+
+            for header in self.channels:
+                self._write_data(f, header)
+            f.write(self.trailer)
+        return path
+
+    def _write_data(self, f, header: dict):
+        """Writes the data block of a channel."""
+        precision, limits = header['precision'], header['limits']
+        if precision == 2:
+            f.write(struct.pack('=dd', *limits))
+
+        written = 0
+        for chunk in self._chunks(header):
+            samples = self._encode(chunk, precision, limits)
+            written += len(samples)
+            if written > header['length']:
+                break
+            f.write(samples.tobytes())
+
+        if written != header['length']:
+            raise ValueError(f'Channel "{header["Name"]}" has {written} samples instead of {header["length"]}.')
@@ -26,6 +26,13 @@ setup(
         "Programming Language :: Python :: 3.9",
     ],
     packages=['apread'],
-    install_requires=['matplotlib', 'typing', 'tqdm'],
+    install_requires=['numpy', 'typing'],
+    extras_require={
+        'plot': ['matplotlib'],
+        'progress': ['tqdm'],
+        'export': ['pyarrow', 'h5py'],
+        'pandas': ['pandas'],
+        'polars': ['polars'],
+    },
     include_package_data=True,
 )
\ No newline at end of file
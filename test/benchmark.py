@@ -0,0 +1,247 @@
+"""
+Benchmarks of apread on synthetic files (see synthetic.py).
+
+Every case runs in a new interpreter, which reports the time of every run and
+its peak memory (RSS). The results are saved as JSON, pass an earlier result
+with --compare to find regressions between versions.
+
+Cases:
+    header     parse the headers only (lazy=True)
+    read       read the whole file
+    workers    read the whole file with one thread per CPU
+    mmap       map the file and access all channels
+    chunks     read all channels chunk by chunk (iter_chunks)
+    slice      read a window of 1% of the time of every group
+    connect    group the channels and find the time channels
+    import     import apread (see benchmark_import.py)
+
+    python test/benchmark.py --sizes 10MB,100MB,2GB --precision 4 --output before.json
+    python test/benchmark.py --sizes 10MB,100MB,2GB --precision 4 --compare before.json
+    python test/benchmark.py --sizes 10MB --channels 10000 --groups 5000 --cases header,connect
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# the generator writes the files with apread, which may not be installed
+sys.path.insert(0, ROOT)
+
+import benchmark_import
+import synthetic
+
+CASES = ['header', 'read', 'workers', 'mmap', 'chunks', 'slice', 'connect', 'import']
+# cases that read the whole file, their throughput is reported
+FULL_READ = {'read', 'workers', 'mmap', 'chunks'}
+UNITS = {'KB': 2**10, 'MB': 2**20, 'GB': 2**30}
+
+# runs one case in a new interpreter, prints the timings and the peak RSS as json
+CHILD = '''
+import json, os, sys, time
+import numpy as np
+from apread import APReader
+
+def peak_rss():
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def header(path):
+    APReader(path, lazy=True)
+
+def read(path):
+    APReader(path)
+
+def workers(path):
+    APReader(path, workers=os.cpu_count())
+
+def mmap(path):
+    reader = APReader(path, mmap=True, lazy=True)
+    for channel in reader.Channels:
+        channel.data.sum()
+
+def chunks(path):
+    reader = APReader(path, lazy=True)
+    for channel in reader.Channels:
+        for chunk in channel.iter_chunks(1_000_000):
+            pass
+
+def slice(path):
+    reader = APReader(path, lazy=True)
+    for group in reader.Groups:
+        time = group.ChannelX
+        t0, t1 = time.readRange(0, 1)[0], time.readRange(time.length - 1, time.length)[0]
+        mid = (t0 + t1) / 2
+        group.slice(mid, mid + (t1 - t0) / 100)
+
+def connect(path, reader=None):
+    reader.Groups = []
+    reader.unresolved = []
+    reader.connect()
+
+case, path, runs = sys.argv[1], sys.argv[2], int(sys.argv[3])
+func = globals()[case]
+kwargs = {}
+times = []
+base = peak_rss()
+for i in range(runs):
+    if case == 'connect':
+        kwargs['reader'] = APReader(path, lazy=True)
+    t0 = time.perf_counter()
+    func(path, **kwargs)
+    times.append(time.perf_counter() - t0)
+print(json.dumps({'times': times, 'peak_rss': peak_rss(), 'base_rss': base}))
+'''
+
+
+def parse_size(text: str) -> int:
+    """Parses sizes like '100MB' or '2GB' (bytes)."""
+    text = text.strip().upper()
+    for unit, factor in UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+def version() -> str:
+    """The git revision of the repository (or 'unknown')."""
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=ROOT,\
+            capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def synthetic_file(folder: str, size: int, channels: int, precision: int, groups: int) -> str:
+    """A synthetic file of about size bytes, generated only once."""
+    samples = max(size // (channels * precision), 2)
+    path = os.path.join(folder, f'synthetic_{size}_{channels}ch_{precision}b_{groups}g.bin')
+    if not os.path.exists(path):
+        print(f'generating {path}...', file=sys.stderr)
+        synthetic.generate(path + '.tmp', channels, samples, precision, groups)
+        os.replace(path + '.tmp', path)
+    return path
+
+def run_case(case: str, path: str, runs: int) -> dict:
+    """Runs a case in a new interpreter."""
+    env = dict(os.environ, PYTHONPATH=ROOT + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    out = subprocess.run([sys.executable, '-c', CHILD, case, path, str(runs)],\
+        capture_output=True, text=True, env=env, check=True).stdout
+    # the last line is the result (progress bars go to stderr)
+    return json.loads(out.strip().splitlines()[-1])
+
+def summarize(case: str, size: str, path: str, measured: dict, settings: dict) -> dict:
+    """The median and minimum time, throughput and memory of a case."""
+    times = measured['times']
+    median = statistics.median(times)
+    file_size = os.path.getsize(path)
+    result = {
+        'case': case,
+        'size': size,
+        **settings,
+        'file_mb': file_size / 2**20,
+        'median_s': median,
+        'min_s': min(times),
+        'mb_s': file_size / 2**20 / median if case in FULL_READ and median > 0 else None,
+        'peak_rss_mb': measured['peak_rss'] / 2**20 if measured['peak_rss'] is not None else None,
+    }
+    if measured['peak_rss'] is not None and measured['base_rss'] is not None:
+        result['rss_increase_mb'] = (measured['peak_rss'] - measured['base_rss']) / 2**20
+    return result
+
+def key(result: dict) -> tuple:
+    """Identifies a result, only results of the same case and file are compared."""
+    return tuple(result.get(x) for x in ['case', 'size', 'channels', 'precision', 'groups'])
+
+def compare(results: list, previous: dict, threshold: float) -> list:
+    """Compares the median times with an earlier result.
+
+    Returns:
+        list[str]: The regressions (cases that are slower by more than threshold).
+    """
+    before = {key(x): x for x in previous['results']}
+    regressions = []
+    print(f"\ncompared to {previous['version']} ({previous['date']}):")
+    for x in results:
+        old = before.get(key(x))
+        if old is None:
+            continue
+        ratio = x['median_s'] / old['median_s'] if old['median_s'] > 0 else 1.0
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(f"{x['case']} ({x['size']}): {ratio:.2f}x slower")
+        print(f"{x['case']:8} {x['size']:>8} {old['median_s']*1000:10.2f} ms -> {x['median_s']*1000:10.2f} ms"\
+            f" ({ratio:5.2f}x){flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks apread on synthetic files.')
+    parser.add_argument('--sizes', default='10MB,100MB', help='file sizes, e.g. 10MB,1GB,4GB')
+    parser.add_argument('--channels', type=int, default=16)
+    parser.add_argument('--precision', type=int, default=4, choices=[2, 4, 8])
+    parser.add_argument('--groups', type=int, default=2)
+    parser.add_argument('--cases', default=','.join(CASES))
+    parser.add_argument('--runs', type=int, default=5, help='runs per case')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'apread-benchmark'),\
+        help='folder of the generated files (they are reused)')
+    parser.add_argument('--output', help='json file for the results')
+    parser.add_argument('--compare', help='json file of an earlier run')
+    parser.add_argument('--threshold', type=float, default=0.2,\
+        help='relative slowdown that counts as regression')
+    args = parser.parse_args()
+    cases = args.cases.split(',')
+    unknown = [x for x in cases if x not in CASES]
+    if unknown:
+        parser.error(f'unknown cases {", ".join(unknown)}, use {",".join(CASES)}')
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    settings = {'channels': args.channels, 'precision': args.precision, 'groups': args.groups}
+    results = []
+    print(f"{'case':8} {'size':>8} {'median':>12} {'MB/s':>10} {'peak RSS':>12}")
+    # the import doesn't depend on the file, it is measured once below
+    files = [x for x in cases if x != 'import']
+    for size in (args.sizes.split(',') if files else []):
+        path = synthetic_file(args.data_dir, parse_size(size), args.channels, args.precision, args.groups)
+        for case in files:
+            result = summarize(case, size, path, run_case(case, path, args.runs), settings)
+            results.append(result)
+            mbs = f"{result['mb_s']:10.1f}" if result['mb_s'] is not None else f"{'-':>10}"
+            rss = f"{result['peak_rss_mb']:9.1f} MB" if result['peak_rss_mb'] is not None else f"{'-':>12}"
+            print(f"{case:8} {size:>8} {result['median_s']*1000:9.2f} ms {mbs} {rss}")
+
+    if 'import' in cases:
+        imports = [benchmark_import.measure()['apread'] for _ in range(args.runs)]
+        results.append({'case': 'import', 'size': '-', 'median_s': statistics.median(imports), 'min_s': min(imports)})
+        print(f"{'import':8} {'-':>8} {results[-1]['median_s']*1000:9.2f} ms")
+
+    report = {
+        'version': version(),
+        'date': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'settings': dict(settings, runs=args.runs),
+        'results': results,
+    }
+    output = args.output or f"benchmark-{report['version']}.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'\nresults saved to {output}')
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            sys.exit('regressions:\n' + '\n'.join(regressions))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Measures the time of 'import apread' in a fresh interpreter.
+
+Parsing must only need numpy and the standard library, so importing apread
+must not import matplotlib, tqdm or the export backends. The script fails if
+one of them is imported or if apread adds more than LIMIT seconds on top of
+numpy.
+
+    python test/benchmark_import.py [runs]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# modules that may only be imported when they are used
+FORBIDDEN = ['matplotlib', 'tqdm', 'pyarrow', 'h5py', 'pandas', 'polars']
+# maximum time that apread may add to the import of numpy (seconds)
+LIMIT = 0.15
+
+MEASURE = '''
+import sys, time, json
+t0 = time.perf_counter()
+import numpy
+t1 = time.perf_counter()
+import {module}
+t2 = time.perf_counter()
+print(json.dumps({{'numpy': t1 - t0, 'apread': t2 - t1, 'modules': list(sys.modules)}}))
+'''
+
+def measure(module='apread'):
+    """Imports the module in a new interpreter and returns the timings and imported modules."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    out = subprocess.run([sys.executable, '-c', MEASURE.format(module=module)],\
+        capture_output=True, text=True, env=env, check=True).stdout
+    return json.loads(out)
+
+def test_import_time(runs=10):
+    results = [measure() for _ in range(runs)]
+
+    imported = {m.split('.')[0] for m in results[0]['modules']}
+    heavy = [m for m in FORBIDDEN if m in imported]
+    assert not heavy, f'import apread imports {", ".join(heavy)}'
+
+    numpy_time = statistics.median(x['numpy'] for x in results)
+    apread_time = statistics.median(x['apread'] for x in results)
+    print(f'import numpy:  {numpy_time*1000:8.1f} ms')
+    print(f'import apread: {apread_time*1000:8.1f} ms (on top of numpy, median of {runs})')
+    assert apread_time < LIMIT, f'import apread takes {apread_time:.3f}s, limit is {LIMIT}s'
+    return apread_time
+
+if __name__ == '__main__':
+    test_import_time(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,98 @@
+"""
+Generates synthetic catmanAP binary files for tests and benchmarks.
+
+Every group gets a time channel ('Time', in s) followed by data channels
+(sine waves with noise). Groups are told apart by their length, like in files
+written by catman. The data is written in chunks, so files of several GB can be
+generated with little memory.
+
+    python test/synthetic.py out.bin --channels 16 --samples 1000000 --precision 4 --groups 2
+"""
+import argparse
+
+import numpy as np
+
+from apread.writer import APWriter
+
+# samples that are generated and written at once
+CHUNK = 1_000_000
+# T0 of all channels (serial day, 2022-04-12 13:30)
+T0 = 44663.5625
+
+
+def layout(channels: int, samples: int, groups) -> list:
+    """Splits the channels into groups.
+
+    Args:
+        channels (int): Total amount of channels (including the time channels).
+        samples (int): Samples per channel of the first group.
+        groups (int | list): Amount of groups, or a list of (channels, samples)
+            or (channels, samples, dt) per group.
+
+    Returns:
+        list[tuple]: Channels (including the time channel), samples and optionally
+            the sample interval of every group.
+    """
+    if not isinstance(groups, int):
+        return [(int(x[0]), int(x[1])) + tuple(x[2:]) for x in groups]
+
+    groups = max(min(groups, channels // 2), 1)
+    sizes = [channels // groups] * groups
+    for i in range(channels % groups):
+        sizes[i] += 1
+    # the length identifies a group, so every group needs another one
+    return [(n, samples + i) for i, n in enumerate(sizes)]
+
+def chunks(index: int, length: int, dt: float, rng: np.random.Generator):
+    """Values of a channel in chunks, index 0 is the time channel."""
+    for start in range(0, length, CHUNK):
+        t = np.arange(start, min(start + CHUNK, length)) * (dt / 1000)
+        if index == 0:
+            yield t
+        else:
+            yield np.sin(2 * np.pi * index * t) * index + rng.normal(0, 0.01, len(t))
+
+def generate(path: str, channels: int = 10, samples: int = 100_000, precision: int = 8,\
+        groups=1, dt: float = 1.0, seed: int = 0) -> str:
+    """Writes a synthetic catmanAP binary file.
+
+    Args:
+        path (str): Output file.
+        channels (int): Total amount of channels, including one time channel per group.
+        samples (int): Samples per channel.
+        precision (int): Bytes per sample (2, 4 or 8).
+        groups (int | list): Amount of groups or a list of (channels, samples) per
+            group, see layout.
+        dt (float): Sample interval in ms (of groups without their own).
+        seed (int): Seed of the noise.
+
+    Returns:
+        str: The path of the file.
+    """
+    rng = np.random.default_rng(seed)
+    writer = APWriter(comment='synthetic')
+
+    for g, (n, length, *interval) in enumerate(layout(channels, samples, groups)):
+        rate = interval[0] if interval else dt
+        for i in range(n):
+            if i == 0:
+                name, unit = 'Time' if g == 0 else f'Time {g + 1}', 's'
+                # 2-byte channels are scaled between a minimum and maximum value
+                limits = (0.0, max(length - 1, 1) * rate / 1000)
+            else:
+                name, unit = f'Channel {g + 1}.{i}', 'V'
+                limits = (-1.1 * i, 1.1 * i)
+            writer.add(data=chunks(i, length, rate, rng), length=length, precision=precision,\
+                limits=limits, Name=name, unit=unit, dt=rate, T0=T0, time=T0)
+    return writer.write(path)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generates a synthetic catmanAP binary file.')
+    parser.add_argument('path')
+    parser.add_argument('--channels', type=int, default=10)
+    parser.add_argument('--samples', type=int, default=100_000)
+    parser.add_argument('--precision', type=int, default=8, choices=[2, 4, 8])
+    parser.add_argument('--groups', type=int, default=1)
+    parser.add_argument('--dt', type=float, default=1.0, help='sample interval in ms')
+    args = parser.parse_args()
+    generate(args.path, args.channels, args.samples, args.precision, args.groups, args.dt)
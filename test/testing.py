@@ -1,10 +1,9 @@
 from datetime import datetime
 from apread.apreader import APReader
 import os
-import multiprocessing as mp
 
 if __name__ == '__main__':
-    pool = None # default value, do not change
+    workers = None # default value, do not change
 
     # find current directory
     dirname = os.path.dirname(__file__)
@@ -17,29 +16,18 @@ if __name__ == '__main__':
     speedTest = False
     
     if loadInParallel:
-        pool = mp.Pool()        
+        workers = os.cpu_count()
     
-    # t0 = datetime.now()
-    # # create a reader
-    # for i in range(1,1000):
-    #     reader = APReader(file, parallelPool=pool)
-
-    # t1 = datetime.now()
-    
-    # print(t1-t0)
-
+    # see benchmark.py for benchmarks on larger (synthetic) files
     t0 = datetime.now()
     # create a reader
     for i in range(1,1000 if speedTest else 1):
-        reader = APReader(file, parallelPool=pool)
+        reader = APReader(file, workers=workers)
 
     t1 = datetime.now()
     
     print(t1-t0)
 
-    if loadInParallel:
-        pool.close()
-        pool.join()
     ## print all single channels
     #for channel in reader.Channels:    
     #    print (f"{channel.Name}: {len(channel.data)} Entries")
@@ -82,4 +70,754 @@ def test2():
     # ALTERNATIV (alle channels in der bin Datei):
     for channel in reader.Channels:
         print(channel.data)
-        
\ No newline at end of file
+        
+def read_ext_header_fields(rdr):
+    """Reference parser: reads the extended header field by field."""
+    exthdr = {}
+    exthdr['T0'] = rdr.read_double()
+    exthdr['dt'] = rdr.read_double()
+    exthdr['SensorType'] = rdr.read_int16()
+    exthdr['SupplyVoltage'] = rdr.read_int16()
+    exthdr['FiltChar'] = rdr.read_int16()
+    exthdr['FiltFreq'] = rdr.read_int16()
+    exthdr['TareVal'] = rdr.read_float()
+    exthdr['ZeroVal'] = rdr.read_float()
+    exthdr['MeasRange'] = rdr.read_float()
+    exthdr['InChar'] = [rdr.read_float() for i in range(4)]
+    exthdr['SerNo'] = rdr.read_string(32)
+    exthdr['PhysUnit'] = rdr.read_string(8)
+    exthdr['NativeUnit'] = rdr.read_string(8)
+    exthdr['Slot'] = rdr.read_int16()
+    exthdr['SubSlot'] = rdr.read_int16()
+    exthdr['AmpType'] = rdr.read_int16()
+    exthdr['APType'] = rdr.read_int16()
+    exthdr['kFactor'] = rdr.read_float()
+    exthdr['bFactor'] = rdr.read_float()
+    exthdr['MeasSig'] = rdr.read_int16()
+    exthdr['AmpInput'] = rdr.read_int16()
+    exthdr['HPFilt'] = rdr.read_int16()
+    exthdr['OLImportInfo'] = rdr.read_byte()
+    exthdr['ScaleType'] = rdr.read_byte()
+    exthdr['SoftwareTareVal'] = rdr.read_float()
+    exthdr['WriteProtected'] = rdr.read_byte()
+    rdr.read_string(3)
+    exthdr['NominalRange'] = rdr.read_float()
+    exthdr['CLCFactor'] = rdr.read_float()
+    exthdr['ExportFormat'] = rdr.read_byte()
+    rdr.read_string(7)
+    return exthdr
+
+def read_headers_fields(file):
+    """Reference parser: reads all channel headers of a file field by field."""
+    from apread.binaryReader import BinaryReader
+
+    channels = []
+    with open(file, 'rb') as f:
+        rdr = BinaryReader(f)
+        rdr.read_int16()
+        rdr.read_int32()
+        rdr.read_string(rdr.read_int16())
+        for i in range(32):
+            rdr.read_string(rdr.read_int16())
+        numChannels = rdr.read_int16()
+        rdr.read_int32()
+        for i in range(numChannels):
+            rdr.read_int32()
+        rdr.read_int32()
+
+        for i in range(numChannels):
+            chan = {}
+            chan['num'] = rdr.read_int16()
+            chan['length'] = rdr.read_int32()
+            chan['Name'] = rdr.read_string(rdr.read_int16())
+            chan['unit'] = rdr.read_string(rdr.read_int16())
+            chan['comment'] = rdr.read_string(rdr.read_int16())
+            chan['format'] = rdr.read_int16()
+            chan['dw'] = rdr.read_int16()
+            chan['time'] = rdr.read_double()
+            chan['nHdrBytes'] = rdr.read_int32()
+            chan['extHeader'] = read_ext_header_fields(rdr)
+            chan['lmode'] = rdr.read_char()
+            chan['scale'] = rdr.read_char()
+            chan['npoi'] = rdr.read_byte()
+            for j in range(chan['npoi']):
+                rdr.read_double()
+            rdr.read_int16()
+            chan['formula'] = rdr.read_string(rdr.read_int16())
+            chan['sensorInfo'] = rdr.read_string(rdr.read_int32())
+            channels.append(chan)
+    return channels
+
+def test_header_equivalence():
+    """The batched header decoding has to match the field by field parser."""
+    dirname = os.path.dirname(__file__)
+    for name in ['2byteJob1_2022_04_12_13_32_10.bin', '4byteJob1_2022_04_12_13_31_47.bin',
+                 '8byteJob1_2022_04_12_13_31_23.bin']:
+        file = os.path.join(dirname, name)
+        reader = APReader(file, lazy=True)
+        expected = [x for x in read_headers_fields(file) if x['length'] > 0]
+
+        assert len(reader.Channels) == len(expected)
+        for channel, fields in zip(reader.Channels, expected):
+            for key, value in fields.items():
+                assert getattr(channel, key) == value, f'{name}: {channel.Name}.{key}'
+
+def test_synthetic():
+    """Synthetic files (see synthetic.py) are read with the expected groups and data."""
+    import tempfile
+    import numpy as np
+    import synthetic
+
+    with tempfile.TemporaryDirectory() as folder:
+        for precision in [2, 4, 8]:
+            file = synthetic.generate(os.path.join(folder, f'{precision}.bin'), channels=7,\
+                samples=5000, precision=precision, groups=2, dt=0.5)
+            reader = APReader(file)
+            assert len(reader.Channels) == 7
+            assert [len(x.ChannelsY) for x in reader.Groups] == [3, 2]
+            for group in reader.Groups:
+                time = group.ChannelX.data
+                assert abs(time[-1] - (len(time) - 1) * 0.0005) < 1e-3
+                assert np.all(np.diff(time) >= 0)
+
+def test_writer_roundtrip():
+    """Files written by APWriter from a reader are identical to the original, byte by byte."""
+    import tempfile
+    from apread.writer import APWriter
+
+    dirname = os.path.dirname(__file__)
+    with tempfile.TemporaryDirectory() as folder:
+        for name in ['2byteJob1_2022_04_12_13_32_10.bin', '4byteJob1_2022_04_12_13_31_47.bin',
+                     '8byteJob1_2022_04_12_13_31_23.bin', 'Example_Catman_Data.bin']:
+            file = os.path.join(dirname, name)
+            with open(file, 'rb') as f:
+                original = f.read()
+            # the data is copied from the file (lazy) or from memory
+            for kwargs in [{'lazy': True}, {}, {'raw': True}]:
+                copy = APWriter.from_reader(APReader(file, **kwargs)).write(os.path.join(folder, name))
+                with open(copy, 'rb') as f:
+                    assert f.read() == original, f'{name}: {kwargs}'
+
+def test_catalog():
+    """The catalog finds the same channels as a scan over all channels."""
+    dirname = os.path.dirname(__file__)
+    reader = APReader(os.path.join(dirname, 'Example_Catman_Data.bin'), lazy=True)
+    catalog = reader.catalog
+
+    assert len(catalog) == len(reader.Channels)
+    assert catalog.find('*') == reader.Channels
+    assert catalog.find('does not exist') == []
+    for channel in reader.Channels:
+        assert catalog[channel.Name] is [x for x in reader.Channels if x.Name == channel.Name][0]
+        assert catalog.byUnit(channel.unit) == [x for x in reader.Channels if x.unit == channel.unit]
+        assert catalog.byFullName(channel.fullName) is channel
+    for group in reader.Groups:
+        assert catalog.byGroup(group) == group.Channels
+        assert all(catalog.groupOf(x) is group for x in group.Channels)
+    assert catalog.find('^T', regex=True) == catalog.find('T*')
+    assert catalog.query(unit='s') == [x for x in reader.Channels if x.unit == 's']
+
+def test_group_by():
+    """Channels of the same length but another sample interval form their own group with group_by='rate'."""
+    import tempfile
+    import synthetic
+
+    with tempfile.TemporaryDirectory() as folder:
+        file = synthetic.generate(os.path.join(folder, 'rates.bin'), precision=4,\
+            groups=[(3, 1000, 1.0), (2, 1000, 0.5), (2, 500)])
+        assert [len(x.Channels) for x in APReader(file).Groups] == [5, 2]
+        for group_by in ['rate', 'start', lambda x: (x.length, x.extHeader['dt'] > 0.75)]:
+            reader = APReader(file, group_by=group_by)
+            assert [len(x.Channels) for x in reader.Groups] == [3, 2, 2]
+            assert [x.ChannelX.Name for x in reader.Groups] == ['Time', 'Time 2', 'Time 3']
+
+def test_async():
+    """aopen reads the same data as APReader, channels and groups load without blocking."""
+    import asyncio
+    import numpy as np
+    import apread
+
+    dirname = os.path.dirname(__file__)
+    files = [os.path.join(dirname, x) for x in ['2byteJob1_2022_04_12_13_32_10.bin', 'Example_Catman_Data.bin']]
+
+    async def main():
+        for file in files:
+            expected = APReader(file)
+            reader = await apread.aopen(file)
+            for channel, other in zip(reader.Channels, expected.Channels):
+                assert np.array_equal(channel.data, other.data)
+
+            reader = await apread.aopen(file, contiguous=True, metrics=True)
+            assert set(reader.metrics.phases) == {'header', 'connect', 'data'}
+            for group, other in zip(reader.Groups, expected.Groups):
+                assert group.array is not None
+                for column, (channel, data) in enumerate(zip(group.ChannelsY, other.ChannelsY)):
+                    assert np.shares_memory(channel.data, group.array)
+                    assert np.array_equal(group.array[:, column], data.data.astype(group.array.dtype))
+
+            lazy = await apread.aopen(file, lazy=True)
+            assert np.array_equal(await lazy.Channels[1].aload(), expected.Channels[1].data)
+            time = expected.Groups[0].ChannelX.data
+            sliced = await lazy.Groups[0].aslice(time[10], time[20])
+            assert len(sliced.ChannelX.data) == 11
+
+        results = [x async for x in apread.aopen_many(files + ['missing.bin'], limit=2)]
+        assert sorted(error is None for _, _, error in results) == [False, True, True]
+
+    asyncio.run(main())
+
+def test_stats():
+    """Streamed statistics match numpy on the loaded data, lazy channels stay unloaded."""
+    import numpy as np
+
+    dirname = os.path.dirname(__file__)
+    for name in ['2byteJob1_2022_04_12_13_32_10.bin', '4byteJob1_2022_04_12_13_31_47.bin', 'Example_Catman_Data.bin']:
+        file = os.path.join(dirname, name)
+        expected = APReader(file)
+        reader = APReader(file, lazy=True)
+        stats = reader.stats()
+        assert not any(x.isLoaded for x in reader.Channels)
+        for channel in expected.Channels:
+            data = channel.data.astype(np.float64)
+            result = stats[channel.Name]
+            assert result.count == len(data) and result.nans == 0
+            assert np.allclose([result.min, result.max, result.mean, result.std, result.rms],\
+                [data.min(), data.max(), data.mean(), data.std(), np.sqrt(np.mean(data**2))])
+        # the results are kept
+        assert reader.stats()[reader.Channels[0].Name] is stats[reader.Channels[0].Name]
+
+def test_align():
+    """Channels of groups with different rates are resampled like np.interp."""
+    import tempfile
+    import numpy as np
+    import synthetic
+
+    with tempfile.TemporaryDirectory() as folder:
+        file = synthetic.generate(os.path.join(folder, 'rates.bin'), groups=[(3, 2000, 1.0), (3, 700, 3.0)])
+        expected = APReader(file, group_by='rate')
+        reader = APReader(file, group_by='rate', lazy=True)
+        names = ['Channel 1.1', 'Channel 2.2']
+
+        time, values = reader.align(names, rate=500, samples_per_chunk=100)
+        assert values.shape == (len(time), 2)
+        assert not any(x.isLoaded for x in reader.Channels)
+        for column, name in enumerate(names):
+            channel = expected.catalog[name]
+            assert np.allclose(values[:, column], np.interp(time, channel.Time.data, channel.data))
+
+        time, values = reader.align(names, method='zoh', end=2.05)
+        assert np.isnan(values[time > 1.999, 0]).all() and not np.isnan(values[:, 1]).any()
+
+def test_contiguous():
+    """Data channels of contiguous groups are views of one array with the same data."""
+    import numpy as np
+
+    dirname = os.path.dirname(__file__)
+    for name in ['2byteJob1_2022_04_12_13_32_10.bin', '4byteJob1_2022_04_12_13_31_47.bin', 'Example_Catman_Data.bin']:
+        file = os.path.join(dirname, name)
+        expected = APReader(file)
+        for kwargs in [{}, {'workers': 2}, {'lazy': True}]:
+            group = APReader(file, contiguous=True, **kwargs).Groups[0]
+            array = group.to_array()
+            assert array.shape == (group.ChannelX.length, len(group.ChannelsY))
+            for column, (channel, other) in enumerate(zip(group.ChannelsY, expected.Groups[0].ChannelsY)):
+                assert np.shares_memory(channel.data, array)
+                assert np.array_equal(array[:, column], other.data.astype(array.dtype))
+            time, rows = group[10:20]
+            assert np.shares_memory(rows, array) and rows.shape == (10, array.shape[1])
+            assert np.shares_memory(group.records(), array)
+
+        # groups of other readers are only stored as one array on request
+        for kwargs in [{}, {'lazy': True}]:
+            group = APReader(file, **kwargs).Groups[0]
+            before = [x._data for x in group.ChannelsY]
+            time, rows = group[0:3]
+            assert group.array is None and isinstance(rows, list) and len(rows) == len(group.ChannelsY)
+            for channel, data, other in zip(group.ChannelsY, before, expected.Groups[0].ChannelsY):
+                assert channel._data is data or (data is None and channel._data.flags.c_contiguous)
+                assert channel.data.dtype == other.data.dtype
+
+def test_frames():
+    """DataFrames share the buffers of the channels and only read the selected window."""
+    import numpy as np
+
+    file = os.path.join(os.path.dirname(__file__), '4byteJob1_2022_04_12_13_31_47.bin')
+    group = APReader(file).Groups[0]
+    name = group.ChannelsY[0].Name
+
+    frame = group.to_pandas()
+    assert list(frame.columns) == [x.Name for x in group.ChannelsY]
+    assert np.shares_memory(frame.index.to_numpy(), group.ChannelX.data)
+    assert np.shares_memory(frame[name].to_numpy(), group.ChannelsY[0].data)
+    assert frame.attrs['units'][name] == group.ChannelsY[0].unit
+
+    t = group.ChannelX.data
+    frame = group.to_pandas([name], t[10], t[19], index=False)
+    assert list(frame.columns) == [group.ChannelX.Name, name] and len(frame) == 10
+
+    # lazy readers don't load the channels that are not selected
+    lazy = APReader(file, lazy=True)
+    frame = lazy.to_frames(channel_names=[name], t_start=t[10], t_end=t[19])[0]
+    assert np.array_equal(frame[name].to_numpy(), group.ChannelsY[0].data[10:20])
+    assert not any(x.isLoaded for x in lazy.Channels)
+
+    # open bounds on lazy readers
+    frame = lazy.to_frames(t_start=t[50])[0]
+    assert len(frame) == len(t) - 50 and np.array_equal(frame.index.to_numpy(), t[50:])
+    frame = APReader(file, lazy=True).Groups[0].to_pandas(t_end=t[50])
+    assert len(frame) == 51 and np.array_equal(frame[name].to_numpy(), group.ChannelsY[0].data[:51])
+
+    contiguous = APReader(file, contiguous=True).Groups[0]
+    assert np.shares_memory(contiguous.to_pandas(t_start=t[10]).to_numpy(), contiguous.array)
+
+    # channels with the same name are numbered
+    import tempfile
+    from apread.writer import APWriter
+    with tempfile.TemporaryDirectory() as folder:
+        writer = APWriter()
+        writer.add(data=np.arange(100) * 0.01, Name='Time', unit='s', dt=10.0)
+        writer.add(data=np.arange(100.0), Name='F', unit='kN')
+        writer.add(data=-np.arange(100.0), Name='F', unit='N')
+        duplicates = APReader(writer.write(os.path.join(folder, 'duplicates.bin'))).Groups[0]
+    frame = duplicates.to_pandas()
+    assert list(frame.columns) == ['F', 'F_1'] and frame.attrs['units'] == {'Time': 's', 'F': 'kN', 'F_1': 'N'}
+    assert np.array_equal(frame['F_1'].to_numpy(), duplicates.ChannelsY[1].data)
+
+    try:
+        import polars
+    except ImportError:
+        return
+    frame = duplicates.to_polars()
+    assert frame.columns == ['Time', 'F', 'F_1'] and np.array_equal(frame['F_1'].to_numpy(), duplicates.ChannelsY[1].data)
+    frame = APReader(file, lazy=True).Groups[0].to_polars([name], t_start=t[50])
+    assert len(frame) == len(t) - 50
+    frame = group.to_polars([name], t[10], t[19])
+    assert frame.columns == [group.ChannelX.Name, name]
+    assert np.array_equal(frame[name].to_numpy(), group.ChannelsY[0].data[10:20])
+
+def test_cache():
+    """Cached files are reused while they are unchanged, evicted by age and stored safely by many readers."""
+    import shutil
+    import tempfile
+    import numpy as np
+    from concurrent.futures import ThreadPoolExecutor
+    from apread.cache import FileCache
+
+    source = os.path.join(os.path.dirname(os.path.abspath(__file__)), '4byteJob1_2022_04_12_13_31_47.bin')
+    with tempfile.TemporaryDirectory() as folder:
+        file = shutil.copy(source, os.path.join(folder, 'file.bin'))
+        cache_dir = os.path.join(folder, 'cache')
+
+        # the second reader maps the data from the cache
+        first = APReader(file, cache_dir=cache_dir)
+        second = APReader(file, cache_dir=cache_dir)
+        for a, b in zip(first.Channels, second.Channels):
+            assert isinstance(b._data, np.memmap) and np.array_equal(a.data, b.data)
+        assert [x.Name for x in first.Groups] == [x.Name for x in second.Groups]
+
+        # a file cached under a relative path is found from another working directory,
+        # the data is read from the path given
+        cwd = os.getcwd()
+        try:
+            FileCache(cache_dir).clear()
+            os.chdir(os.path.dirname(folder))
+            APReader(os.path.join(os.path.basename(folder), 'file.bin'), cache_dir=cache_dir, lazy=True)
+            os.chdir(folder)
+            for path in [file, 'file.bin']:
+                reader = APReader(path, cache_dir=cache_dir, lazy=True)
+                assert reader.filepath == path and all(x.filePath == path for x in reader.Channels)
+                assert all(np.array_equal(a.data, b.data) for a, b in zip(first.Channels, reader.Channels))
+        finally:
+            os.chdir(cwd)
+
+        # changes of the modification time, size or header invalidate the entry
+        cache = FileCache(cache_dir)
+        stat = os.stat(file)
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.load(file) is None
+        APReader(file, cache_dir=cache_dir)
+        with open(file, 'ab') as f:
+            f.write(b'\0')
+        assert cache.load(file) is None
+        APReader(file, cache_dir=cache_dir)
+        stat = os.stat(file)
+        with open(file, 'r+b') as f:
+            content = f.read(4096)
+            name = first.Channels[0].Name.encode()
+            f.seek(content.index(name))
+            f.write(name[:1].swapcase())
+        os.utime(file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert cache.load(file) is None
+
+        # the entry gets the state of the file before it was parsed
+        reader = APReader(file, cache_dir=cache_dir, lazy=True)
+        with open(file, 'ab') as f:
+            f.write(b'\0')
+        assert cache.load(file) is None
+        reader.cache.store(reader)
+        assert cache.load(file) is None
+
+        # readers that can't be pickled are not stored, opening them doesn't fail
+        reader.unpicklable = lambda: None
+        assert reader.cache.store(reader) is False
+
+        # functions can't be compared, so readers with them are not cached
+        other = os.path.join(folder, 'other')
+        APReader(file, cache_dir=other, group_by=lambda x: x.length)
+        APReader(file, cache_dir=other, resolver=lambda channels: channels[0])
+        assert os.listdir(other) == []
+
+        # the least recently used entries are removed
+        files = [shutil.copy(source, os.path.join(folder, f'{x}.bin')) for x in 'abc']
+        lru = FileCache(os.path.join(folder, 'lru'))
+        for x in files[:2]:
+            lru.store(APReader(x))
+        for i, x in enumerate(files[:2]):
+            os.utime(os.path.join(lru.entry(x), 'fingerprint.json'), (1000 + i, 1000 + i))
+        from apread.cache import folder_size
+        size = folder_size(lru.entry(files[0]))
+        assert lru.load(files[0]) is not None
+        lru.max_size = int(2.5 * size)
+        lru.store(APReader(files[2]))
+        assert [os.path.isdir(lru.entry(x)) for x in files] == [True, False, True]
+
+        # many readers of the same file store it at once without errors
+        import threading
+        shared = os.path.join(folder, 'shared')
+        reader, barrier = APReader(files[0]), threading.Barrier(16)
+        def store(_):
+            barrier.wait()
+            return FileCache(shared).store(reader)
+        with ThreadPoolExecutor(16) as pool:
+            assert any(pool.map(store, range(16)))
+        with ThreadPoolExecutor(16) as pool:
+            readers = list(pool.map(lambda _: APReader(files[0], cache_dir=shared), range(64)))
+        assert all(len(x.Channels) == len(first.Channels) for x in readers)
+        assert FileCache(shared).load(files[0]) is not None
+        assert not any(x.startswith('.tmp-') for x in os.listdir(shared))
+
+def test_resolver():
+    """Time channels are found without asking the user, groups without one are listed as unresolved."""
+    import builtins
+    import sys
+    import tempfile
+    from apread.resolver import TimeResolver
+
+    file = os.path.join(os.path.dirname(__file__), 'Example_Catman_Data.bin')
+
+    def ask(*args):
+        raise AssertionError('input() must not be called.')
+
+    stdin, builtins_input = sys.stdin, builtins.input
+    sys.stdin, builtins.input = open(os.devnull), ask
+    sys.stdin.close()
+    try:
+        # by name, the unit 's' is used without asking
+        reader = APReader(file)
+        assert [x.Name for x in reader.Groups] == ['unknown'] and reader.unresolved == []
+
+        # every channel on its own
+        reader = APReader(file, group_by=lambda x: x.num)
+        assert reader.Groups == [] and len(reader.unresolved) == 11
+        assert all(x.reason == 'single channel' and len(x.channels) == 1 for x in reader.unresolved)
+
+        # no rule matches
+        reader = APReader(file, resolver=TimeResolver(names=(), units=()))
+        assert reader.Groups == [] and len(reader.unresolved) == 1
+        assert reader.unresolved[0].reason == 'no time channel' and len(reader.unresolved[0].channels) == 11
+
+        # by channel number
+        reader = APReader(file, resolver=TimeResolver(names=(), units=(), indices=(20,)))
+        assert [x.Name for x in reader.Groups] == ['TE037'] and reader.unresolved == []
+
+        # a time channel from the extended header
+        reader = APReader(file, resolver=TimeResolver(names=(), units=(), synthesize=True))
+        assert [x.Name for x in reader.Groups] == ['Time (synthesized)'] and reader.unresolved == []
+
+        # cached files are only reused with the same rules
+        with tempfile.TemporaryDirectory() as folder:
+            for resolver, name in [(None, 'unknown'), (TimeResolver(names=(), units=(), synthesize=True), 'Time (synthesized)'),\
+                    (lambda channels: channels[1], 'TE037'), (None, 'unknown')]:
+                reader = APReader(file, cache_dir=folder, resolver=resolver)
+                assert [x.Name for x in reader.Groups] == [name]
+    finally:
+        sys.stdin, builtins.input = stdin, builtins_input
+
+def test_raw():
+    """Raw 2-byte channels keep their integers and scale only what is accessed."""
+    import tempfile
+    import numpy as np
+
+    file = os.path.join(os.path.dirname(__file__), '2byteJob1_2022_04_12_13_32_10.bin')
+    expected = APReader(file)
+    for kwargs in [{}, {'workers': 2}, {'lazy': True}]:
+        reader = APReader(file, raw=True, **kwargs)
+        for channel, other in zip(reader.Channels, expected.Channels):
+            assert np.array_equal(channel.data, other.data)
+            assert channel.raw is not None and channel.raw.dtype == np.uint16 and channel._data is None
+            assert channel[5] == other.data[5] and np.array_equal(channel[2:7], other.data[2:7])
+            out = np.empty(channel.length, np.float32)
+            assert channel.scaled(out=out) is out and np.allclose(out, other.data, rtol=1e-6)
+            assert np.array_equal(channel.scaled(start=10, stop=20), other.data[10:20])
+            assert channel.min() == other.data.min() and channel.max() == other.data.max()
+            assert np.isclose(channel.mean(), other.data.mean(dtype=np.float64), rtol=1e-12)
+        group, other = reader.Groups[0], expected.Groups[0]
+        assert np.array_equal(group[3][1], other[3][1])
+
+    # cached entries are only used with the same option
+    with tempfile.TemporaryDirectory() as folder:
+        for raw in [False, True, False]:
+            reader = APReader(file, cache_dir=folder, raw=raw)
+            assert all((x.raw is not None) == raw for x in reader.Channels)
+
+def test_export():
+    """Exported tables contain the data, units and comments of every channel."""
+    import tempfile
+    import h5py
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from apread.export import unique_names
+
+    dirname = os.path.dirname(__file__)
+    with tempfile.TemporaryDirectory() as folder:
+        for name in ['2byteJob1_2022_04_12_13_32_10.bin', 'Example_Catman_Data.bin']:
+            file = os.path.join(dirname, name)
+            expected = APReader(file)
+            for fmt in ['parquet', 'arrow', 'hdf5']:
+                lazy = APReader(file, lazy=True)
+                output = os.path.join(folder, f'{name}.{fmt}')
+                paths = lazy.export(output, fmt, samples_per_chunk=1000)
+                # the data is read in chunks, the channels are not loaded
+                assert not any(x.isLoaded for x in lazy.Channels)
+                assert len(paths) == len(expected.Groups)
+
+                for path, group in zip(paths, expected.Groups):
+                    channels = [group.ChannelX] + group.ChannelsY
+                    if fmt == 'hdf5':
+                        with h5py.File(output, 'r') as f:
+                            h5group = f[path]
+                            assert h5group.attrs['group'] == group.Name
+                            for chan in channels:
+                                ds = h5group[chan.Name.replace('/', '_')]
+                                assert np.array_equal(ds[:], chan.data)
+                                assert ds.attrs['unit'] == chan.unit and ds.attrs['comment'] == chan.comment
+                        continue
+
+                    if fmt == 'parquet':
+                        table = pq.read_table(path)
+                    else:
+                        with pa.memory_map(path) as source:
+                            table = pa.ipc.open_file(source).read_all()
+                    assert table.column_names == [x.Name for x in channels]
+                    assert table.schema.metadata[b'group'] == group.Name.encode()
+                    for column, chan in zip(table.columns, channels):
+                        assert np.array_equal(column.to_numpy(), chan.data)
+                    for field, chan in zip(table.schema, channels):
+                        assert field.metadata[b'unit'].decode() == chan.unit
+                        assert field.metadata[b'comment'].decode() == chan.comment
+
+        # channels with the same name get numbered columns
+        from apread.writer import APWriter
+        writer = APWriter()
+        writer.add(data=np.arange(100) * 0.01, Name='Time', unit='s', dt=10.0)
+        writer.add(data=np.arange(100.0), Name='F', unit='kN')
+        writer.add(data=-np.arange(100.0), Name='F', unit='N')
+        reader = APReader(writer.write(os.path.join(folder, 'duplicates.bin')))
+        channels = reader.Groups[0].Channels
+        for fmt in ['parquet', 'arrow', 'hdf5']:
+            output = os.path.join(folder, f'duplicates.{fmt}')
+            reader.Groups[0].export(output, fmt)
+            if fmt == 'hdf5':
+                with h5py.File(output, 'r') as f:
+                    assert sorted(f) == ['F', 'F_1', 'Time']
+                    assert all(np.array_equal(f[x][:], c.data) for x, c in zip(['Time', 'F', 'F_1'], channels))
+                continue
+            table = pq.read_table(output) if fmt == 'parquet' else pa.ipc.open_file(pa.memory_map(output)).read_all()
+            assert table.column_names == ['Time', 'F', 'F_1']
+            assert [x.metadata[b'unit'] for x in table.schema] == [b's', b'kN', b'N']
+            assert all(np.array_equal(x.to_numpy(), c.data) for x, c in zip(table.columns, channels))
+
+    assert unique_names(['a', 'a', 'a_1']) == ['a', 'a_2', 'a_1']
+    assert unique_names(['a', 'a_1', 'a', 'a_1']) == ['a', 'a_1', 'a_2', 'a_1_1']
+
+def test_dtype():
+    """The data of every path (threads, memory map, 2-byte, ranges) has the requested type."""
+    import numpy as np
+
+    dirname = os.path.dirname(__file__)
+    for name in ['2byteJob1_2022_04_12_13_32_10.bin', '4byteJob1_2022_04_12_13_31_47.bin',\
+            '8byteJob1_2022_04_12_13_31_23.bin', 'Example_Catman_Data.bin']:
+        file = os.path.join(dirname, name)
+        native = APReader(file)
+        for dtype in [np.float32, np.float64]:
+            for workers in [None, 2]:
+                for mmap in [False, True]:
+                    for lazy in [False, True]:
+                        reader = APReader(file, dtype=dtype, workers=workers, mmap=mmap, lazy=lazy)
+                        for channel, other in zip(reader.Channels, native.Channels):
+                            # ranges and chunks are read before the channel is loaded (lazy)
+                            assert channel.readRange(3, 10).dtype == dtype
+                            chunks = list(channel.iter_chunks(1000))
+                            assert all(x.dtype == dtype for x in chunks)
+                            assert channel.data.dtype == dtype and channel.dataType == dtype
+                            # 2-byte samples are scaled in single precision, so the error depends on the range
+                            scale = float(np.abs(other.data).max()) if other.length > 0 else 0.0
+                            assert np.allclose(channel.data, other.data, rtol=1e-6, atol=1e-6 * scale)
+                            assert np.array_equal(np.concatenate(chunks), channel.data)
+
+def test_slice():
+    """Slices by time contain exactly the samples of the window, whichever way the window is found."""
+    import numpy as np
+
+    dirname = os.path.dirname(__file__)
+    for name in ['2byteJob1_2022_04_12_13_32_10.bin', '4byteJob1_2022_04_12_13_31_47.bin', 'Example_Catman_Data.bin']:
+        file = os.path.join(dirname, name)
+        expected = APReader(file).Groups[0]
+        t = expected.ChannelX.data.astype(np.float64)
+        dt = t[1] - t[0]
+        windows = [
+            (t[10], t[20]),                        # on samples
+            (t[10] + dt / 3, t[20] - dt / 3),      # between samples
+            (t[0] - 100 * dt, t[5]),               # starts before the first sample
+            (t[-6], t[-1] + 100 * dt),             # ends after the last sample
+            (t[0] - 100 * dt, t[-1] + 100 * dt),   # everything
+            (t[10] + dt / 3, t[10] + dt / 2),      # empty
+            (t[20], t[10]),                        # reversed
+            (t[-1] + dt, t[-1] + 2 * dt),          # after the end
+            (-np.inf, t[5]),                       # open bounds
+            (t[-6], np.inf),
+            (-np.inf, np.inf),
+        ]
+
+        # loaded time channels are searched in memory, lazy ones with the header
+        # guess and, with a wrong interval in the header, by binary search
+        for mode in ['loaded', 'guess', 'search']:
+            reader = APReader(file, lazy=mode != 'loaded')
+            group = reader.Groups[0]
+            if mode == 'search':
+                group.ChannelX.extHeader = dict(group.ChannelX.extHeader, dt=group.ChannelX.extHeader['dt'] * 7.3)
+            for t_start, t_end in windows:
+                mask = (t >= t_start) & (t <= t_end)
+                assert group.ChannelX.searchTime(t_start, 'left') == np.searchsorted(t, t_start, 'left')
+                assert group.ChannelX.searchTime(t_end, 'right') == np.searchsorted(t, t_end, 'right')
+                sliced = group.slice(t_start, t_end)
+                assert sliced.ChannelX.length == np.count_nonzero(mask)
+                assert np.array_equal(sliced.ChannelX.data, expected.ChannelX.data[mask])
+                for chan, other in zip(sliced.ChannelsY, expected.ChannelsY):
+                    assert np.array_equal(chan.data, other.data[mask])
+            if mode != 'loaded':
+                assert not any(x.isLoaded for x in reader.Channels)
+
+def test_metrics():
+    """Phases, bytes and channel events of readers with metrics."""
+    import tempfile
+
+    dirname = os.path.dirname(__file__)
+    for name in ['2byteJob1_2022_04_12_13_32_10.bin', 'Example_Catman_Data.bin']:
+        file = os.path.join(dirname, name)
+        for kwargs in [{}, {'workers': 2}, {'mmap': True}]:
+            events = []
+            reader = APReader(file, metrics=lambda event, data: events.append((event, data)), **kwargs)
+            metrics = reader.metrics
+            assert set(metrics.phases) == {'header', 'data', 'connect'}
+            assert [x['phase'] for event, x in events if event == 'phase'] == ['header', 'data', 'connect']
+            # the header up to the data and the data of every channel
+            assert metrics.bytesRead == reader.dataOffset + sum(x.dataSize for x in reader.Channels)
+            channels = [x for event, x in events if event == 'channel']
+            assert sorted(x['channel'] for x in channels) == sorted(x.Name for x in reader.Channels)
+            assert sorted(x['index'] for x in channels) == list(range(len(reader.Channels)))
+            assert all(x['total'] == len(reader.Channels) for x in channels)
+
+        # lazy readers count the channels when they are loaded
+        events = []
+        reader = APReader(file, lazy=True, metrics=lambda event, data: events.append((event, data)))
+        assert set(reader.metrics.phases) == {'header', 'connect'}
+        assert not any(event == 'channel' for event, x in events)
+        before = reader.metrics.bytesRead
+        channel = reader.Groups[0].ChannelsY[0]
+        channel.load()
+        assert reader.metrics.bytesRead == before + channel.dataSize
+        assert [x['channel'] for event, x in events if event == 'channel'] == [channel.Name]
+
+        # a cache hit reads nothing from the file
+        with tempfile.TemporaryDirectory() as folder:
+            assert 'cache' in APReader(file, cache_dir=folder, metrics=True).metrics.phases
+            reader = APReader(file, cache_dir=folder, metrics=True)
+            assert set(reader.metrics.phases) == {'cache'} and reader.metrics.bytesRead == 0
+
+def test_open_many():
+    """Files are opened in worker processes, errors are returned with their path."""
+    import glob
+    import numpy as np
+    from apread.batch import open_many
+
+    dirname = os.path.dirname(__file__)
+    files = [os.path.join(dirname, x) for x in ['2byteJob1_2022_04_12_13_32_10.bin', '4byteJob1_2022_04_12_13_31_47.bin',\
+        '8byteJob1_2022_04_12_13_31_23.bin', 'Example_Catman_Data.bin']]
+    missing = os.path.join(dirname, 'missing.bin')
+
+    results = list(open_many(files + [missing], workers=2, ordered=True))
+    assert [x[0] for x in results] == files + [missing]
+    for (path, reader, error), file in zip(results[:-1], files):
+        expected = APReader(file)
+        assert error is None and [x.Name for x in reader.Channels] == [x.Name for x in expected.Channels]
+        assert all(np.array_equal(a.data, b.data) for a, b in zip(reader.Channels, expected.Channels))
+    path, reader, error = results[-1]
+    assert reader is None and isinstance(error, FileNotFoundError)
+
+    results = list(open_many(os.path.join(dirname, '*.bin'), workers=2))
+    assert sorted(x[0] for x in results) == sorted(glob.glob(os.path.join(dirname, '*.bin')))
+    assert all(error is None for path, reader, error in results)
+
+    # lazy, mapped readers are sent without data and read from the file in this process
+    for path, reader, error in open_many(files[1:3], workers=2, lazy=True, mmap=True):
+        assert not any(x.isLoaded for x in reader.Channels)
+        for channel, other in zip(reader.Channels, APReader(path).Channels):
+            assert np.array_equal(channel.data, other.data) and not channel.data.flags.writeable
+
+def test_decimate():
+    """Decimated data keeps the endpoints and extremes, zooming decimates the visible part again."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import numpy as np
+    from apread.decimate import decimate, lttb, minmax, plot_decimated
+
+    rng = np.random.default_rng(0)
+    n = 100_003
+    x = np.arange(n) * 0.001
+    y = np.cumsum(rng.normal(size=n))
+
+    xd, yd = minmax(x, y, 500)
+    assert len(xd) <= 2 * 500 + 4 and np.all(np.diff(xd) > 0)
+    assert (xd[0], xd[-1]) == (x[0], x[-1])
+    # the extremes of every bucket are kept
+    size = n // 500
+    for start in range(0, n, size):
+        assert y[start:start + size].min() in yd and y[start:start + size].max() in yd
+    assert len(minmax(x[:100], y[:100], 500)[0]) == 100
+
+    xd, yd = lttb(x, y, 1000)
+    assert len(xd) == 1000 and np.all(np.diff(xd) > 0)
+    assert (xd[0], xd[-1]) == (x[0], x[-1])
+    assert len(lttb(x[:100], y[:100], 1000)[0]) == 100
+
+    assert decimate(x, y, 500, None)[0] is x
+    try:
+        decimate(x, y, 500, 'unknown')
+        assert False
+    except ValueError:
+        pass
+
+    # zooming in recomputes the visible part with more detail
+    fig, ax = plt.subplots()
+    line = plot_decimated(ax, x, y, method='minmax')[0]
+    width = int(ax.get_window_extent().width)
+    assert len(line.get_xdata()) <= 2 * width + 4
+    assert (line.get_xdata()[0], line.get_xdata()[-1]) == (x[0], x[-1])
+    ax.set_xlim(x[1000], x[2000])
+    xz, yz = line.get_xdata(), line.get_ydata()
+    assert xz[0] >= x[999] and xz[-1] <= x[2001] and len(xz) > 2 * 1000 / (n / width)
+    assert y[1000:2001].min() in yz and y[1000:2001].max() in yz
+    plt.close(fig)